@@ -29,9 +29,13 @@ from typing import List, Dict, Any
 import uuid
 
 # Updated imports for modular architecture
-from chains.rag_chain import get_enhanced_chain_for_domain
-from domain_router import classify_domain
+from chains.rag_chain import stream_chain_events
 from config.settings import llm
+from core.chain_factory import get_chain_for_domain
+from core.domain_classifier import get_domain_classifier
+from core.pipeline import prepare_query
+from core.request_context import RequestContext
+from core.vectorstore_registry import warm_up_vectorstores
 
 # Page configuration
 st.set_page_config(
@@ -143,10 +147,18 @@ st.markdown(
 )
 
 
+@st.cache_resource(show_spinner=False)
+def warm_up_knowledge_base():
+    """Open all collections and embed router examples once per Streamlit process"""
+    get_domain_classifier().warm_up()
+    return warm_up_vectorstores()
+
+
 class MinimalNIIBot:
     """Minimalistic Streamlit interface for modular NIIBot"""
 
     def __init__(self):
+        warm_up_knowledge_base()
         self.initialize_session_state()
 
     def initialize_session_state(self):
@@ -307,8 +319,21 @@ class MinimalNIIBot:
         with st.chat_message("assistant"):
             with st.spinner(""):
                 try:
-                    # Classify domain using existing domain router
-                    domain = classify_domain(query)
+                    # One context per request, shared by every pipeline stage
+                    request_context = RequestContext(query)
+
+                    # Prepare chat history for context
+                    chat_history = []
+                    for msg in current_chat["messages"][:-1]:  # Exclude current query
+                        if msg["role"] == "user":
+                            chat_history.append(
+                                {"query": msg["content"], "response": ""}
+                            )
+                        elif msg["role"] == "assistant" and chat_history:
+                            chat_history[-1]["response"] = msg["content"]
+
+                    # Classify domain and rewrite follow-ups concurrently
+                    domain = prepare_query(request_context, chat_history)
 
                     # Display domain tag
                     st.markdown(
@@ -316,35 +341,40 @@ class MinimalNIIBot:
                         unsafe_allow_html=True,
                     )
 
-                    # Get chain using new modular architecture
-                    chain, _ = get_enhanced_chain_for_domain(
-                        domain, use_memory_wrapper=False
-                    )
+                    # Get the domain's chain (built once per process)
+                    chain, _ = get_chain_for_domain(domain, use_memory_wrapper=False)
 
                     if chain is None:
                         response = (
                             "I couldn't access the knowledge base. Please try again."
                         )
+                        st.write(response)
                     else:
-                        # Prepare chat history for context
-                        chat_history = []
-                        for msg in current_chat["messages"][
-                            :-1
-                        ]:  # Exclude current query
-                            if msg["role"] == "user":
-                                chat_history.append(
-                                    {"query": msg["content"], "response": ""}
-                                )
-                            elif msg["role"] == "assistant" and chat_history:
-                                chat_history[-1]["response"] = msg["content"]
-
-                        # Get response using modular chain
-                        response = chain.invoke(
-                            {"question": query, "chat_history": chat_history}
-                        )
-
-                    # Display response
-                    st.write(response)
+                        # Stream the response into a placeholder as tokens arrive
+                        placeholder = st.empty()
+                        response = ""
+                        with request_context.timed("chain"):
+                            for event in stream_chain_events(
+                                chain,
+                                {
+                                    "question": query,
+                                    "chat_history": chat_history,
+                                    "request_context": request_context,
+                                },
+                            ):
+                                if event["type"] == "retrieval":
+                                    placeholder.caption(
+                                        f"Found {len(event['docs'])} relevant documents..."
+                                    )
+                                elif event["type"] == "token":
+                                    response += event["text"]
+                                    placeholder.markdown(response + "▌")
+                                elif event["type"] == "done":
+                                    response = event["response"]
+                        print(f"⏱️ {request_context.timing_summary()}")
+
+                        # Display final response
+                        placeholder.markdown(response)
 
                     # Add assistant message to history
                     current_chat["messages"].append(
@@ -1,21 +1,38 @@
+import asyncio
 import os
-from langchain_chroma import Chroma
+import queue
+import threading
+from typing import Iterator, Optional
+
+from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables.history import RunnableWithMessageHistory
 from langchain_core.runnables import RunnableLambda
 
-from config.settings import VECTOR_DB_DIR, embedding_model, llm
+from config.settings import (
+    VECTOR_DB_DIR,
+    RESPONSE_CACHE_ENABLED,
+    CONTEXT_TOKEN_BUDGET,
+    CONTEXT_TOKEN_BUDGET_DIRECTOR,
+    llm,
+)
 from config.prompts import DOMAIN_PROMPTS
 from core.memory import get_session_history, rewrite_query_with_context
+from core.request_context import get_request_context
+from core.response_cache import with_response_cache
 from core.retrieval import EnhancedFacultyRetriever
+from core.vectorstore_registry import get_vectorstore
 from core.faculty_extractor import FacultyNameExtractor
+from config.patterns import CORRECTION_TYPE_PATTERNS, DOMAIN_MENTION_PATTERNS
 from utils.document_utils import format_docs, display_sources, get_metadata_value
+from utils.pattern_matcher import match_patterns
 from utils.search_utils import (
     get_comprehensive_director_info,
     handle_multiple_candidates,
     get_multi_domain_faculty_info,
+    vector_search,
+    batch_vector_search,
 )
-from core.faculty_extractor import create_faculty_extractor_with_cache
 
 
 def get_security_response() -> str:
@@ -45,30 +62,12 @@ def detect_correction_query(query: str, chat_history: list) -> dict:
     """
     query_lower = query.lower()
 
-    correction_patterns = {
-        "alumni_to_faculty": [
-            "not alumni",
-            "these are professors",
-            "these are faculty",
-            "faculty members",
-            "not students",
-            "professors",
-        ],
-        "faculty_to_alumni": [
-            "not faculty",
-            "these are students",
-            "these are alumni",
-            "alumni members",
-            "not professors",
-            "students",
-        ],
-        "general_correction": ["wrong", "incorrect", "mistake", "error", "fix this"],
-    }
+    matches = match_patterns(query_lower)
 
     detected_correction = None
 
-    for correction_type, patterns in correction_patterns.items():
-        if any(pattern in query_lower for pattern in patterns):
+    for correction_type in CORRECTION_TYPE_PATTERNS:
+        if matches.has(f"correction:{correction_type}"):
             detected_correction = correction_type
             break
 
@@ -144,11 +143,9 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
             return None, None
 
     try:
-        vectorstore = Chroma(
-            collection_name=domain,
-            embedding_function=embedding_model,
-            persist_directory=collection_path,
-        )
+        vectorstore = get_vectorstore(domain)
+        if vectorstore is None:
+            raise FileNotFoundError(collection_path)
         print(f"✅ Successfully loaded vectorstore for domain: {domain}")
     except Exception as e:
         print(f"❌ Error loading vectorstore for domain '{domain}': {e}")
@@ -192,12 +189,37 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
 
     # ===== MAIN CHAIN LOGIC FUNCTION =====
     def chain_logic(inputs):
+        """
+        Attach the request context, time the retrieval stage and report the
+        retrieved documents before generation starts.
+        """
+        request_context = get_request_context(inputs, domain=domain)
+        with request_context.timed("retrieval"):
+            result = retrieve_and_format(inputs, request_context)
+
+        request_context.retrieved_docs = inputs.get("retrieved_docs", [])
+        request_context.emit(
+            "retrieval",
+            domain=domain,
+            docs=request_context.retrieved_docs,
+            cached=False,
+            seconds=request_context.timings["retrieval"],
+        )
+        return result
+
+    async def achain_logic(inputs):
+        """
+        Async entry point: Chroma and the embedding model are blocking, so
+        retrieval runs on a worker thread while the event loop keeps serving.
+        """
+        return await asyncio.to_thread(chain_logic, inputs)
+
+    def retrieve_and_format(inputs, request_context):
         """
         Core logic for processing queries and retrieving relevant documents.
         """
         try:
             query = inputs["question"]
-            query_lower = query.lower()
 
             # Extract chat history for context
             chat_history = inputs.get("chat_history", [])
@@ -224,29 +246,33 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
                     ]
 
                     docs = []
-                    for term in search_terms:
-                        try:
-                            print(f"🔍 Searching for faculty: '{term}'")
-                            term_docs = vectorstore.similarity_search(term, k=3)
-
-                            for doc in term_docs:
-                                title = doc.metadata.get("title", "").lower()
-                                content = doc.page_content.lower()
-
-                                # Look for faculty documents (avoid alumni documents)
-                                if (
-                                    "faculty" in title or "current faculty" in content
-                                ) and "alumni" not in content:
-                                    docs.append(doc)
-                                    print(f"   ✅ Found faculty document: {title}")
-                                    break
-                            if docs:
+                    try:
+                        print(f"🔍 Searching for faculty: {search_terms}")
+                        batch_results = batch_vector_search(
+                            vectorstore, search_terms, k=3
+                        )
+                    except Exception as e:
+                        print(f"   ⚠️ Faculty search failed: {e}")
+                        batch_results = []
+
+                    # Take the first qualifying document, in search term order
+                    for term_docs in batch_results:
+                        for doc in term_docs:
+                            title = doc.metadata.get("title", "").lower()
+                            content = doc.page_content.lower()
+
+                            # Look for faculty documents (avoid alumni documents)
+                            if (
+                                "faculty" in title or "current faculty" in content
+                            ) and "alumni" not in content:
+                                docs.append(doc)
+                                print(f"   ✅ Found faculty document: {title}")
                                 break
-                        except Exception as e:
-                            print(f"   ⚠️ Faculty search failed: {e}")
+                        if docs:
+                            break
 
                     # Add correction acknowledgment to context
-                    context = format_docs(docs, max_docs=1, max_chars_per_doc=1500)
+                    context = format_docs(docs, max_docs=1, token_budget=400)
                     context = f"CORRECTION ACKNOWLEDGED: You're absolutely right - those are faculty members (professors), not alumni (students). Here is the correct faculty information:\n\n{context}"
 
                     inputs["retrieved_docs"] = docs
@@ -270,29 +296,33 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
                     ]
 
                     docs = []
-                    for term in search_terms:
-                        try:
-                            print(f"🔍 Searching for alumni: '{term}'")
-                            term_docs = vectorstore.similarity_search(term, k=3)
-
-                            for doc in term_docs:
-                                title = doc.metadata.get("title", "").lower()
-                                content = doc.page_content.lower()
-
-                                # Look for alumni documents (avoid faculty documents)
-                                if (
-                                    "alumni" in title or "alumni" in content
-                                ) and "faculty" not in content:
-                                    docs.append(doc)
-                                    print(f"   ✅ Found alumni document: {title}")
-                                    break
-                            if docs:
+                    try:
+                        print(f"🔍 Searching for alumni: {search_terms}")
+                        batch_results = batch_vector_search(
+                            vectorstore, search_terms, k=3
+                        )
+                    except Exception as e:
+                        print(f"   ⚠️ Alumni search failed: {e}")
+                        batch_results = []
+
+                    # Take the first qualifying document, in search term order
+                    for term_docs in batch_results:
+                        for doc in term_docs:
+                            title = doc.metadata.get("title", "").lower()
+                            content = doc.page_content.lower()
+
+                            # Look for alumni documents (avoid faculty documents)
+                            if (
+                                "alumni" in title or "alumni" in content
+                            ) and "faculty" not in content:
+                                docs.append(doc)
+                                print(f"   ✅ Found alumni document: {title}")
                                 break
-                        except Exception as e:
-                            print(f"   ⚠️ Alumni search failed: {e}")
+                        if docs:
+                            break
 
                     # Add correction acknowledgment to context
-                    context = format_docs(docs, max_docs=1, max_chars_per_doc=1500)
+                    context = format_docs(docs, max_docs=1, token_budget=400)
                     context = f"CORRECTION ACKNOWLEDGED: You're absolutely right - you asked for alumni (students who graduated), not faculty. Here is the correct alumni information:\n\n{context}"
 
                     inputs["retrieved_docs"] = docs
@@ -304,7 +334,10 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
                     }
 
             # ===== QUERY REWRITING WITH CONTEXT =====
-            if (
+            if request_context.rewrite_done:
+                # Already rewritten by the pipeline, concurrently with routing
+                query = request_context.effective_query
+            elif (
                 chat_history
                 and len(chat_history) > 0
                 and not correction_analysis["is_correction"]
@@ -326,27 +359,14 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
                 if structured_history:
                     original_query = query
                     query = rewrite_query_with_context(query, structured_history, llm)
+                    request_context.set_effective_query(query)
                     print(
                         f"🔍 DEBUG - Original: '{original_query}' → Rewritten: '{query}'"
                     )
 
             # ===== SPECIAL HANDLING: FACULTY LIST QUERIES =====
-            faculty_list_patterns = [
-                "faculty list",
-                "list of faculty",
-                "all faculty",
-                "faculty members",
-                "faculties list",
-                "current faculty",
-                "show faculty",
-                "faculty at nii",
-                "nii faculty",
-                "institute faculty",
-            ]
-
-            is_faculty_list_query = any(
-                pattern in query_lower for pattern in faculty_list_patterns
-            )
+            matches = request_context.matches
+            is_faculty_list_query = matches.has("faculty_list")
 
             if is_faculty_list_query and domain == "nii_info":
                 print("🎯 Detected faculty list query - using targeted search")
@@ -354,7 +374,7 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
 
                 try:
                     print("🔍 Trying exact title search...")
-                    docs = vectorstore.similarity_search("All Faculty Lists (NII)", k=5)
+                    docs = vector_search(vectorstore, "All Faculty Lists (NII)", k=5)
 
                     valid_docs = []
                     for doc in docs:
@@ -383,37 +403,39 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
                         "Chemical Biology, Biochemistry & Structural Biology",
                     ]
 
-                    for term in search_terms:
-                        try:
-                            print(f"🔍 Searching for: '{term}'")
-                            term_docs = vectorstore.similarity_search(term, k=3)
-
-                            for doc in term_docs:
-                                content_lower = doc.page_content.lower()
-                                title = doc.metadata.get("title", "").lower()
-
-                                if (
-                                    "all faculty lists" in title
-                                    or (
-                                        "current faculty members" in content_lower
-                                        and "immunity & infection" in content_lower
-                                        and "genetics, cell signalling" in content_lower
-                                    )
-                                ) and "alumni" not in content_lower:
-                                    docs.append(doc)
-                                    print(f"   ✅ Found faculty list document!")
-                                    break
-
-                            if docs:
+                    try:
+                        print(f"🔍 Searching for: {search_terms}")
+                        batch_results = batch_vector_search(
+                            vectorstore, search_terms, k=3
+                        )
+                    except Exception as e:
+                        print(f"   ⚠️ Search failed: {e}")
+                        batch_results = []
+
+                    for term_docs in batch_results:
+                        for doc in term_docs:
+                            content_lower = doc.page_content.lower()
+                            title = doc.metadata.get("title", "").lower()
+
+                            if (
+                                "all faculty lists" in title
+                                or (
+                                    "current faculty members" in content_lower
+                                    and "immunity & infection" in content_lower
+                                    and "genetics, cell signalling" in content_lower
+                                )
+                            ) and "alumni" not in content_lower:
+                                docs.append(doc)
+                                print(f"   ✅ Found faculty list document!")
                                 break
 
-                        except Exception as e:
-                            print(f"   ⚠️ Search failed: {e}")
+                        if docs:
+                            break
 
                 print(f"🔎 Faculty list search: {len(docs)} valid documents found")
 
                 inputs["retrieved_docs"] = docs
-                context = format_docs(docs, max_docs=1, max_chars_per_doc=1200)
+                context = format_docs(docs, max_docs=1, token_budget=300)
 
                 return {
                     "question": inputs["question"],
@@ -422,19 +444,7 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
                 }
 
             # ===== SPECIAL HANDLING: ALUMNI LIST QUERIES =====
-            alumni_list_patterns = [
-                "alumni list",
-                "list of alumni",
-                "all alumni",
-                "alumni members",
-                "nii alumni",
-                "alumni directory",
-                "graduated students",
-            ]
-
-            is_alumni_list_query = any(
-                pattern in query_lower for pattern in alumni_list_patterns
-            )
+            is_alumni_list_query = matches.has("alumni_list")
 
             if is_alumni_list_query and domain == "nii_info":
                 print("🎯 Detected alumni list query - using targeted search")
@@ -449,27 +459,24 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
                         "MOLECULAR AGING LAB [MAL]",
                     ]
 
-                    for term in search_terms:
-                        try:
-                            print(f"🔍 Searching for: '{term}'")
-                            term_docs = vectorstore.similarity_search(term, k=3)
-
-                            for doc in term_docs:
-                                title = doc.metadata.get("title", "").lower()
-                                content = doc.page_content.lower()
-
-                                # Look for alumni documents specifically
-                                if "alumni" in title or (
-                                    "bioinformatics centre [bic]" in content
-                                    and "dr. gitanjali" in content
-                                ):
-                                    docs.append(doc)
-                                    print(f"   ✅ Found alumni document: {title}")
-                                    break
-                            if docs:
+                    print(f"🔍 Searching for: {search_terms}")
+                    batch_results = batch_vector_search(vectorstore, search_terms, k=3)
+
+                    for term_docs in batch_results:
+                        for doc in term_docs:
+                            title = doc.metadata.get("title", "").lower()
+                            content = doc.page_content.lower()
+
+                            # Look for alumni documents specifically
+                            if "alumni" in title or (
+                                "bioinformatics centre [bic]" in content
+                                and "dr. gitanjali" in content
+                            ):
+                                docs.append(doc)
+                                print(f"   ✅ Found alumni document: {title}")
                                 break
-                        except Exception as e:
-                            print(f"   ⚠️ Alumni search failed: {e}")
+                        if docs:
+                            break
 
                 except Exception as e:
                     print(f"   ⚠️ Alumni search failed: {e}")
@@ -477,7 +484,7 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
                 print(f"🔎 Alumni list search: {len(docs)} valid documents found")
 
                 inputs["retrieved_docs"] = docs
-                context = format_docs(docs, max_docs=1, max_chars_per_doc=1200)
+                context = format_docs(docs, max_docs=1, token_budget=300)
 
                 return {
                     "question": inputs["question"],
@@ -487,27 +494,14 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
 
             # ===== NEW: MULTI-DOMAIN QUERY DETECTION =====
             # Check if query asks for information from multiple domains
-            domain_keywords = {
-                "publications": ["publications", "papers", "articles", "published"],
-                "research": ["research", "interests", "working on", "projects"],
-                "faculty_info": [
-                    "education",
-                    "background",
-                    "qualifications",
-                    "profile",
-                ],
-                "labs": ["lab", "laboratory", "team", "group"],
-                "staff": ["email", "phone", "contact", "extension"],
-            }
-
-            mentioned_domains = []
-            for domain_key, keywords in domain_keywords.items():
-                if any(keyword in query_lower for keyword in keywords):
-                    mentioned_domains.append(domain_key)
+            mentioned_domains = [
+                domain_key
+                for domain_key in DOMAIN_MENTION_PATTERNS
+                if matches.has(f"mention:{domain_key}")
+            ]
 
-            # Extract faculty name for multi-domain search
-            extractor = create_faculty_extractor_with_cache()
-            extracted_names = extractor.extract_names(query)
+            # Faculty names extracted once for the request
+            extracted_names = request_context.names
 
             # ===== MULTI-DOMAIN SEARCH LOGIC =====
             if len(mentioned_domains) > 1 and extracted_names:
@@ -516,14 +510,19 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
                 print(f"   Domains mentioned: {mentioned_domains}")
 
                 # Use multi-domain search instead of single domain
-                docs = get_multi_domain_faculty_info(query, faculty_name)
+                docs = get_multi_domain_faculty_info(
+                    query, faculty_name, context=request_context
+                )
 
                 if docs:
                     print(f"🎯 Multi-domain search returned {len(docs)} documents")
 
                     # Enhanced context formatting for multi-domain results
                     context = format_docs(
-                        docs, max_docs=len(docs), max_chars_per_doc=700
+                        docs,
+                        max_docs=len(docs),
+                        token_budget=CONTEXT_TOKEN_BUDGET_DIRECTOR,
+                        doc_token_budget=175,
                     )
 
                     inputs["retrieved_docs"] = docs
@@ -534,15 +533,7 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
                     }
 
             # ===== SPECIAL HANDLING: DIRECTOR QUERIES =====
-            is_director_query = any(
-                pattern in query_lower
-                for pattern in [
-                    "director",
-                    "current director",
-                    "nii director",
-                    "institute director",
-                ]
-            )
+            is_director_query = matches.has("director")
 
             if is_director_query and domain == "nii_info":
                 docs = get_comprehensive_director_info(query)
@@ -550,22 +541,22 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
             else:
                 # ===== STANDARD ENHANCED RETRIEVAL =====
                 retriever = EnhancedFacultyRetriever(vectorstore, domain)
-                docs = retriever.retrieve_with_faculty_awareness(query)
+                docs = retriever.retrieve_with_faculty_awareness(
+                    query, context=request_context
+                )
 
                 # Handle multiple candidates from ambiguous names
-                extractor = create_faculty_extractor_with_cache()
-                extracted_names = extractor.extract_names(query)
-
                 if len(extracted_names) > 1:
                     print(f"🎯 Multiple faculty candidates found: {extracted_names}")
                     multi_docs = handle_multiple_candidates(
-                        extracted_names, query, domain
+                        extracted_names, query, domain, context=request_context
                     )
                     if multi_docs:
                         docs = multi_docs
 
                 print(
                     f"🔎 Enhanced retrieval: {len(docs)} documents from '{domain}' collection"
+                    f" (tier: {retriever.last_winning_tier})"
                 )
 
             # ===== DISPLAY RETRIEVED INFORMATION =====
@@ -593,15 +584,13 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
             context = format_docs(
                 docs,
                 max_docs=5 if is_director_query or len(docs) > 3 else 3,
-                max_chars_per_doc=900 if is_director_query else 800,
+                token_budget=(
+                    CONTEXT_TOKEN_BUDGET_DIRECTOR
+                    if is_director_query
+                    else CONTEXT_TOKEN_BUDGET
+                ),
             )
 
-            if len(context) > (4500 if is_director_query else 3500):
-                context = (
-                    context[: 4500 if is_director_query else 3500]
-                    + "\n... [Content truncated]"
-                )
-
             inputs["retrieved_docs"] = docs
 
             return {
@@ -620,12 +609,16 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
 
     # ===== CREATE THE CHAIN =====
     chain = (
-        RunnableLambda(chain_logic)
+        RunnableLambda(chain_logic, afunc=achain_logic)
         | prompt
         | llm
-        | RunnableLambda(lambda x: x.content if hasattr(x, "content") else str(x))
+        | StrOutputParser()  # Passes tokens through when the chain is streamed
     )
 
+    # Serve repeated questions from the semantic response cache
+    if RESPONSE_CACHE_ENABLED:
+        chain = with_response_cache(chain, domain)
+
     # ===== RETURN CHAIN WITH/WITHOUT MEMORY =====
     if use_memory_wrapper:
         return (
@@ -638,4 +631,62 @@ def get_enhanced_chain_for_domain(domain, use_memory_wrapper=True):
             None,
         )
     else:
-        return (chain, None)
\ No newline at end of file
+        return (chain, None)
+
+
+def stream_chain_events(
+    chain, chain_input: dict, config: Optional[dict] = None
+) -> Iterator[dict]:
+    """
+    Run a domain chain and yield structured events as they happen.
+
+    The chain runs on a worker thread so the retrieval event reaches the
+    caller as soon as retrieval finishes, before the first LLM token.
+
+    Events:
+        {"type": "retrieval", "domain", "docs", "cached", "seconds"}
+        {"type": "token", "text"}: Next chunk of the answer
+        {"type": "done", "response"}: Complete answer
+
+    Args:
+        chain: Chain returned by get_enhanced_chain_for_domain
+        chain_input (dict): {"question", "chat_history", "request_context"}
+        config (Optional[dict]): Runnable config (e.g. session_id)
+
+    Returns:
+        Iterator[dict]: Events in pipeline order
+
+    Raises:
+        Exception: Any error raised by the chain, re-raised in the caller
+    """
+    request_context = get_request_context(chain_input)
+    events = queue.Queue()
+    request_context.on_event = events.put
+
+    def produce():
+        try:
+            for chunk in chain.stream(chain_input, config=config):
+                if chunk:
+                    events.put({"type": "token", "text": chunk})
+        except Exception as e:
+            events.put({"type": "error", "error": e})
+        finally:
+            events.put(None)
+
+    threading.Thread(target=produce, name="niibot-stream", daemon=True).start()
+
+    parts = []
+    try:
+        while True:
+            event = events.get()
+            if event is None:
+                break
+            if event["type"] == "error":
+                raise event["error"]
+            if event["type"] == "token":
+                parts.append(event["text"])
+            yield event
+    finally:
+        request_context.on_event = None
+
+    yield {"type": "done", "response": "".join(parts)}
@@ -0,0 +1,223 @@
+"""Keyword pattern groups matched against every user query.
+
+All substring keyword lists used for routing, security checks and intent
+detection live here, grouped by name. utils/pattern_matcher.py compiles them
+into one automaton so a query is scanned once for every group.
+
+Each group keeps the exact list (and order) of the code that consumes it;
+groups with similar names are intentionally not merged.
+"""
+
+# === 🔒 SECURITY THREAT PATTERNS (domain_router.classify_domain) ===
+SECURITY_THREAT_PATTERNS = [
+    # System prompt requests
+    "system prompt",
+    "show me your prompt",
+    "reveal your instructions",
+    "what are your instructions",
+    "internal prompt",
+    "system message",
+    "how are you programmed",
+    "show system",
+    "reveal system",
+    "your system prompt",
+    "system instructions",
+    "internal instructions",
+    "backend prompt",
+    "configuration",
+    "settings",
+    "admin prompt",
+    # Prompt injection attempts
+    "ignore previous instructions",
+    "ignore all instructions",
+    "forget your instructions",
+    "new instructions",
+    "you are now",
+    "act as",
+    "pretend to be",
+    "override your",
+    "disregard",
+    "set aside",
+    # Jailbreak attempts
+    "developer mode",
+    "admin mode",
+    "debug mode",
+    "unrestricted mode",
+    "bypass",
+    "jailbreak",
+    "sudo",
+    "root access",
+    "administrator",
+    # Data extraction attempts
+    "show me everything",
+    "dump data",
+    "export data",
+    "database contents",
+    "internal data",
+    "raw data",
+    "backend data",
+    "system files",
+    "config files",
+]
+
+# === CORRECTION PATTERNS ===
+CORRECTION_PATTERNS = [
+    "wrong",
+    "incorrect",
+    "mistake",
+    "error",
+    "these are not alumni",
+    "not alumni",
+    "these are professors",
+    "these are faculty",
+    "not faculty",
+    "these are students",
+]
+
+# === Advanced threat detection (domain_router._detect_advanced_threats) ===
+ROLE_INDICATOR_PATTERNS = ["you are", "act as", "pretend", "roleplay", "simulate"]
+SYSTEM_REFERENCE_PATTERNS = ["ai", "chatbot", "assistant", "system", "program"]
+OVERRIDE_PATTERNS = [
+    "new role",
+    "different role",
+    "change your",
+    "modify your",
+    "update your",
+    "replace your",
+    "override",
+    "disable",
+    "turn off",
+]
+
+# === Correction types (rag_chain.detect_correction_query), checked in order ===
+CORRECTION_TYPE_PATTERNS = {
+    "alumni_to_faculty": [
+        "not alumni",
+        "these are professors",
+        "these are faculty",
+        "faculty members",
+        "not students",
+        "professors",
+    ],
+    "faculty_to_alumni": [
+        "not faculty",
+        "these are students",
+        "these are alumni",
+        "alumni members",
+        "not professors",
+        "students",
+    ],
+    "general_correction": ["wrong", "incorrect", "mistake", "error", "fix this"],
+}
+
+# === Special query handling (rag_chain.chain_logic) ===
+FACULTY_LIST_PATTERNS = [
+    "faculty list",
+    "list of faculty",
+    "all faculty",
+    "faculty members",
+    "faculties list",
+    "current faculty",
+    "show faculty",
+    "faculty at nii",
+    "nii faculty",
+    "institute faculty",
+]
+
+ALUMNI_LIST_PATTERNS = [
+    "alumni list",
+    "list of alumni",
+    "all alumni",
+    "alumni members",
+    "nii alumni",
+    "alumni directory",
+    "graduated students",
+]
+
+DIRECTOR_PATTERNS = [
+    "director",
+    "current director",
+    "nii director",
+    "institute director",
+]
+
+# Domains mentioned in a query (rag_chain multi-domain detection)
+DOMAIN_MENTION_PATTERNS = {
+    "publications": ["publications", "papers", "articles", "published"],
+    "research": ["research", "interests", "working on", "projects"],
+    "faculty_info": [
+        "education",
+        "background",
+        "qualifications",
+        "profile",
+    ],
+    "labs": ["lab", "laboratory", "team", "group"],
+    "staff": ["email", "phone", "contact", "extension"],
+}
+
+# === Cross-domain intent (retrieval._determine_cross_domain_strategy) ===
+CONTACT_KEYWORDS = ["email", "phone", "contact", "extension", "call", "reach"]
+RESEARCH_KEYWORDS = ["research", "interests", "working on", "projects", "focus"]
+PUBLICATION_KEYWORDS = ["publications", "papers", "articles", "published"]
+
+# === Multi-domain faculty search (search_utils.get_multi_domain_faculty_info) ===
+MULTI_DOMAIN_SEARCH_PATTERNS = {
+    "publications": [
+        "publications",
+        "papers",
+        "articles",
+        "research papers",
+        "published",
+    ],
+    "research": ["research", "interests", "working on", "projects", "focus"],
+    "labs": ["lab", "laboratory", "team", "group"],
+    "staff": [
+        "email",
+        "phone",
+        "contact",
+        "extension",
+        "education",
+        "background",
+    ],
+}
+
+# === Query preprocessing (core.caching / faculty_extractor) ===
+EXIT_WORDS = ["bye", "goodbye", "exit", "quit", "thanks", "thank you"]
+PREPROCESS_FACULTY_LIST_PATTERNS = [
+    "faculty list",
+    "list of faculty",
+    "all faculty",
+    "faculty members",
+    "current faculty",
+    "show faculty",
+    "institute faculty",
+]
+
+# === Group name → patterns, compiled into one automaton ===
+PATTERN_GROUPS = {
+    "threat": SECURITY_THREAT_PATTERNS,
+    "correction": CORRECTION_PATTERNS,
+    "role_indicator": ROLE_INDICATOR_PATTERNS,
+    "system_reference": SYSTEM_REFERENCE_PATTERNS,
+    "override": OVERRIDE_PATTERNS,
+    **{
+        f"correction:{correction_type}": patterns
+        for correction_type, patterns in CORRECTION_TYPE_PATTERNS.items()
+    },
+    "faculty_list": FACULTY_LIST_PATTERNS,
+    "alumni_list": ALUMNI_LIST_PATTERNS,
+    "director": DIRECTOR_PATTERNS,
+    **{
+        f"mention:{domain}": patterns
+        for domain, patterns in DOMAIN_MENTION_PATTERNS.items()
+    },
+    "contact": CONTACT_KEYWORDS,
+    "research": RESEARCH_KEYWORDS,
+    "publication": PUBLICATION_KEYWORDS,
+    **{
+        f"multi_domain:{domain}": patterns
+        for domain, patterns in MULTI_DOMAIN_SEARCH_PATTERNS.items()
+    },
+    "exit": EXIT_WORDS,
+    "preprocess_faculty_list": PREPROCESS_FACULTY_LIST_PATTERNS,
+}
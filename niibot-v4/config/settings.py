@@ -3,6 +3,8 @@ from dotenv import load_dotenv
 from langchain_groq import ChatGroq
 from langchain_huggingface import HuggingFaceEmbeddings
 
+from core.embedding_cache import CachedEmbeddings
+
 # === Load environment variables from .env ===
 load_dotenv()
 
@@ -10,11 +12,58 @@ load_dotenv()
 """
 Global configuration for the RAG system including:
 - Vector database directory path
-- Embedding model for semantic similarity
+- Embedding model for semantic similarity (wrapped in a query embedding cache)
 - LLM model for generating responses
 """
 VECTOR_DB_DIR = "../vectorstores"
-embedding_model = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+# Marker vector_indexer rewrites in a collection directory whenever it
+# changes the collection (keep in sync with vector_indexer's settings)
+INDEX_VERSION_FILENAME = "index_version"
+COLLECTION_NAMES = [
+    "faculty_info",
+    "research",
+    "publications",
+    "labs",
+    "nii_info",
+    "staff",
+    "programs_courses",
+    "recruitments",
+    "magazine",
+]
+EMBEDDING_CACHE_SIZE = 1024  # Distinct query texts kept in memory
+EMBEDDING_CACHE_TTL_SECONDS = 3600
+embedding_model = CachedEmbeddings(
+    HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2"),
+    maxsize=EMBEDDING_CACHE_SIZE,
+    ttl_seconds=EMBEDDING_CACHE_TTL_SECONDS,
+)
+FANOUT_MAX_WORKERS = 8  # Threads shared by all concurrent collection searches
+FANOUT_DEADLINE_SECONDS = 5.0  # Global budget for one multi-collection search
+# Retrieval cascade tiers run speculatively (in parallel) per domain. The
+# highest-priority tier that succeeds still wins; domains not listed run the
+# cascade strictly in order. Tiers: exact, first_name, partial,
+# cross_domain, semantic.
+SPECULATIVE_RETRIEVAL_DOMAINS = {
+    "faculty_info": ("exact", "first_name", "partial"),
+    "research": ("exact", "first_name", "partial"),
+    "publications": ("exact", "first_name", "partial"),
+}
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_SIZE = 512  # Cached answers across all domains
+RESPONSE_CACHE_TTL_SECONDS = 1800
+RESPONSE_CACHE_SIMILARITY_THRESHOLD = 0.92  # Cosine similarity for a cache hit
+DOMAIN_CLASSIFIER_ENABLED = True  # Local kNN router before the LLM router
+DOMAIN_CLASSIFIER_K = 5  # Nearest labeled examples that vote
+DOMAIN_CLASSIFIER_MIN_CONFIDENCE = 0.6  # Vote share needed to skip the LLM
+DOMAIN_CLASSIFIER_MIN_SIMILARITY = 0.5  # Nearest-example cosine similarity floor
+CONTEXT_TOKEN_BUDGET = 900  # Prompt context tokens (about the former 3,500 chars)
+CONTEXT_TOKEN_BUDGET_DIRECTOR = 1200  # Director queries combine several sources
+NEAR_DUPLICATE_DEDUP_ENABLED = True  # SimHash pass after exact doc_hash dedupe
+NEAR_DUPLICATE_MAX_DISTANCE = 3  # Differing SimHash bits (of 64) still "near"
+SESSION_MAX_SESSIONS = 1000  # Live chat sessions; least recently used evicted
+SESSION_IDLE_TTL_SECONDS = 3600  # Idle sessions are dropped (0 disables)
+SESSION_MAX_MESSAGES = 20  # Messages kept per session (0 keeps all)
+SESSION_DB_PATH = os.getenv("NIIBOT_SESSION_DB")  # SQLite file; unset = memory only
 llm = ChatGroq(
     model="llama3-8b-8192", temperature=0.1, api_key=os.getenv("GROQ_API_KEY")
 )
@@ -1,6 +1,8 @@
 from functools import lru_cache
 from typing import Optional
 
+from utils.pattern_matcher import match_patterns
+
 
 # ==== Performance Caching System ====
 @lru_cache(maxsize=128)
@@ -22,31 +24,11 @@ def _cached_query_preprocessing(query_lower: str) -> tuple:
     has_pronouns = any(pronoun in query_lower.split() for pronoun in pronouns)
 
     # Check for exit words
-    exit_words = ["bye", "goodbye", "exit", "quit", "thanks", "thank you"]
-    has_exit_words = any(word in query_lower for word in exit_words)
-
-    # Check for faculty list patterns
-    faculty_list_patterns = [
-        "faculty list",
-        "list of faculty",
-        "all faculty",
-        "faculty members",
-        "current faculty",
-        "show faculty",
-        "institute faculty",
-    ]
-    has_faculty_list_patterns = any(
-        pattern in query_lower for pattern in faculty_list_patterns
-    )
-
-    # Check for director patterns
-    director_patterns = [
-        "director",
-        "current director",
-        "nii director",
-        "institute director",
-    ]
-    has_director_patterns = any(pattern in query_lower for pattern in director_patterns)
+    # Check for exit words, faculty list and director patterns in one scan
+    matches = match_patterns(query_lower)
+    has_exit_words = matches.has("exit")
+    has_faculty_list_patterns = matches.has("preprocess_faculty_list")
+    has_director_patterns = matches.has("director")
 
     return (
         has_pronouns,
@@ -0,0 +1,135 @@
+"""Memoized Domain Chain Factory.
+
+get_enhanced_chain_for_domain() rebuilds the system prompt, the prompt
+template, the retrieval closure and the cache wrapper on every call, and
+the front ends used to call it on every message. The factory builds each
+domain's chain once per process and hands out the same object afterwards.
+
+Key Features:
+    - One chain per (domain, memory wrapper) pair, built under a lock
+    - Automatic rebuild when the indexer rewrites the domain's collection
+    - Build-time and hit/miss metrics for the cache stats command
+"""
+
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, Optional, Tuple
+
+from chains.rag_chain import get_enhanced_chain_for_domain
+from core.vectorstore_registry import get_vectorstore_registry
+
+ChainCacheInfo = namedtuple(
+    "ChainCacheInfo", ["hits", "builds", "invalidations", "currsize", "build_ms"]
+)
+
+
+class DomainChainFactory:
+    """Thread-safe cache of built domain chains keyed by collection version."""
+
+    def __init__(self, builder=get_enhanced_chain_for_domain):
+        """Create an empty factory.
+
+        Args:
+            builder: Function (domain, use_memory_wrapper) → (chain, info)
+        """
+        self._builder = builder
+        self._registry = get_vectorstore_registry()
+        self._chains: Dict[Tuple[str, bool], Tuple[object, object, int]] = {}
+        self._build_times: Dict[Tuple[str, bool], float] = {}
+        self._lock = threading.RLock()
+
+        self._hits = 0
+        self._builds = 0
+        self._invalidations = 0
+
+    def get(self, domain: str, use_memory_wrapper: bool = True) -> tuple:
+        """Return the chain for a domain, building it on first use.
+
+        Args:
+            domain (str): Domain to get a chain for
+            use_memory_wrapper (bool): Whether to wrap with memory (CLI vs Streamlit)
+
+        Returns:
+            tuple: (chain, additional_info), or (None, None) if the chain
+            cannot be built; failures are not cached
+        """
+        key = (domain, use_memory_wrapper)
+        version = self._registry.collection_version(domain)
+
+        with self._lock:
+            entry = self._chains.get(key)
+            if entry is not None:
+                chain, info, built_version = entry
+                if built_version == version:
+                    self._hits += 1
+                    return chain, info
+
+                # Re-indexed since the chain was built: drop it and its handle
+                print(f"♻️ Collection '{domain}' changed, rebuilding its chain")
+                self._invalidate_locked(domain)
+
+            start_time = time.perf_counter()
+            chain, info = self._builder(domain, use_memory_wrapper)
+            elapsed = time.perf_counter() - start_time
+            if chain is None:
+                return None, None
+
+            # Stamped with the version read before building, so a re-index
+            # that lands mid-build triggers another rebuild on the next call
+            self._chains[key] = (chain, info, version)
+            self._build_times[key] = elapsed
+            self._builds += 1
+            print(f"🧱 Built chain for '{domain}' in {elapsed * 1000:.0f}ms")
+            return chain, info
+
+    def _invalidate_locked(self, domain: Optional[str]):
+        """Drop cached chains (and vectorstore handles); caller holds the lock."""
+        keys = [key for key in self._chains if domain is None or key[0] == domain]
+        for key in keys:
+            del self._chains[key]
+            self._build_times.pop(key, None)
+        self._registry.invalidate(domain)
+        self._invalidations += len(keys)
+
+    def invalidate(self, domain: Optional[str] = None):
+        """Drop cached chains so the next get() rebuilds them.
+
+        Args:
+            domain (Optional[str]): Domain to drop, or None to drop all
+        """
+        with self._lock:
+            self._invalidate_locked(domain)
+
+    def build_times(self) -> Dict[str, float]:
+        """Return build time (ms) of every cached chain, keyed "domain[+memory]"."""
+        with self._lock:
+            return {
+                f"{domain}{'+memory' if use_memory else ''}": round(seconds * 1000, 1)
+                for (domain, use_memory), seconds in self._build_times.items()
+            }
+
+    def cache_info(self) -> ChainCacheInfo:
+        """Return hit/build statistics (like functools.lru_cache)."""
+        with self._lock:
+            return ChainCacheInfo(
+                hits=self._hits,
+                builds=self._builds,
+                invalidations=self._invalidations,
+                currsize=len(self._chains),
+                build_ms=round(sum(self._build_times.values()) * 1000),
+            )
+
+
+# ==== Process-wide Factory ====
+_chain_factory = DomainChainFactory()
+
+
+def get_chain_factory() -> DomainChainFactory:
+    """Return the process-wide chain factory."""
+    return _chain_factory
+
+
+def get_chain_for_domain(domain: str, use_memory_wrapper: bool = True) -> tuple:
+    """Shortcut for get_chain_factory().get(domain, use_memory_wrapper)."""
+    return _chain_factory.get(domain, use_memory_wrapper)
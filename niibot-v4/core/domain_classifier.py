@@ -0,0 +1,135 @@
+"""Local Embedding-based Domain Classifier.
+
+Routes a query to one of the NII domains by comparing its all-MiniLM-L6-v2
+embedding with labeled example queries (config/domain_examples.py), so most
+requests are classified in milliseconds without a Groq round trip.
+
+Key Features:
+    - Similarity-weighted k-nearest-neighbour vote over labeled examples
+    - Confidence score used to decide when to fall back to the LLM router
+    - Example vectors computed once, lazily, and shared across threads
+"""
+
+import threading
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config.domain_examples import DOMAIN_EXAMPLES
+from config.settings import (
+    embedding_model,
+    DOMAIN_CLASSIFIER_K,
+    DOMAIN_CLASSIFIER_MIN_CONFIDENCE,
+    DOMAIN_CLASSIFIER_MIN_SIMILARITY,
+)
+
+DomainPrediction = namedtuple(
+    "DomainPrediction", ["domain", "confidence", "similarity", "is_confident"]
+)
+
+
+class LocalDomainClassifier:
+    """k-nearest-neighbour domain classifier over example query embeddings."""
+
+    def __init__(
+        self,
+        examples: Optional[Dict[str, List[str]]] = None,
+        embedder=None,
+        k: int = DOMAIN_CLASSIFIER_K,
+        min_confidence: float = DOMAIN_CLASSIFIER_MIN_CONFIDENCE,
+        min_similarity: float = DOMAIN_CLASSIFIER_MIN_SIMILARITY,
+    ):
+        """Configure the classifier; example vectors are built on first use.
+
+        Args:
+            examples (Optional[Dict[str, List[str]]]): Domain → example queries.
+                Defaults to DOMAIN_EXAMPLES.
+            embedder: Embedding model used for examples and queries
+            k (int): Number of nearest examples that vote
+            min_confidence (float): Minimum vote share of the winning domain
+            min_similarity (float): Minimum cosine similarity of the nearest
+                example; below it the query is treated as out of distribution
+        """
+        self.examples = examples or DOMAIN_EXAMPLES
+        self.embedder = embedder or embedding_model
+        self.k = k
+        self.min_confidence = min_confidence
+        self.min_similarity = min_similarity
+
+        self._labels: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def _normalize(self, vectors) -> np.ndarray:
+        """Scale vectors to unit length so dot products are cosine similarities."""
+        matrix = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _ensure_fitted(self):
+        """Embed all example queries once."""
+        if self._matrix is not None:
+            return
+
+        with self._lock:
+            if self._matrix is not None:
+                return
+
+            labels, texts = [], []
+            for domain, queries in self.examples.items():
+                for query in queries:
+                    labels.append(domain)
+                    texts.append(query)
+
+            self._labels = labels
+            self._matrix = self._normalize(self.embedder.embed_documents(texts))
+            print(f"🧭 Local domain classifier ready: {len(texts)} examples")
+
+    def predict(self, query: str) -> DomainPrediction:
+        """Classify a query by similarity-weighted vote of its nearest examples.
+
+        Args:
+            query (str): User query
+
+        Returns:
+            DomainPrediction: Winning domain, its vote share, the similarity of
+            the nearest example, and whether the prediction clears both
+            confidence thresholds
+        """
+        self._ensure_fitted()
+
+        query_vector = self._normalize(self.embedder.embed_query(query))[0]
+        similarities = self._matrix @ query_vector
+
+        k = min(self.k, len(self._labels))
+        nearest = np.argpartition(-similarities, k - 1)[:k]
+
+        votes: Dict[str, float] = {}
+        for index in nearest:
+            weight = max(float(similarities[index]), 0.0)
+            votes[self._labels[index]] = votes.get(self._labels[index], 0.0) + weight
+
+        domain = max(votes, key=votes.get)
+        total = sum(votes.values())
+        confidence = votes[domain] / total if total else 0.0
+        similarity = float(similarities[nearest].max())
+
+        is_confident = (
+            confidence >= self.min_confidence and similarity >= self.min_similarity
+        )
+        return DomainPrediction(domain, confidence, similarity, is_confident)
+
+    def warm_up(self):
+        """Embed the examples ahead of the first query."""
+        self._ensure_fitted()
+
+
+# ==== Process-wide Classifier ====
+_classifier = LocalDomainClassifier()
+
+
+def get_domain_classifier() -> LocalDomainClassifier:
+    """Return the process-wide local domain classifier."""
+    return _classifier
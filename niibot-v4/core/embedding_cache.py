@@ -0,0 +1,147 @@
+"""Query Embedding Cache for the Sentence-Transformer Model.
+
+A single user question is embedded many times during retrieval (every tier of
+the cascade and every cross-domain probe calls similarity_search). This module
+wraps the embedding model so that each distinct text is encoded once.
+
+Key Features:
+    - Keys are normalized text (lowercase, collapsed whitespace)
+    - Bounded LRU eviction with a per-entry time-to-live
+    - Hit / miss / eviction counters for the cache_stats command
+    - Drop-in replacement for any LangChain Embeddings implementation
+"""
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+EmbeddingCacheInfo = namedtuple(
+    "EmbeddingCacheInfo",
+    ["hits", "misses", "evictions", "expired", "maxsize", "currsize"],
+)
+
+
+def normalize_embedding_text(text: str) -> str:
+    """Normalize text before embedding and cache lookup.
+
+    all-MiniLM-L6-v2 uses an uncased tokenizer that splits on whitespace, so
+    lowercasing and collapsing whitespace does not change the vector.
+
+    Args:
+        text (str): Raw query text
+
+    Returns:
+        str: Normalized text used both as cache key and model input
+    """
+    return " ".join(text.lower().split())
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain Embeddings wrapper with an LRU/TTL cache in front of the model."""
+
+    def __init__(
+        self, model: Embeddings, maxsize: int = 1024, ttl_seconds: float = 3600
+    ):
+        """Wrap an embedding model with a bounded cache.
+
+        Args:
+            model (Embeddings): Underlying embedding model
+            maxsize (int): Maximum number of cached vectors
+            ttl_seconds (float): Seconds before an entry expires (0 disables TTL)
+        """
+        self.model = model
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+    def _lookup(self, key: str) -> Optional[List[float]]:
+        """Return a cached vector and refresh its LRU position (lock held)."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        vector, stored_at = entry
+        if self.ttl_seconds and time.monotonic() - stored_at > self.ttl_seconds:
+            del self._cache[key]
+            self.expired += 1
+            return None
+
+        self._cache.move_to_end(key)
+        return vector
+
+    def _store(self, key: str, vector: List[float]):
+        """Insert a vector and evict the least recently used entries (lock held)."""
+        self._cache[key] = (vector, time.monotonic())
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query, reusing a cached vector when available."""
+        key = normalize_embedding_text(text)
+        with self._lock:
+            vector = self._lookup(key)
+            if vector is not None:
+                self.hits += 1
+                return vector
+            self.misses += 1
+
+        vector = self.model.embed_query(key)
+
+        with self._lock:
+            self._store(key, vector)
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed many texts, sending only cache misses to the model in one batch."""
+        keys = [normalize_embedding_text(text) for text in texts]
+        vectors: List[Optional[List[float]]] = [None] * len(keys)
+        missing = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._lookup(key)
+                if vector is not None:
+                    self.hits += 1
+                    vectors[i] = vector
+                else:
+                    self.misses += 1
+                    missing.setdefault(key, []).append(i)
+
+        if missing:
+            missing_keys = list(missing.keys())
+            computed = self.model.embed_documents(missing_keys)
+            with self._lock:
+                for key, vector in zip(missing_keys, computed):
+                    self._store(key, vector)
+                    for i in missing[key]:
+                        vectors[i] = vector
+
+        return vectors
+
+    def cache_info(self) -> EmbeddingCacheInfo:
+        """Return cache statistics in the style of functools.lru_cache."""
+        with self._lock:
+            return EmbeddingCacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                self.expired,
+                self.maxsize,
+                len(self._cache),
+            )
+
+    def cache_clear(self):
+        """Remove all cached vectors and reset the counters."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = self.evictions = self.expired = 0
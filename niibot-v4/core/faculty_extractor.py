@@ -22,6 +22,8 @@ from config.faculty_data import (
     SPECIAL_POSITIONS,
     FALSE_POSITIVES,
 )
+from core.name_index import get_faculty_name_index
+from utils.pattern_matcher import match_patterns
 
 
 def _fallback_query_preprocessing(query_lower: str) -> tuple:
@@ -40,29 +42,11 @@ def _fallback_query_preprocessing(query_lower: str) -> tuple:
     pronouns = ["his", "her", "their", "its", "he", "she", "they"]
     has_pronouns = any(pronoun in query_lower.split() for pronoun in pronouns)
 
-    exit_words = ["bye", "goodbye", "exit", "quit", "thanks", "thank you"]
-    has_exit_words = any(word in query_lower for word in exit_words)
-
-    faculty_list_patterns = [
-        "faculty list",
-        "list of faculty",
-        "all faculty",
-        "faculty members",
-        "current faculty",
-        "show faculty",
-        "institute faculty",
-    ]
-    has_faculty_list_patterns = any(
-        pattern in query_lower for pattern in faculty_list_patterns
-    )
-
-    director_patterns = [
-        "director",
-        "current director",
-        "nii director",
-        "institute director",
-    ]
-    has_director_patterns = any(pattern in query_lower for pattern in director_patterns)
+    # Exit words, faculty list and director patterns in one scan
+    matches = match_patterns(query_lower)
+    has_exit_words = matches.has("exit")
+    has_faculty_list_patterns = matches.has("preprocess_faculty_list")
+    has_director_patterns = matches.has("director")
 
     return (
         has_pronouns,
@@ -108,6 +92,26 @@ class FacultyNameExtractor:
         - Complex patterns: Ambiguous surnames with context disambiguation
     """
 
+    # Words suggesting a query is about a faculty member
+    ACADEMIC_INDICATORS = (
+        "dr",
+        "prof",
+        "professor",
+        "doctor",
+        "faculty",
+        "email",
+        "contact",
+        "research",
+        "publication",
+        "lab",
+        "about",
+        "tell me",
+        "working on",
+        "interests",
+        "phone",
+        "extension",
+    )
+
     def __init__(
         self,
         query_preprocessor: Optional[Callable] = None,
@@ -129,6 +133,9 @@ class FacultyNameExtractor:
         self.special_positions = SPECIAL_POSITIONS
         self.false_positives = FALSE_POSITIVES
 
+        # Trie/automaton index over the databases (shared, built once)
+        self.name_index = get_faculty_name_index()
+
         # Dependency injection with fallback implementations
         self.query_preprocessor = query_preprocessor or _fallback_query_preprocessing
         self.name_lookup = name_lookup or self._default_name_lookup
@@ -191,6 +198,7 @@ class FacultyNameExtractor:
             4. Enhanced partial name matching
             5. First name database lookup
             6. Ambiguous name disambiguation
+            7. Fuzzy (single-typo) name lookup
 
         Args:
             query (str): User query to process
@@ -244,6 +252,12 @@ class FacultyNameExtractor:
             names.extend(disambiguated_names)
             return names
 
+        # Strategy 5: Fuzzy name lookup for misspelt names
+        extracted_name = self._try_fuzzy_name_matching(query_lower)
+        if extracted_name:
+            names.append(extracted_name)
+            return names
+
         return list(set(names))
 
     def _try_exact_faculty_matching(self, query_lower: str) -> Optional[str]:
@@ -258,12 +272,12 @@ class FacultyNameExtractor:
         Returns:
             Optional[str]: Matched faculty name or None
         """
-        for known_name in self.known_faculty.keys():
-            if known_name in query_lower:
-                result = self.name_lookup(known_name, "known_faculty")
-                if result:
-                    print(f"Exact faculty match: '{known_name}' → '{result}'")
-                    return result
+        # Keys occurring in the query, in database order
+        for known_name in self.name_index.scan(query_lower).get("known_faculty"):
+            result = self.name_lookup(known_name, "known_faculty")
+            if result:
+                print(f"Exact faculty match: '{known_name}' → '{result}'")
+                return result
         return None
 
     def _try_enhanced_partial_matching(self, query_lower: str) -> Optional[str]:
@@ -311,14 +325,9 @@ class FacultyNameExtractor:
         Returns:
             Optional[str]: Matched faculty name or None
         """
-        query_words = query_lower.split()
-
-        # Check each word and phrase against first names database
-        for first_name in self.first_names.keys():
-            if (
-                first_name in query_words or first_name in query_lower
-            ) and self._is_valid_name_context(query_lower, first_name):
-
+        # First names occurring in the query, in database order
+        for first_name in self.name_index.scan(query_lower).get("first_names"):
+            if self._is_valid_name_context(query_lower, first_name):
                 result = self.name_lookup(first_name, "first_names")
                 if result:
                     print(f"First name match: '{first_name}' → '{result}'")
@@ -339,16 +348,44 @@ class FacultyNameExtractor:
         Returns:
             List[str]: List of disambiguated faculty names
         """
-        for ambiguous_name in self.ambiguous_names.keys():
-            if ambiguous_name in query_lower:
-                candidates = self.name_lookup(ambiguous_name, "ambiguous")
-                if candidates:
-                    disambiguated = self._disambiguate_names(query, candidates)
-                    if disambiguated:
-                        print(f"Disambiguated: '{ambiguous_name}' → {disambiguated}")
-                        return disambiguated
+        for ambiguous_name in self.name_index.scan(query_lower).get("ambiguous"):
+            candidates = self.name_lookup(ambiguous_name, "ambiguous")
+            if candidates:
+                disambiguated = self._disambiguate_names(query, candidates)
+                if disambiguated:
+                    print(f"Disambiguated: '{ambiguous_name}' → {disambiguated}")
+                    return disambiguated
         return []
 
+    def _try_fuzzy_name_matching(self, query_lower: str) -> Optional[str]:
+        """Typo-tolerant lookup of single name words ("monika email" → Monica).
+
+        Conservative last resort: only words of 5+ characters are considered,
+        at most one edit away from a known name token, and only when that
+        resolves to exactly one faculty member in an academic context.
+
+        Args:
+            query_lower (str): Lowercase user query
+
+        Returns:
+            Optional[str]: Matched faculty name or None
+        """
+        for word in self._extract_query_words(query_lower):
+            if len(word) < 5 or word in self.false_positives:
+                continue
+
+            candidates = []
+            for token in self.name_index.fuzzy_lookup(word, max_distance=1):
+                for full_name in self.name_index.names_for_token(token):
+                    if full_name not in candidates:
+                        candidates.append(full_name)
+
+            if len(candidates) == 1 and self._is_valid_token_context(query_lower, word):
+                print(f"Fuzzy match: '{word}' → '{candidates[0]}'")
+                return candidates[0]
+
+        return None
+
     def _extract_query_words(self, query_lower: str) -> List[str]:
         """Extract meaningful words from query for name matching.
 
@@ -402,42 +439,17 @@ class FacultyNameExtractor:
         Returns:
             Optional[str]: Matched full faculty name or None
         """
-        # Check against known faculty database
-        for known_name, full_name in self.known_faculty.items():
-            if potential_name in known_name or self._is_name_similarity(
-                potential_name, known_name
-            ):
-                return full_name
-
-        # Check against first names database
-        for first_name, full_name in self.first_names.items():
-            if potential_name in first_name or first_name in potential_name:
-                return full_name
-
-        return None
-
-    def _is_name_similarity(self, potential_name: str, known_name: str) -> bool:
-        """Check for name similarity using flexible matching criteria.
-
-        Uses word-level matching to handle variations in name formatting
-        and partial matches.
-
-        Args:
-            potential_name (str): Potential name to check
-            known_name (str): Known faculty name from database
-
-        Returns:
-            bool: True if names are similar enough to match
-        """
-        potential_words = set(potential_name.split())
-        known_words = set(known_name.split())
+        # Check against known faculty database (contains or word overlap)
+        known_name = self.name_index.first_known_match(potential_name)
+        if known_name:
+            return self.known_faculty[known_name]
 
-        # Calculate word overlap
-        overlap = len(potential_words.intersection(known_words))
-        min_words = min(len(potential_words), len(known_words))
+        # Check against first names database (contains or contained in)
+        first_name = self.name_index.first_first_name_match(potential_name)
+        if first_name:
+            return self.first_names[first_name]
 
-        # Require significant overlap for similarity
-        return overlap > 0 and overlap >= min_words * 0.6
+        return None
 
     def _is_valid_name_context(self, query_lower: str, name: str) -> bool:
         """Validate name appears in appropriate academic context.
@@ -453,29 +465,8 @@ class FacultyNameExtractor:
             bool: True if context is appropriate for faculty search
         """
         # Check for false positive patterns
-        for false_positive in self.false_positives:
-            if false_positive in query_lower:
-                return False
-
-        # Look for academic context indicators
-        academic_indicators = [
-            "dr",
-            "prof",
-            "professor",
-            "doctor",
-            "faculty",
-            "email",
-            "contact",
-            "research",
-            "publication",
-            "lab",
-            "about",
-            "tell me",
-            "working on",
-            "interests",
-            "phone",
-            "extension",
-        ]
+        if self.name_index.scan(query_lower).has("false_positive"):
+            return False
 
         # Check for academic context around the name
         name_position = query_lower.find(name)
@@ -485,11 +476,40 @@ class FacultyNameExtractor:
             context_end = min(len(query_lower), name_position + len(name) + 10)
             name_context = query_lower[context_start:context_end]
 
-            if any(indicator in name_context for indicator in academic_indicators):
+            if any(indicator in name_context for indicator in self.ACADEMIC_INDICATORS):
                 return True
 
         # Check for academic indicators anywhere in query
-        return any(indicator in query_lower for indicator in academic_indicators)
+        return self._has_academic_context(query_lower)
+
+    def _has_academic_context(self, query_lower: str) -> bool:
+        """Check the query for any academic context indicator."""
+        return any(indicator in query_lower for indicator in self.ACADEMIC_INDICATORS)
+
+    def _is_valid_token_context(self, query_lower: str, word: str) -> bool:
+        """Validate a fuzzily matched word without rejecting the whole query.
+
+        Unlike _is_valid_name_context, false positive phrases only count when
+        they cover the word itself ("structural biology"), so ordinary query
+        words such as "email" or "tell me about" elsewhere do not block it.
+
+        Args:
+            query_lower (str): Lowercase user query
+            word (str): Query word matched to a name token
+
+        Returns:
+            bool: True if the word can be read as a name in an academic query
+        """
+        match = re.search(rf"\b{re.escape(word)}\b", query_lower)
+        if match is None:
+            return False
+
+        for phrase in self.name_index.scan(query_lower).get("false_positive"):
+            for fp_match in re.finditer(re.escape(phrase), query_lower):
+                if fp_match.start() < match.end() and match.start() < fp_match.end():
+                    return False
+
+        return self._has_academic_context(query_lower)
 
     def _disambiguate_names(self, query: str, candidates: List[str]) -> List[str]:
         """Resolve ambiguous names using contextual clues and domain knowledge.
@@ -578,6 +598,19 @@ def create_faculty_extractor_with_cache():
         return FacultyNameExtractor()
 
 
+@lru_cache(maxsize=1)
+def get_shared_faculty_extractor():
+    """Return one process-wide cached extractor.
+
+    Reusing the same instance keeps its per-query extraction cache warm
+    across requests instead of starting empty for every new extractor.
+
+    Returns:
+        FacultyNameExtractor: Shared extractor instance with caching
+    """
+    return create_faculty_extractor_with_cache()
+
+
 def create_faculty_extractor_no_cache():
     """Factory function for explicit non-cached extractor creation.
 
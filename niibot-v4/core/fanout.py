@@ -0,0 +1,127 @@
+"""Concurrent Fan-out Executor for Cross-Collection Searches.
+
+Multi-domain and director queries search several collections that share
+nothing with each other. This module runs those per-collection searches on a
+shared thread pool so the wall-clock cost is the slowest search rather than
+the sum of all of them.
+
+Key Features:
+    - One process-wide, bounded thread pool (no per-request thread creation)
+    - Global deadline: stragglers are abandoned once the deadline passes
+    - Optional early exit once enough documents have been collected
+    - Results keyed by task name so callers merge them in their own order
+    - Nested calls from a pool thread run inline to avoid pool starvation
+"""
+
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Callable, Dict, Optional
+
+from config.settings import FANOUT_MAX_WORKERS, FANOUT_DEADLINE_SECONDS
+
+_THREAD_PREFIX = "niibot-fanout"
+_executor = ThreadPoolExecutor(
+    max_workers=FANOUT_MAX_WORKERS, thread_name_prefix=_THREAD_PREFIX
+)
+
+
+def _count_results(result: Any) -> int:
+    """Count documents in a task result (lists count their items)."""
+    if result is None:
+        return 0
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return 1
+
+
+def run_fanout(
+    tasks: Dict[str, Callable[[], Any]],
+    deadline_seconds: Optional[float] = FANOUT_DEADLINE_SECONDS,
+    enough_results: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Run independent search tasks concurrently and collect their results.
+
+    Args:
+        tasks (Dict[str, Callable]): Task name → zero-argument callable
+        deadline_seconds (Optional[float]): Global time budget for all tasks.
+            None waits for every task.
+        enough_results (Optional[int]): Stop waiting (and cancel tasks that
+            have not started) once this many documents have been collected
+
+    Returns:
+        Dict[str, Any]: Task name → result for every task that finished
+        successfully in time. Failed, cancelled and late tasks are omitted.
+
+    Example:
+        >>> results = run_fanout({"research": search_research, "labs": search_labs})
+        >>> docs = [doc for name in ("research", "labs") for doc in results.get(name, [])]
+    """
+    if not tasks:
+        return {}
+
+    # A task running on the pool must not block on the same pool
+    if threading.current_thread().name.startswith(_THREAD_PREFIX):
+        return _run_inline(tasks, enough_results)
+
+    start_time = time.perf_counter()
+    futures = {_executor.submit(task): name for name, task in tasks.items()}
+    pending = set(futures)
+    results = {}
+    collected = 0
+
+    while pending:
+        timeout = None
+        if deadline_seconds is not None:
+            timeout = deadline_seconds - (time.perf_counter() - start_time)
+            if timeout <= 0:
+                break
+
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            break  # Deadline reached
+
+        for future in done:
+            name = futures[future]
+            try:
+                results[name] = future.result()
+                collected += _count_results(results[name])
+            except Exception as e:
+                print(f"   ❌ Fan-out task '{name}' failed: {e}")
+
+        if enough_results is not None and collected >= enough_results:
+            print(f"   ⏹️ Fan-out has {collected} results, cancelling the rest")
+            break
+
+    for future in pending:
+        future.cancel()
+    if pending:
+        late = sorted(futures[future] for future in pending)
+        print(f"   ⏱️ Fan-out abandoned {len(late)} task(s): {late}")
+
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+    print(
+        f"   ⚡ Fan-out finished {len(results)}/{len(tasks)} tasks in {elapsed_ms:.0f}ms"
+    )
+    return results
+
+
+def _run_inline(
+    tasks: Dict[str, Callable[[], Any]], enough_results: Optional[int]
+) -> Dict[str, Any]:
+    """Sequential fallback used when already running on a fan-out thread."""
+    results = {}
+    collected = 0
+    for name, task in tasks.items():
+        try:
+            results[name] = task()
+            collected += _count_results(results[name])
+        except Exception as e:
+            print(f"   ❌ Fan-out task '{name}' failed: {e}")
+        if enough_results is not None and collected >= enough_results:
+            break
+    return results
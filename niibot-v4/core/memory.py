@@ -1,11 +1,11 @@
-from langchain_community.chat_message_histories.in_memory import ChatMessageHistory
+from core.session_store import get_session_store
 
 # ==== Memory Management Section ====
 """
 Session-based memory system to maintain conversation history
-Each user session gets its own memory store
+Each user session gets its own history in a bounded session store
+(see core/session_store.py for size, idle-TTL and persistence settings)
 """
-session_histories = {}  # Dictionary to store chat histories by session ID
 
 
 def get_session_history(session_id: str):
@@ -16,13 +16,50 @@ def get_session_history(session_id: str):
         session_id (str): Unique identifier for the user session
 
     Returns:
-        ChatMessageHistory: Memory object containing conversation history
+        BaseChatMessageHistory: Memory object containing conversation history
 
     Purpose: Enables contextual conversations by remembering previous exchanges
     """
-    if session_id not in session_histories:
-        session_histories[session_id] = ChatMessageHistory()
-    return session_histories[session_id]
+    return get_session_store().get(session_id)
+
+
+def needs_context_rewrite(query: str, chat_history: list) -> bool:
+    """
+    Decide whether a query depends on the conversation and must be rewritten.
+
+    Args:
+        query (str): Current user query
+        chat_history (list): Previous conversation exchanges
+
+    Returns:
+        bool: True if the query has pronouns or implicit references that
+        rewrite_query_with_context would resolve from chat history
+
+    Purpose: Shared by the query rewriter and the response cache, so that
+    context-dependent questions are never answered from another conversation
+    """
+    # If no chat history, there is nothing to resolve against
+    if not chat_history or len(chat_history) == 0:
+        return False
+
+    # Check if query contains pronouns that need resolution
+    pronouns = ["his", "her", "their", "its", "he", "she", "they"]
+    query_lower = query.lower()
+
+    # Quick optimization: if no pronouns and no implicit references, it's standalone
+    if not any(pronoun in query_lower.split() for pronoun in pronouns):
+        # Also check for implicit references like "publications", "research"
+        if not any(
+            word in query_lower
+            for word in ["about his", "about her", "publications", "research", "lab"]
+        ):
+            return False
+
+    # If query already contains a specific name, don't rewrite
+    if "dr." in query_lower or "prof." in query_lower:
+        return False
+
+    return True
 
 
 def rewrite_query_with_context(query: str, chat_history: list, llm) -> str:
@@ -44,27 +81,55 @@ def rewrite_query_with_context(query: str, chat_history: list, llm) -> str:
 
     Purpose: Converts ambiguous queries into self-contained, searchable queries
     """
-    # If no chat history, return original query
-    if not chat_history or len(chat_history) == 0:
+    rewrite_prompt = _build_rewrite_prompt(query, chat_history)
+    if rewrite_prompt is None:
         return query
 
-    # Check if query contains pronouns that need resolution
-    pronouns = ["his", "her", "their", "its", "he", "she", "they"]
-    query_lower = query.lower()
+    try:
+        return _validate_rewrite(query, llm.invoke(rewrite_prompt))
+    except Exception as e:
+        print(f"⚠️ Query rewriting failed: {e}")
+        return query
 
-    # Quick optimization: if no pronouns and no implicit references, return as-is
-    if not any(pronoun in query_lower.split() for pronoun in pronouns):
-        # Also check for implicit references like "publications", "research"
-        if not any(
-            word in query_lower
-            for word in ["about his", "about her", "publications", "research", "lab"]
-        ):
-            return query
 
-    # If query already contains a specific name, don't rewrite
-    if "dr." in query_lower or "prof." in query_lower:
+async def arewrite_query_with_context(query: str, chat_history: list, llm) -> str:
+    """
+    Async version of rewrite_query_with_context() using the LLM's async API.
+
+    Args:
+        query (str): Current user query that may contain pronouns
+        chat_history (list): Previous conversation exchanges for context
+        llm: Language model to perform the rewriting
+
+    Returns:
+        str: Rewritten query with pronouns replaced by actual names
+    """
+    rewrite_prompt = _build_rewrite_prompt(query, chat_history)
+    if rewrite_prompt is None:
         return query
 
+    try:
+        return _validate_rewrite(query, await llm.ainvoke(rewrite_prompt))
+    except Exception as e:
+        print(f"⚠️ Query rewriting failed: {e}")
+        return query
+
+
+def _build_rewrite_prompt(query: str, chat_history: list):
+    """
+    Build the pronoun-resolution prompt for a query.
+
+    Args:
+        query (str): Current user query
+        chat_history (list): Previous conversation exchanges
+
+    Returns:
+        str: Rewrite prompt, or None if the query needs no rewriting
+    """
+    # Only rewrite queries that actually depend on the conversation
+    if not needs_context_rewrite(query, chat_history):
+        return None
+
     # Extract recent conversation context (last exchange only for efficiency)
     context_parts = []
     for i, chat in enumerate(chat_history[-1:]):  # Last 1 exchange
@@ -85,7 +150,7 @@ def rewrite_query_with_context(query: str, chat_history: list, llm) -> str:
             context_parts.append(str(chat))
 
     if not context_parts:
-        return query  # No valid context, return original
+        return None  # No valid context, keep original
 
     context = "\n".join(context_parts)
 
@@ -113,20 +178,29 @@ def rewrite_query_with_context(query: str, chat_history: list, llm) -> str:
 
     Return ONLY the rewritten query, nothing else:"""
 
-    try:
-        rewritten = llm.invoke(rewrite_prompt)
-        # Extract content from LLM response object
-        if hasattr(rewritten, "content"):
-            rewritten = rewritten.content
+    return rewrite_prompt
 
-        rewritten = str(rewritten).strip()
 
-        # Validate the rewritten query (reasonable length check)
-        if len(rewritten) > 0 and len(rewritten) < 200:
-            print(f"✏️ Rewritten query: '{query}' → '{rewritten}'")
-            return rewritten
-        else:
-            return query
-    except Exception as e:
-        print(f"⚠️ Query rewriting failed: {e}")
+def _validate_rewrite(query: str, rewritten) -> str:
+    """
+    Accept the LLM's rewrite if it looks like a query, else keep the original.
+
+    Args:
+        query (str): Original query
+        rewritten: LLM response object or string
+
+    Returns:
+        str: Rewritten or original query
+    """
+    # Extract content from LLM response object
+    if hasattr(rewritten, "content"):
+        rewritten = rewritten.content
+
+    rewritten = str(rewritten).strip()
+
+    # Validate the rewritten query (reasonable length check)
+    if len(rewritten) > 0 and len(rewritten) < 200:
+        print(f"✏️ Rewritten query: '{query}' → '{rewritten}'")
+        return rewritten
+    else:
         return query
@@ -0,0 +1,297 @@
+"""Trie-based Faculty Name Index.
+
+FacultyNameExtractor used to loop over every key of the faculty databases
+for each query. This module builds one index from config/faculty_data.py so
+that every lookup costs time proportional to the query, not to the roster.
+
+Index structures:
+    - Aho-Corasick automata: which database keys occur inside the query
+    - Generalized suffix trie: which database keys contain a query fragment
+    - Token inverted index: word-overlap similarity between names
+    - Token trie: prefix and edit-distance-bounded (fuzzy) token lookups
+
+All "first match" answers follow the insertion order of the source
+dictionaries, so results are identical to the original linear scans.
+"""
+
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from config.faculty_data import (
+    KNOWN_FACULTY,
+    AMBIGUOUS_NAMES,
+    FIRST_NAMES,
+    FALSE_POSITIVES,
+)
+from utils.pattern_matcher import PatternMatcher
+
+
+class _SuffixTrie:
+    """Generalized suffix trie answering "which key contains this fragment?".
+
+    Every node stores the smallest key index among the keys whose suffixes
+    pass through it, so a lookup returns the first containing key in O(len).
+    """
+
+    def __init__(self, keys: List[str]):
+        self._children: List[Dict[str, int]] = [{}]
+        self._first_key: List[int] = [0]
+
+        for key_index, key in enumerate(keys):
+            for start in range(len(key)):
+                node = 0
+                for char in key[start:]:
+                    next_node = self._children[node].get(char)
+                    if next_node is None:
+                        next_node = len(self._children)
+                        self._children[node][char] = next_node
+                        self._children.append({})
+                        self._first_key.append(key_index)
+                    node = next_node
+
+    def first_containing(self, fragment: str) -> Optional[int]:
+        """Return the index of the first key containing fragment, or None."""
+        node = 0
+        for char in fragment:
+            node = self._children[node].get(char)
+            if node is None:
+                return None
+        return self._first_key[node] if fragment else 0
+
+
+class _TokenTrie:
+    """Character trie over name tokens with prefix and fuzzy search."""
+
+    def __init__(self):
+        self._children: List[Dict[str, int]] = [{}]
+        self._token: List[Optional[str]] = [None]
+
+    def add(self, token: str):
+        """Insert a token."""
+        node = 0
+        for char in token:
+            next_node = self._children[node].get(char)
+            if next_node is None:
+                next_node = len(self._children)
+                self._children[node][char] = next_node
+                self._children.append({})
+                self._token.append(None)
+            node = next_node
+        self._token[node] = token
+
+    def _collect(self, node: int, found: List[str]):
+        """Collect every token below a node (depth first)."""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if self._token[current] is not None:
+                found.append(self._token[current])
+            stack.extend(self._children[current].values())
+
+    def with_prefix(self, prefix: str) -> List[str]:
+        """Return all tokens starting with prefix."""
+        node = 0
+        for char in prefix:
+            node = self._children[node].get(char)
+            if node is None:
+                return []
+        found: List[str] = []
+        self._collect(node, found)
+        return found
+
+    def within_distance(self, word: str, max_distance: int) -> Dict[str, int]:
+        """Return tokens within a Levenshtein distance of word.
+
+        Walks the trie with one dynamic-programming row per node and prunes
+        any branch whose row minimum already exceeds max_distance.
+
+        Returns:
+            Dict[str, int]: Token → edit distance
+        """
+        found: Dict[str, int] = {}
+        first_row = list(range(len(word) + 1))
+        stack = [(child, char, first_row) for char, child in self._children[0].items()]
+
+        while stack:
+            node, char, previous_row = stack.pop()
+            row = [previous_row[0] + 1]
+            for column in range(1, len(word) + 1):
+                row.append(
+                    min(
+                        row[column - 1] + 1,
+                        previous_row[column] + 1,
+                        previous_row[column - 1] + (word[column - 1] != char),
+                    )
+                )
+
+            token = self._token[node]
+            if token is not None and row[-1] <= max_distance:
+                found[token] = row[-1]
+
+            if min(row) <= max_distance:
+                stack.extend(
+                    (child, next_char, row)
+                    for next_char, child in self._children[node].items()
+                )
+
+        return found
+
+
+class FacultyNameIndex:
+    """Lookup structures over the faculty name databases."""
+
+    def __init__(
+        self,
+        known_faculty: Dict[str, str] = KNOWN_FACULTY,
+        first_names: Dict[str, str] = FIRST_NAMES,
+        ambiguous_names: Dict[str, List[str]] = AMBIGUOUS_NAMES,
+        false_positives: Iterable[str] = FALSE_POSITIVES,
+    ):
+        """Build the index once from the faculty databases.
+
+        Args:
+            known_faculty (Dict[str, str]): Name variant → standardized name
+            first_names (Dict[str, str]): First name → standardized name
+            ambiguous_names (Dict[str, List[str]]): Shared name → candidates
+            false_positives (Iterable[str]): Phrases that are not names
+        """
+        self.known_faculty = known_faculty
+        self.first_names = first_names
+        self.ambiguous_names = ambiguous_names
+
+        self._known_keys = list(known_faculty)
+        self._first_keys = list(first_names)
+        self._first_positions = {key: i for i, key in enumerate(self._first_keys)}
+
+        # Which keys occur inside a query (single pass per query, cached)
+        self.scan = lru_cache(maxsize=512)(self._scan)
+        self._matcher = PatternMatcher(
+            {
+                "known_faculty": self._known_keys,
+                "first_names": self._first_keys,
+                "ambiguous": list(ambiguous_names),
+                "false_positive": sorted(false_positives),
+            }
+        )
+
+        # Which keys contain a query fragment
+        self._known_suffixes = _SuffixTrie(self._known_keys)
+        self._first_suffixes = _SuffixTrie(self._first_keys)
+
+        # Word → indices of known names using that word (ascending)
+        self._known_words = [set(key.split()) for key in self._known_keys]
+        self._word_index: Dict[str, List[int]] = {}
+        for key_index, words in enumerate(self._known_words):
+            for word in words:
+                self._word_index.setdefault(word, []).append(key_index)
+
+        # Token → standardized names, for prefix and fuzzy lookups
+        self._token_names: Dict[str, List[str]] = {}
+        self._tokens = _TokenTrie()
+        for key, full_name in list(known_faculty.items()) + list(first_names.items()):
+            for token in key.replace(".", "").split():
+                names = self._token_names.setdefault(token, [])
+                if not names:
+                    self._tokens.add(token)
+                if full_name not in names:
+                    names.append(full_name)
+
+    # ===== Substring scans of the query =====
+
+    def _scan(self, query_lower: str):
+        """Match every database key occurring in the query, in one pass.
+
+        Returns:
+            PatternMatches: Groups "known_faculty", "first_names",
+            "ambiguous" and "false_positive", each in dictionary order
+        """
+        return self._matcher.match(query_lower)
+
+    # ===== Fragment lookups =====
+
+    def first_known_match(self, potential_name: str) -> Optional[str]:
+        """First KNOWN_FACULTY key that contains the fragment or shares enough
+        words with it (at least 60% of the shorter name), in dictionary order.
+
+        Args:
+            potential_name (str): Candidate name fragment from the query
+
+        Returns:
+            Optional[str]: Matching KNOWN_FACULTY key or None
+        """
+        best = self._known_suffixes.first_containing(potential_name)
+
+        potential_words = set(potential_name.split())
+        overlaps = Counter(
+            key_index
+            for word in potential_words
+            for key_index in self._word_index.get(word, ())
+        )
+        for key_index, overlap in overlaps.items():
+            if best is not None and key_index >= best:
+                continue
+            min_words = min(len(potential_words), len(self._known_words[key_index]))
+            if overlap >= min_words * 0.6:
+                best = key_index
+
+        return self._known_keys[best] if best is not None else None
+
+    def first_first_name_match(self, potential_name: str) -> Optional[str]:
+        """First FIRST_NAMES key that contains, or is contained in, the fragment.
+
+        Args:
+            potential_name (str): Candidate name fragment from the query
+
+        Returns:
+            Optional[str]: Matching FIRST_NAMES key or None
+        """
+        best = self._first_suffixes.first_containing(potential_name)
+
+        contained = self._matcher.match(potential_name).first("first_names")
+        if contained is not None:
+            contained_index = self._first_positions[contained]
+            if best is None or contained_index < best:
+                best = contained_index
+
+        return self._first_keys[best] if best is not None else None
+
+    # ===== Token lookups =====
+
+    def prefix_lookup(self, prefix: str) -> List[str]:
+        """Standardized names with a name token starting with prefix.
+
+        Args:
+            prefix (str): Lowercase token prefix (e.g. "moni")
+
+        Returns:
+            List[str]: Matching standardized names without duplicates
+        """
+        names: List[str] = []
+        for token in sorted(self._tokens.with_prefix(prefix)):
+            for full_name in self._token_names[token]:
+                if full_name not in names:
+                    names.append(full_name)
+        return names
+
+    def fuzzy_lookup(self, word: str, max_distance: int = 1) -> Dict[str, int]:
+        """Name tokens within an edit distance of a (possibly misspelt) word.
+
+        Args:
+            word (str): Lowercase query word (e.g. "monika")
+            max_distance (int): Maximum Levenshtein distance
+
+        Returns:
+            Dict[str, int]: Name token → edit distance
+        """
+        return self._tokens.within_distance(word, max_distance)
+
+    def names_for_token(self, token: str) -> List[str]:
+        """Standardized names that use an exact token."""
+        return list(self._token_names.get(token, ()))
+
+
+@lru_cache(maxsize=1)
+def get_faculty_name_index() -> FacultyNameIndex:
+    """Return the process-wide name index, building it on first use."""
+    return FacultyNameIndex()
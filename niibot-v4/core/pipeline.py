@@ -0,0 +1,288 @@
+"""Async End-to-End Query Pipeline.
+
+The CLI and Streamlit front ends run one request per thread, and that thread
+blocks on every network call (domain routing, query rewriting, the answer).
+This module runs the same pipeline on asyncio so one process can serve many
+concurrent users:
+
+    - LLM calls (routing fallback, pronoun rewriting, answer) use the async
+      Groq client and do not hold a thread while waiting
+    - Chroma searches and embeddings are blocking and run on worker threads
+      (asyncio.to_thread), with per-domain searches still fanned out
+    - Each request carries its own RequestContext, so concurrent requests
+      share only the thread-safe caches
+
+Routing and pronoun rewriting are independent LLM calls, so aprepare_query()
+runs them concurrently, together with a speculative embedding and name
+extraction of the original query (most queries are not rewritten).
+prepare_query() does the same on the fan-out thread pool for sync callers.
+
+process_query() is the synchronous wrapper for callers without an event loop.
+"""
+
+import asyncio
+from typing import AsyncIterator, List, Optional
+
+from chains.rag_chain import detect_correction_query
+from core.chain_factory import get_chain_for_domain
+from config.settings import llm
+from core.fanout import run_fanout
+from core.memory import arewrite_query_with_context, rewrite_query_with_context
+from core.request_context import RequestContext
+from domain_router import aclassify_domain, classify_domain
+
+KNOWLEDGE_BASE_ERROR = "I couldn't access the knowledge base. Please try again."
+
+
+async def _aget_chain(domain: str, use_memory_wrapper: bool):
+    """Get the domain chain on a worker thread (a first build opens Chroma)."""
+    chain, _ = await asyncio.to_thread(get_chain_for_domain, domain, use_memory_wrapper)
+    return chain
+
+
+def _chain_config(session_id: Optional[str]) -> Optional[dict]:
+    """Runnable config selecting the memory session, if any."""
+    return {"configurable": {"session_id": session_id}} if session_id else None
+
+
+def _should_rewrite(query: str, chat_history: List[dict]) -> bool:
+    """Follow-ups are rewritten; corrections keep their wording (see rag_chain)."""
+    return (
+        bool(chat_history)
+        and not detect_correction_query(query, chat_history)["is_correction"]
+    )
+
+
+def _speculate(request_context: RequestContext):
+    """Embed the original query and extract its names ahead of retrieval."""
+    request_context.embed(request_context.query)
+    request_context.names
+
+
+async def aprepare_query(
+    request_context: RequestContext, chat_history: Optional[List[dict]] = None
+) -> str:
+    """
+    Route and rewrite the query concurrently, warming retrieval meanwhile.
+
+    Retrieval can start as soon as this returns: the domain is set on the
+    context and the rewritten query is recorded as its effective query, so
+    the chain does not rewrite again.
+
+    Args:
+        request_context (RequestContext): Context of the current request
+        chat_history (Optional[List[dict]]): Earlier {"query", "response"} exchanges
+
+    Returns:
+        str: Routed domain
+    """
+    query = request_context.query
+    chat_history = chat_history or []
+
+    async def classify():
+        with request_context.timed("classify"):
+            return await aclassify_domain(query)
+
+    async def rewrite():
+        if not _should_rewrite(query, chat_history):
+            return query
+        with request_context.timed("rewrite"):
+            return await arewrite_query_with_context(query, chat_history, llm)
+
+    with request_context.timed("prepare"):
+        domain, rewritten, _ = await asyncio.gather(
+            classify(),
+            rewrite(),
+            asyncio.to_thread(_speculate, request_context),
+        )
+
+        request_context.domain = domain
+        request_context.set_effective_query(rewritten)
+        if request_context.is_rewritten:
+            # Speculation covered the original wording; extract the new names
+            await asyncio.to_thread(lambda: request_context.names)
+
+    print(f"🔀 Routing to: {domain}")
+    return domain
+
+
+def prepare_query(
+    request_context: RequestContext, chat_history: Optional[List[dict]] = None
+) -> str:
+    """
+    Sync version of aprepare_query() running the stages on the fan-out pool.
+
+    Args:
+        request_context (RequestContext): Context of the current request
+        chat_history (Optional[List[dict]]): Earlier {"query", "response"} exchanges
+
+    Returns:
+        str: Routed domain ('nii_info' if classification failed)
+    """
+    query = request_context.query
+    chat_history = chat_history or []
+
+    def classify():
+        with request_context.timed("classify"):
+            return classify_domain(query)
+
+    def rewrite():
+        if not _should_rewrite(query, chat_history):
+            return query
+        with request_context.timed("rewrite"):
+            return rewrite_query_with_context(query, chat_history, llm)
+
+    with request_context.timed("prepare"):
+        results = run_fanout(
+            {
+                "classify": classify,
+                "rewrite": rewrite,
+                "speculate": lambda: _speculate(request_context),
+            },
+            deadline_seconds=None,  # Both LLM calls are needed
+        )
+
+        domain = results.get("classify", "nii_info")
+        request_context.domain = domain
+        request_context.set_effective_query(results.get("rewrite", query))
+        if request_context.is_rewritten:
+            request_context.names
+
+    print(f"🔀 Routing to: {domain}")
+    return domain
+
+
+async def aprocess_query(
+    query: str,
+    chat_history: Optional[List[dict]] = None,
+    session_id: Optional[str] = None,
+) -> dict:
+    """
+    Answer one user query asynchronously.
+
+    Args:
+        query (str): User's question
+        chat_history (Optional[List[dict]]): Earlier {"query", "response"} exchanges
+        session_id (Optional[str]): Memory session; enables the chat-history wrapper
+
+    Returns:
+        dict: {"response", "domain", "docs", "request_context"}
+    """
+    request_context = RequestContext(query)
+    domain = await aprepare_query(request_context, chat_history)
+
+    chain = await _aget_chain(domain, use_memory_wrapper=session_id is not None)
+    if chain is None:
+        response = KNOWLEDGE_BASE_ERROR
+    else:
+        with request_context.timed("chain"):
+            response = await chain.ainvoke(
+                {
+                    "question": query,
+                    "chat_history": chat_history or [],
+                    "request_context": request_context,
+                },
+                config=_chain_config(session_id),
+            )
+
+    print(f"⏱️ {request_context.timing_summary()}")
+    return {
+        "response": response,
+        "domain": domain,
+        "docs": request_context.retrieved_docs or [],
+        "request_context": request_context,
+    }
+
+
+async def astream_query(
+    query: str,
+    chat_history: Optional[List[dict]] = None,
+    session_id: Optional[str] = None,
+) -> AsyncIterator[dict]:
+    """
+    Answer one user query asynchronously, yielding events as they happen.
+
+    Events are the same as chains.rag_chain.stream_chain_events(), preceded
+    by {"type": "domain", "domain"} once the query has been routed.
+
+    Args:
+        query (str): User's question
+        chat_history (Optional[List[dict]]): Earlier {"query", "response"} exchanges
+        session_id (Optional[str]): Memory session; enables the chat-history wrapper
+
+    Returns:
+        AsyncIterator[dict]: Events in pipeline order
+    """
+    request_context = RequestContext(query)
+    domain = await aprepare_query(request_context, chat_history)
+    yield {"type": "domain", "domain": domain}
+
+    chain = await _aget_chain(domain, use_memory_wrapper=session_id is not None)
+    if chain is None:
+        yield {"type": "token", "text": KNOWLEDGE_BASE_ERROR}
+        yield {"type": "done", "response": KNOWLEDGE_BASE_ERROR}
+        return
+
+    # Retrieval runs on a worker thread; hand its events back to the loop
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    request_context.on_event = lambda event: loop.call_soon_threadsafe(
+        events.put_nowait, event
+    )
+
+    async def produce():
+        try:
+            async for chunk in chain.astream(
+                {
+                    "question": query,
+                    "chat_history": chat_history or [],
+                    "request_context": request_context,
+                },
+                config=_chain_config(session_id),
+            ):
+                if chunk:
+                    events.put_nowait({"type": "token", "text": chunk})
+        except Exception as e:
+            events.put_nowait({"type": "error", "error": e})
+        finally:
+            # Queued after any retrieval event still in flight from the worker
+            loop.call_soon(events.put_nowait, None)
+
+    parts = []
+    with request_context.timed("chain"):
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                if event["type"] == "error":
+                    raise event["error"]
+                if event["type"] == "token":
+                    parts.append(event["text"])
+                yield event
+        finally:
+            producer.cancel()
+            request_context.on_event = None
+
+    print(f"⏱️ {request_context.timing_summary()}")
+    yield {"type": "done", "response": "".join(parts)}
+
+
+def process_query(
+    query: str,
+    chat_history: Optional[List[dict]] = None,
+    session_id: Optional[str] = None,
+) -> dict:
+    """
+    Synchronous wrapper around aprocess_query() for callers without a loop.
+
+    Args:
+        query (str): User's question
+        chat_history (Optional[List[dict]]): Earlier {"query", "response"} exchanges
+        session_id (Optional[str]): Memory session; enables the chat-history wrapper
+
+    Returns:
+        dict: {"response", "domain", "docs", "request_context"}
+    """
+    return asyncio.run(aprocess_query(query, chat_history, session_id))
@@ -0,0 +1,172 @@
+"""Per-request Context Shared Across the Query Pipeline.
+
+One user question passes through routing, query rewriting, name extraction,
+several retrieval strategies and context formatting. Each stage used to
+lowercase the query, re-run the keyword scans and re-extract faculty names.
+A RequestContext is created once at the entry point and carries those
+results (and per-stage timings) through every stage.
+
+Key Features:
+    - Original and rewritten ("effective") query with lowercase forms
+    - Lazily computed, memoized faculty names and keyword pattern matches
+    - Per-request embedding memo on top of the shared embedding cache
+    - Stage timings for tracing and performance logging
+    - Pipeline events (e.g. "retrieval") delivered to an optional listener
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from config.settings import embedding_model
+from core.faculty_extractor import get_shared_faculty_extractor
+from utils.pattern_matcher import PatternMatches, match_patterns
+
+
+class RequestContext:
+    """State computed once per user request and shared by all stages."""
+
+    def __init__(self, query: str, domain: Optional[str] = None):
+        """Create a context for a new user query.
+
+        Args:
+            query (str): Query exactly as the user typed it
+            domain (Optional[str]): Routed domain, if already known
+        """
+        self.query = query
+        self.query_lower = query.lower()
+        self.domain = domain
+        self.effective_query = query
+        self.effective_query_lower = self.query_lower
+        self.rewrite_done = False  # True once pronoun rewriting has run
+
+        self.timings: Dict[str, float] = {}
+        self.retrieved_docs: Optional[list] = None
+        self.on_event: Optional[Callable[[dict], None]] = None
+        self._names: Optional[List[str]] = None
+        self._embeddings: Dict[str, List[float]] = {}
+
+    # ===== Query forms =====
+
+    def set_effective_query(self, query: str):
+        """Record the rewritten query used for extraction and retrieval.
+
+        Args:
+            query (str): Self-contained query after pronoun resolution
+        """
+        self.rewrite_done = True
+        if query == self.effective_query:
+            return
+        self.effective_query = query
+        self.effective_query_lower = query.lower()
+        self._names = None  # Names depend on the rewritten query
+
+    @property
+    def is_rewritten(self) -> bool:
+        """True if the effective query differs from the user's query."""
+        return self.effective_query != self.query
+
+    # ===== Memoized analysis =====
+
+    @property
+    def matches(self) -> PatternMatches:
+        """Keyword pattern matches of the original query."""
+        return match_patterns(self.query_lower)
+
+    @property
+    def effective_matches(self) -> PatternMatches:
+        """Keyword pattern matches of the effective (rewritten) query."""
+        return match_patterns(self.effective_query_lower)
+
+    @property
+    def names(self) -> List[str]:
+        """Faculty names extracted from the effective query (computed once)."""
+        if self._names is None:
+            with self.timed("name_extraction"):
+                extractor = get_shared_faculty_extractor()
+                self._names = extractor.extract_names(self.effective_query)
+        return list(self._names)
+
+    def embed(self, text: str) -> List[float]:
+        """Embed a search text once per request.
+
+        Args:
+            text (str): Query or enhanced query ("Dr. X " + query)
+
+        Returns:
+            List[float]: Query embedding
+        """
+        vector = self._embeddings.get(text)
+        if vector is None:
+            with self.timed("embedding"):
+                vector = embedding_model.embed_query(text)
+            self._embeddings[text] = vector
+        return vector
+
+    @property
+    def embedding(self) -> List[float]:
+        """Embedding of the effective query."""
+        return self.embed(self.effective_query)
+
+    # ===== Events =====
+
+    def emit(self, event_type: str, **data):
+        """Send a pipeline event to the listener, if one is attached.
+
+        Args:
+            event_type (str): Event name, e.g. "retrieval"
+            **data: Event payload
+        """
+        if self.on_event is not None:
+            self.on_event({"type": event_type, **data})
+
+    # ===== Timings =====
+
+    @contextmanager
+    def timed(self, stage: str):
+        """Add the wall-clock time of a block to a stage (repeats accumulate).
+
+        Example:
+            >>> with context.timed("retrieval"):
+            ...     docs = retriever.retrieve_with_faculty_awareness(query)
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start_time
+            self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+
+    def timing_summary(self) -> str:
+        """Format stage timings for logging, e.g. "classify 12ms | retrieval 85ms"."""
+        return " | ".join(
+            f"{stage} {seconds * 1000:.0f}ms" for stage, seconds in self.timings.items()
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"RequestContext(query={self.query!r}, domain={self.domain!r}, "
+            f"effective_query={self.effective_query!r})"
+        )
+
+
+def get_request_context(
+    inputs: dict, query: Optional[str] = None, domain: Optional[str] = None
+) -> RequestContext:
+    """Return the context attached to chain inputs, creating one if missing.
+
+    Args:
+        inputs (dict): Chain inputs, may carry "request_context"
+        query (Optional[str]): Query to use when creating a context
+        domain (Optional[str]): Domain to record on the context
+
+    Returns:
+        RequestContext: Context stored back into inputs["request_context"]
+    """
+    context = inputs.get("request_context")
+    if context is None:
+        context = RequestContext(query or inputs["question"], domain=domain)
+        inputs["request_context"] = context
+    elif domain and context.domain is None:
+        context.domain = domain
+    return context
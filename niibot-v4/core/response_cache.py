@@ -0,0 +1,398 @@
+"""Semantic Response Cache in Front of the Domain RAG Chains.
+
+Most traffic is a few hundred repeated faculty questions that differ only in
+wording ("monica email", "Monica's email?"). This module stores final answers
+keyed on the query embedding and domain, so a near-identical question is
+answered without retrieval or an LLM call.
+
+Key Features:
+    - Cosine-similarity matching against earlier questions in the same domain
+    - Near matches must name the same faculty and hit the same keyword patterns
+    - Bounded LRU eviction with a per-entry time-to-live
+    - Automatic invalidation when the indexer rewrites a collection
+    - Context-dependent follow-ups ("her publications") always bypass the cache
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.runnables import Runnable, RunnableLambda
+
+from config.settings import (
+    embedding_model,
+    RESPONSE_CACHE_SIZE,
+    RESPONSE_CACHE_TTL_SECONDS,
+    RESPONSE_CACHE_SIMILARITY_THRESHOLD,
+)
+from core.embedding_cache import normalize_embedding_text
+from core.faculty_extractor import get_shared_faculty_extractor
+from core.memory import needs_context_rewrite
+from core.vectorstore_registry import get_collection_version
+from utils.pattern_matcher import match_patterns
+
+ResponseCacheInfo = namedtuple(
+    "ResponseCacheInfo",
+    ["hits", "misses", "bypassed", "evictions", "invalidations", "maxsize", "currsize"],
+)
+
+CachedResponse = namedtuple(
+    "CachedResponse", ["query", "response", "docs", "similarity"]
+)
+
+# (sorted faculty names, ((pattern group, matched patterns), ...))
+QuerySignature = Tuple[Tuple[str, ...], Tuple[Tuple[str, Tuple[str, ...]], ...]]
+
+
+def query_signature(query: str, request_context=None) -> QuerySignature:
+    """Summarise what a query asks about: who, and which keywords it hits.
+
+    Embeddings of "dr smith email" and "dr smyth email" or "monica email" and
+    "monica phone" are nearly identical, so a similarity hit is only accepted
+    when both queries share this signature.
+
+    Args:
+        query (str): User query
+        request_context: Optional RequestContext of the query, whose memoized
+            names are reused when it has not been rewritten
+
+    Returns:
+        QuerySignature: Sorted lowercase names and matched pattern groups
+    """
+    if request_context is not None and request_context.effective_query == query:
+        names = request_context.names
+    else:
+        names = get_shared_faculty_extractor().extract_names(query)
+
+    matches = match_patterns(query.lower())
+    return (
+        tuple(sorted({name.lower() for name in names})),
+        tuple((group, matches.get(group)) for group in sorted(matches.groups)),
+    )
+
+
+class SemanticResponseCache:
+    """Thread-safe response cache matched on query embedding similarity."""
+
+    def __init__(
+        self,
+        embedder=None,
+        similarity_threshold: float = RESPONSE_CACHE_SIMILARITY_THRESHOLD,
+        maxsize: int = RESPONSE_CACHE_SIZE,
+        ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+        signature_fn: Callable[[str], QuerySignature] = query_signature,
+    ):
+        """Create an empty cache.
+
+        Args:
+            embedder: Embedding model used to vectorise queries
+            similarity_threshold (float): Minimum cosine similarity for a hit
+            maxsize (int): Maximum number of cached responses (all domains)
+            ttl_seconds (float): Seconds before an entry expires (0 disables TTL)
+            signature_fn (Callable): Computes a query's signature when the
+                caller does not pass one
+        """
+        self.embedder = embedder or embedding_model
+        self.signature_fn = signature_fn
+        self.similarity_threshold = similarity_threshold
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+
+        # (domain, normalized query) → (unit vector, response, docs, stored_at,
+        # signature)
+        self._entries: "OrderedDict[Tuple[str, str], tuple]" = OrderedDict()
+        # domain → (keys, matrix) rebuilt lazily after the domain changes
+        self._matrices: Dict[str, Tuple[List[Tuple[str, str]], np.ndarray]] = {}
+        # domain → collection version the cached answers were produced from
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _embed(self, query: str) -> np.ndarray:
+        """Embed a query and scale it to unit length for cosine similarity."""
+        vector = np.asarray(self.embedder.embed_query(query), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _check_version(self, domain: str):
+        """Drop a domain's answers if its collection changed (lock held)."""
+        version = get_collection_version(domain)
+        if self._versions.get(domain, version) != version:
+            print(f"♻️ Collection '{domain}' changed, clearing cached responses")
+            self._drop_domain(domain)
+            self.invalidations += 1
+        self._versions[domain] = version
+
+    def _drop_domain(self, domain: str):
+        """Remove every entry of a domain (lock held)."""
+        for key in [key for key in self._entries if key[0] == domain]:
+            del self._entries[key]
+        self._matrices.pop(domain, None)
+
+    def _domain_matrix(self, domain: str):
+        """Return (keys, stacked unit vectors) for a domain (lock held)."""
+        cached = self._matrices.get(domain)
+        if cached is None:
+            keys = [key for key in self._entries if key[0] == domain]
+            matrix = (
+                np.stack([self._entries[key][0] for key in keys])
+                if keys
+                else np.empty((0, 0), dtype=np.float32)
+            )
+            cached = (keys, matrix)
+            self._matrices[domain] = cached
+        return cached
+
+    def _expired(self, entry: tuple) -> bool:
+        """Check an entry against the TTL."""
+        return bool(self.ttl_seconds) and (
+            time.monotonic() - entry[3] > self.ttl_seconds
+        )
+
+    def lookup(
+        self,
+        domain: str,
+        query: str,
+        signature: Optional[QuerySignature] = None,
+    ) -> Optional[CachedResponse]:
+        """Find a cached answer for a query in the same domain.
+
+        Args:
+            domain (str): Domain the query was routed to
+            query (str): User query
+            signature (Optional[QuerySignature]): Precomputed query signature
+
+        Returns:
+            Optional[CachedResponse]: Best match above the similarity threshold
+                whose names and keyword patterns equal the query's
+        """
+        key = (domain, normalize_embedding_text(query))
+
+        # Fast path: exact repeat of a normalized question needs no embedding
+        with self._lock:
+            self._check_version(domain)
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry):
+                del self._entries[key]
+                self._matrices.pop(domain, None)
+            elif entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return CachedResponse(key[1], entry[1], entry[2], 1.0)
+
+        if signature is None:
+            signature = self.signature_fn(query)
+        vector = self._embed(query)
+
+        with self._lock:
+            keys, matrix = self._domain_matrix(domain)
+            if not keys:
+                self.misses += 1
+                return None
+
+            similarities = matrix @ vector
+            for index in np.argsort(-similarities):
+                similarity = float(similarities[index])
+                if similarity < self.similarity_threshold:
+                    break
+                match_key = keys[index]
+                entry = self._entries.get(match_key)
+                if entry is None or self._expired(entry):
+                    continue
+                if entry[4] != signature:
+                    continue  # Similar wording, different person or field
+                self._entries.move_to_end(match_key)
+                self.hits += 1
+                print(
+                    f"⚡ Response cache hit ({similarity:.3f}): "
+                    f"'{query}' ≈ '{match_key[1]}'"
+                )
+                return CachedResponse(match_key[1], entry[1], entry[2], similarity)
+
+            self.misses += 1
+            return None
+
+    def store(
+        self,
+        domain: str,
+        query: str,
+        response: str,
+        docs: Optional[List[Document]] = None,
+        signature: Optional[QuerySignature] = None,
+    ):
+        """Cache the final answer for a query.
+
+        Args:
+            domain (str): Domain the query was routed to
+            query (str): User query
+            response (str): Final chain response
+            docs (Optional[List[Document]]): Retrieved documents for attribution
+            signature (Optional[QuerySignature]): Precomputed query signature
+        """
+        key = (domain, normalize_embedding_text(query))
+        if signature is None:
+            signature = self.signature_fn(query)
+        vector = self._embed(query)
+
+        with self._lock:
+            self._check_version(domain)
+            self._entries[key] = (
+                vector,
+                response,
+                docs or [],
+                time.monotonic(),
+                signature,
+            )
+            self._entries.move_to_end(key)
+            self._matrices.pop(domain, None)
+
+            while len(self._entries) > self.maxsize:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._matrices.pop(evicted_key[0], None)
+                self.evictions += 1
+
+    def record_bypass(self):
+        """Count a query that skipped the cache because it needs chat context."""
+        with self._lock:
+            self.bypassed += 1
+
+    def invalidate(self, domain: Optional[str] = None):
+        """Drop cached answers.
+
+        Args:
+            domain (Optional[str]): Domain to clear, or None to clear everything
+        """
+        with self._lock:
+            if domain is None:
+                self._entries.clear()
+                self._matrices.clear()
+                self._versions.clear()
+            else:
+                self._drop_domain(domain)
+                self._versions.pop(domain, None)
+            self.invalidations += 1
+
+    def cache_info(self) -> ResponseCacheInfo:
+        """Return cache statistics in the style of functools.lru_cache."""
+        with self._lock:
+            return ResponseCacheInfo(
+                self.hits,
+                self.misses,
+                self.bypassed,
+                self.evictions,
+                self.invalidations,
+                self.maxsize,
+                len(self._entries),
+            )
+
+
+# ==== Process-wide Cache ====
+_response_cache = SemanticResponseCache()
+
+
+def get_response_cache() -> SemanticResponseCache:
+    """Return the process-wide response cache."""
+    return _response_cache
+
+
+def with_response_cache(chain: Runnable, domain: str) -> Runnable:
+    """Wrap a domain chain so near-identical questions are served from cache.
+
+    Follow-up questions that depend on chat history (pronouns, corrections)
+    bypass the cache in both directions. Answers are only stored when
+    retrieval produced documents, so error fallbacks are never cached.
+
+    Args:
+        chain (Runnable): Chain taking {"question", "chat_history"} inputs
+        domain (str): Domain the chain serves
+
+    Returns:
+        Runnable: Chain with the same inputs and outputs
+    """
+    # Imported lazily: rag_chain imports this module
+    from chains.rag_chain import detect_correction_query
+
+    def is_context_dependent(inputs: dict) -> bool:
+        query = inputs["question"]
+        chat_history = inputs.get("chat_history", [])
+        return needs_context_rewrite(query, chat_history) or bool(
+            chat_history
+            and detect_correction_query(query, chat_history)["is_correction"]
+        )
+
+    def serve_cached(inputs: dict, cached: CachedResponse) -> str:
+        inputs["retrieved_docs"] = cached.docs
+        request_context = inputs.get("request_context")
+        if request_context is not None:
+            request_context.retrieved_docs = cached.docs
+            request_context.emit(
+                "retrieval", domain=domain, docs=cached.docs, cached=True, seconds=0.0
+            )
+        return cached.response
+
+    def cached_chain(inputs: dict, config=None):
+        # A generator, so streaming passes through token by token
+        if is_context_dependent(inputs):
+            _response_cache.record_bypass()
+            yield from chain.stream(inputs, config)
+            return
+
+        query = inputs["question"]
+        signature = query_signature(query, inputs.get("request_context"))
+        cached = _response_cache.lookup(domain, query, signature)
+        if cached is not None:
+            yield serve_cached(inputs, cached)
+            return
+
+        parts = []
+        for chunk in chain.stream(inputs, config):
+            parts.append(chunk)
+            yield chunk
+        if inputs.get("retrieved_docs"):
+            _response_cache.store(
+                domain, query, "".join(parts), inputs["retrieved_docs"], signature
+            )
+
+    async def acached_chain(inputs: dict, config=None):
+        if is_context_dependent(inputs):
+            _response_cache.record_bypass()
+            async for chunk in chain.astream(inputs, config):
+                yield chunk
+            return
+
+        # Signature and lookup extract names and embed, which is CPU-bound
+        query = inputs["question"]
+        signature = await asyncio.to_thread(
+            query_signature, query, inputs.get("request_context")
+        )
+        cached = await asyncio.to_thread(
+            _response_cache.lookup, domain, query, signature
+        )
+        if cached is not None:
+            yield serve_cached(inputs, cached)
+            return
+
+        parts = []
+        async for chunk in chain.astream(inputs, config):
+            parts.append(chunk)
+            yield chunk
+        if inputs.get("retrieved_docs"):
+            await asyncio.to_thread(
+                _response_cache.store,
+                domain,
+                query,
+                "".join(parts),
+                inputs["retrieved_docs"],
+                signature,
+            )
+
+    return RunnableLambda(cached_chain, afunc=acached_chain)
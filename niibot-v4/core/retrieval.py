@@ -6,20 +6,25 @@ information retrieval, handling everything from exact names to casual first-name
 Key Features:
     - Intelligent faculty name extraction and matching
     - Progressive search strategies with automatic fallback
+    - Optional speculative (parallel) tier execution configured per domain
     - Cross-domain search for comprehensive information coverage
     - Robust error handling with performance logging
     - Smart partial name matching to prevent cross-faculty contamination
 """
 
-import os
-from typing import List
+from functools import partial
+from typing import Callable, Dict, List, Optional, Sequence
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
 
-from core.faculty_extractor import create_faculty_extractor_with_cache
+from config.settings import SPECULATIVE_RETRIEVAL_DOMAINS
+from core.faculty_extractor import get_shared_faculty_extractor
+from core.request_context import RequestContext
+from core.fanout import run_fanout
 from utils.document_utils import _deduplicate_documents
-from utils.search_utils import get_comprehensive_director_info
-from config.settings import VECTOR_DB_DIR, embedding_model
+from utils.pattern_matcher import match_patterns
+from utils.search_utils import get_comprehensive_director_info, vector_search
+from core.vectorstore_registry import get_vectorstore
 
 
 class EnhancedFacultyRetriever:
@@ -33,18 +38,41 @@ class EnhancedFacultyRetriever:
         5. Semantic fallback
     """
 
-    def __init__(self, vectorstore: Chroma, domain: str):
+    # Cascade order: (tier name, success log label, requires extracted names)
+    CASCADE_TIERS = (
+        ("exact", "EXACT SUCCESS", True),
+        ("first_name", "FIRST NAME SUCCESS", False),
+        ("partial", "PARTIAL SUCCESS", True),
+        ("cross_domain", "CROSS-DOMAIN SUCCESS", True),
+    )
+
+    def __init__(
+        self,
+        vectorstore: Chroma,
+        domain: str,
+        speculative_tiers: Optional[Sequence[str]] = None,
+    ):
         """Initialize retriever with domain-specific configuration.
 
         Args:
             vectorstore (Chroma): Vector database instance for document storage
             domain (str): Domain context for search operations
+            speculative_tiers (Optional[Sequence[str]]): Tiers to run in parallel
+                before the cascade. Defaults to SPECULATIVE_RETRIEVAL_DOMAINS
+                for the domain; an empty sequence disables speculation.
         """
         self.vectorstore = vectorstore
         self.domain = domain
-        self.name_extractor = create_faculty_extractor_with_cache()
-
-    def retrieve_with_faculty_awareness(self, query: str, k: int = 4) -> List[Document]:
+        self.name_extractor = get_shared_faculty_extractor()
+        self.context: Optional[RequestContext] = None
+        if speculative_tiers is None:
+            speculative_tiers = SPECULATIVE_RETRIEVAL_DOMAINS.get(domain, ())
+        self.speculative_tiers = tuple(speculative_tiers)
+        self.last_winning_tier: Optional[str] = None
+
+    def retrieve_with_faculty_awareness(
+        self, query: str, k: int = 4, context: Optional[RequestContext] = None
+    ) -> List[Document]:
         """Execute comprehensive faculty-aware document retrieval.
 
         Orchestrates 5-tier search strategy to handle all query patterns:
@@ -56,53 +84,121 @@ class EnhancedFacultyRetriever:
         Args:
             query (str): Natural language query from user
             k (int, optional): Maximum documents to retrieve. Defaults to 4.
+            context (Optional[RequestContext]): Request context carrying the
+                extracted names and embeddings; created if missing
+
+        When speculative tiers are configured for the domain they run in
+        parallel first; the cascade then picks the highest-priority tier that
+        succeeded, so results match the sequential order. The winning tier is
+        stored in ``self.last_winning_tier``.
 
         Returns:
             List[Document]: Ranked list of relevant documents with metadata
         """
-        extracted_names = self.name_extractor.extract_names(query)
-        query_lower = query.lower()
+        if context is None or context.effective_query != query:
+            context = RequestContext(query, domain=self.domain)
+        self.context = context
+
+        extracted_names = context.names
+        query_lower = context.effective_query_lower
 
         print(f"Query: '{query}' | Domain: {self.domain}")
         print(f"Extracted names: {extracted_names}")
 
-        all_documents = []
+        tier_tasks = self._build_tier_tasks(extracted_names, query, query_lower, k)
 
-        # Strategy 1: Exact metadata filtering
-        if extracted_names:
-            all_documents = self._execute_exact_metadata_search(
-                extracted_names, query, k
+        # Speculative mode: launch the configured tiers at once, then walk the
+        # cascade in order so the highest-priority successful tier still wins
+        speculative_results = {}
+        if self.speculative_tiers:
+            speculative_results = self._run_speculative_tiers(
+                tier_tasks, extracted_names
             )
-            if all_documents:
-                print(f"EXACT SUCCESS: {len(all_documents)} documents")
-                return self._finalize_results(all_documents, k)
 
-        # Strategy 2: First name direct lookup
-        if not all_documents:
-            all_documents = self._execute_first_name_search(query, query_lower, k)
-            if all_documents:
-                print(f"FIRST NAME SUCCESS: {len(all_documents)} documents")
-                return self._finalize_results(all_documents, k)
+        # Strategies 1-4: exact, first name, partial, cross-domain
+        for tier_name, success_label, needs_names in self.CASCADE_TIERS:
+            if needs_names and not extracted_names:
+                continue
 
-        # Strategy 3: Smart partial name matching
-        if not all_documents and extracted_names:
-            all_documents = self._execute_partial_name_search(extracted_names, query, k)
-            if all_documents:
-                print(f"PARTIAL SUCCESS: {len(all_documents)} documents")
-                return self._finalize_results(all_documents, k)
+            if tier_name in speculative_results:
+                all_documents = speculative_results[tier_name]
+            else:
+                all_documents = tier_tasks[tier_name]()
 
-        # Strategy 4: Cross-domain search
-        if not all_documents and extracted_names:
-            all_documents = self._execute_cross_domain_search(extracted_names, query, k)
             if all_documents:
-                print(f"CROSS-DOMAIN SUCCESS: {len(all_documents)} documents")
+                print(f"{success_label}: {len(all_documents)} documents")
+                self.last_winning_tier = tier_name
                 return self._finalize_results(all_documents, k)
 
         # Strategy 5: Semantic fallback
-        all_documents = self._execute_semantic_fallback(query, extracted_names, k)
+        if "semantic" in speculative_results:
+            all_documents = speculative_results["semantic"]
+        else:
+            all_documents = tier_tasks["semantic"]()
         print(f"SEMANTIC FALLBACK: {len(all_documents)} documents")
+        self.last_winning_tier = "semantic"
         return self._finalize_results(all_documents, k)
 
+    def _build_tier_tasks(
+        self, extracted_names: List[str], query: str, query_lower: str, k: int
+    ) -> Dict[str, Callable[[], List[Document]]]:
+        """Bind every cascade tier to the current query.
+
+        Args:
+            extracted_names (List[str]): Faculty names extracted from query
+            query (str): Original user query
+            query_lower (str): Lowercase version of query for matching
+            k (int): Number of documents to retrieve
+
+        Returns:
+            Dict[str, Callable]: Tier name → zero-argument search callable
+        """
+        return {
+            "exact": partial(
+                self._execute_exact_metadata_search, extracted_names, query, k
+            ),
+            "first_name": partial(
+                self._execute_first_name_search, query, query_lower, k
+            ),
+            "partial": partial(
+                self._execute_partial_name_search, extracted_names, query, k
+            ),
+            "cross_domain": partial(
+                self._execute_cross_domain_search, extracted_names, query, k
+            ),
+            "semantic": partial(
+                self._execute_semantic_fallback, query, extracted_names, k
+            ),
+        }
+
+    def _run_speculative_tiers(
+        self, tier_tasks: Dict[str, Callable], extracted_names: List[str]
+    ) -> Dict[str, List[Document]]:
+        """Run the configured tiers concurrently ahead of the cascade.
+
+        Tiers that need extracted names are skipped when there are none, exactly
+        as in the sequential cascade. Tiers that fail or miss the deadline are
+        simply absent from the result and get re-run in order by the cascade.
+
+        Args:
+            tier_tasks (Dict[str, Callable]): Bound tier callables
+            extracted_names (List[str]): Faculty names extracted from query
+
+        Returns:
+            Dict[str, List[Document]]: Tier name → documents for finished tiers
+        """
+        needs_names = {name for name, _, needed in self.CASCADE_TIERS if needed}
+        tasks = {
+            name: tier_tasks[name]
+            for name in self.speculative_tiers
+            if name in tier_tasks and (extracted_names or name not in needs_names)
+        }
+        if not tasks:
+            return {}
+
+        print(f"SPECULATIVE: running tiers {list(tasks)} in parallel")
+        return run_fanout(tasks)
+
     def _execute_exact_metadata_search(
         self, extracted_names: List[str], query: str, k: int
     ) -> List[Document]:
@@ -127,8 +223,12 @@ class EnhancedFacultyRetriever:
                 print(f"Searching: {faculty_name}")
 
                 # Apply strict metadata filtering
-                filtered_docs = self.vectorstore.similarity_search(
-                    query, k=k * 2, filter={"faculty_name": faculty_name}
+                filtered_docs = vector_search(
+                    self.vectorstore,
+                    query,
+                    k=k * 2,
+                    filter={"faculty_name": faculty_name},
+                    context=self.context,
                 )
 
                 if filtered_docs:
@@ -187,8 +287,12 @@ class EnhancedFacultyRetriever:
             for faculty_name in matched_faculty:
                 try:
                     # Try exact metadata filtering first
-                    first_name_docs = self.vectorstore.similarity_search(
-                        query, k=k * 2, filter={"faculty_name": faculty_name}
+                    first_name_docs = vector_search(
+                        self.vectorstore,
+                        query,
+                        k=k * 2,
+                        filter={"faculty_name": faculty_name},
+                        context=self.context,
                     )
 
                     if first_name_docs:
@@ -202,8 +306,8 @@ class EnhancedFacultyRetriever:
 
                     # Fallback: Enhanced semantic search
                     enhanced_query = f"{faculty_name} {query}"
-                    semantic_docs = self.vectorstore.similarity_search(
-                        enhanced_query, k=k
+                    semantic_docs = vector_search(
+                        self.vectorstore, enhanced_query, k=k, context=self.context
                     )
 
                     for doc in semantic_docs:
@@ -248,8 +352,11 @@ class EnhancedFacultyRetriever:
                 for component in name_components:
                     if len(component) > 2:
                         enhanced_query = f"{component} {query}"
-                        partial_docs = self.vectorstore.similarity_search(
-                            enhanced_query, k=k * 3
+                        partial_docs = vector_search(
+                            self.vectorstore,
+                            enhanced_query,
+                            k=k * 3,
+                            context=self.context,
                         )
 
                         # Apply strict post-filtering to ensure correct faculty
@@ -451,7 +558,7 @@ class EnhancedFacultyRetriever:
         print(f"EXECUTING: Cross-domain search from {self.domain}")
 
         target_domains = self._determine_cross_domain_strategy(
-            query.lower(), self.domain
+            self.context.effective_query_lower, self.domain
         )
 
         if not target_domains:
@@ -508,7 +615,9 @@ class EnhancedFacultyRetriever:
             else:
                 enhanced_query = query
 
-            semantic_docs = self.vectorstore.similarity_search(enhanced_query, k=k * 2)
+            semantic_docs = vector_search(
+                self.vectorstore, enhanced_query, k=k * 2, context=self.context
+            )
 
             # Filter by faculty if names were extracted
             if extracted_names:
@@ -547,13 +656,10 @@ class EnhancedFacultyRetriever:
             List[str]: Ordered list of target domains to search
         """
         # Analyze query intent
-        contact_keywords = ["email", "phone", "contact", "extension", "call", "reach"]
-        research_keywords = ["research", "interests", "working on", "projects", "focus"]
-        publication_keywords = ["publications", "papers", "articles", "published"]
-
-        is_contact_query = any(word in query_lower for word in contact_keywords)
-        is_research_query = any(word in query_lower for word in research_keywords)
-        is_publication_query = any(word in query_lower for word in publication_keywords)
+        matches = match_patterns(query_lower)
+        is_contact_query = matches.has("contact")
+        is_research_query = matches.has("research")
+        is_publication_query = matches.has("publication")
 
         # Determine target domains based on intent
         if is_contact_query:
@@ -576,8 +682,8 @@ class EnhancedFacultyRetriever:
     ) -> List[Document]:
         """Execute search within specific target domain.
 
-        Handles vectorstore initialization, search execution, and result
-        verification for cross-domain searches.
+        Uses the shared vectorstore from the registry, executes the search
+        and verifies results for cross-domain searches.
 
         Args:
             extracted_names (List[str]): Faculty names from query
@@ -588,24 +694,21 @@ class EnhancedFacultyRetriever:
         Returns:
             List[Document]: Documents found in target domain
         """
-        collection_path = os.path.join(VECTOR_DB_DIR, target_domain)
-        if not os.path.exists(collection_path):
-            print(f"Path not found: {collection_path}")
+        target_vectorstore = get_vectorstore(target_domain)
+        if target_vectorstore is None:
             return []
 
-        target_vectorstore = Chroma(
-            collection_name=target_domain,
-            embedding_function=embedding_model,
-            persist_directory=collection_path,
-        )
-
         cross_domain_docs = []
 
         for faculty_name in extracted_names:
             try:
                 # Try exact metadata filtering
-                exact_docs = target_vectorstore.similarity_search(
-                    query, k=k, filter={"faculty_name": faculty_name}
+                exact_docs = vector_search(
+                    target_vectorstore,
+                    query,
+                    k=k,
+                    filter={"faculty_name": faculty_name},
+                    context=self.context,
                 )
 
                 if exact_docs:
@@ -619,8 +722,11 @@ class EnhancedFacultyRetriever:
 
                 # Fallback to semantic search
                 enhanced_query = f"{faculty_name} {query}"
-                semantic_docs = target_vectorstore.similarity_search(
-                    enhanced_query, k=k // 2
+                semantic_docs = vector_search(
+                    target_vectorstore,
+                    enhanced_query,
+                    k=k // 2,
+                    context=self.context,
                 )
 
                 verified_semantic = []
@@ -0,0 +1,315 @@
+"""Bounded Session History Store with Optional SQLite Persistence.
+
+core/memory.py used to keep one ChatMessageHistory per session id in a plain
+dict: abandoned sessions were never removed and everything was lost on
+restart. SessionStore replaces that dict.
+
+Key Features:
+    - Maximum number of live sessions (least recently used are evicted)
+    - Idle time-to-live: sessions untouched for too long are dropped
+    - Per-session message window (only the latest N messages are kept)
+    - Optional SQLite backend so histories survive restarts; evicting a
+      live session then only drops its in-memory handle
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage, messages_from_dict, messages_to_dict
+
+from config.settings import (
+    SESSION_MAX_SESSIONS,
+    SESSION_IDLE_TTL_SECONDS,
+    SESSION_MAX_MESSAGES,
+    SESSION_DB_PATH,
+)
+
+SessionStoreInfo = namedtuple(
+    "SessionStoreInfo",
+    ["backend", "evictions", "expired", "maxsize", "currsize"],
+)
+
+_DB_SWEEP_INTERVAL_SECONDS = 60  # How often expired rows are purged from SQLite
+
+
+class WindowedChatMessageHistory(BaseChatMessageHistory):
+    """In-memory chat history keeping only the latest messages."""
+
+    def __init__(self, max_messages: int = SESSION_MAX_MESSAGES):
+        """Create an empty history.
+
+        Args:
+            max_messages (int): Messages kept per session (0 keeps all)
+        """
+        self.max_messages = max_messages
+        self._messages: List[BaseMessage] = []
+
+    @property
+    def messages(self) -> List[BaseMessage]:
+        """Messages in the window, oldest first."""
+        return list(self._messages)
+
+    def add_messages(self, messages: Sequence[BaseMessage]):
+        """Append messages and drop the oldest ones beyond the window."""
+        self._messages.extend(messages)
+        if self.max_messages and len(self._messages) > self.max_messages:
+            del self._messages[: -self.max_messages]
+
+    def clear(self):
+        """Remove all messages."""
+        self._messages = []
+
+
+class _SQLiteSessionBackend:
+    """Shared SQLite database holding the messages of every session."""
+
+    def __init__(self, db_path: str):
+        """Open (or create) the session database.
+
+        Args:
+            db_path (str): Path of the SQLite file
+        """
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "session_id TEXT NOT NULL, message TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_messages_session "
+                "ON messages (session_id, id)"
+            )
+
+    def load(self, session_id: str, max_messages: int) -> List[BaseMessage]:
+        """Return the latest messages of a session, oldest first."""
+        query = "SELECT message FROM messages WHERE session_id = ? ORDER BY id DESC"
+        params: tuple = (session_id,)
+        if max_messages:
+            query += " LIMIT ?"
+            params += (max_messages,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return messages_from_dict([json.loads(row[0]) for row in reversed(rows)])
+
+    def append(
+        self, session_id: str, messages: Sequence[BaseMessage], max_messages: int
+    ):
+        """Store new messages and trim the session to its window."""
+        rows = [
+            (session_id, json.dumps(message))
+            for message in messages_to_dict(list(messages))
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO messages (session_id, message) VALUES (?, ?)", rows
+            )
+            if max_messages:
+                self._conn.execute(
+                    "DELETE FROM messages WHERE session_id = ? AND id NOT IN ("
+                    "SELECT id FROM messages WHERE session_id = ? "
+                    "ORDER BY id DESC LIMIT ?)",
+                    (session_id, session_id, max_messages),
+                )
+            self._touch(session_id, time.time())
+
+    def touch(self, session_id: str, timestamp: float):
+        """Record activity on a session."""
+        with self._lock, self._conn:
+            self._touch(session_id, timestamp)
+
+    def _touch(self, session_id: str, timestamp: float):
+        self._conn.execute(
+            "INSERT INTO sessions (session_id, last_access) VALUES (?, ?) "
+            "ON CONFLICT(session_id) DO UPDATE SET last_access = excluded.last_access",
+            (session_id, timestamp),
+        )
+
+    def delete(self, session_id: str):
+        """Remove a session and its messages."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM messages WHERE session_id = ?", (session_id,)
+            )
+            self._conn.execute(
+                "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+            )
+
+    def expire(self, cutoff: float) -> int:
+        """Delete sessions idle since before cutoff; return how many."""
+        with self._lock, self._conn:
+            expired = self._conn.execute(
+                "SELECT COUNT(*) FROM sessions WHERE last_access < ?", (cutoff,)
+            ).fetchone()[0]
+            self._conn.execute(
+                "DELETE FROM messages WHERE session_id IN ("
+                "SELECT session_id FROM sessions WHERE last_access < ?)",
+                (cutoff,),
+            )
+            self._conn.execute("DELETE FROM sessions WHERE last_access < ?", (cutoff,))
+        return expired
+
+
+class SQLiteChatMessageHistory(BaseChatMessageHistory):
+    """Chat history of one session stored in the shared SQLite database."""
+
+    def __init__(
+        self,
+        session_id: str,
+        backend: _SQLiteSessionBackend,
+        max_messages: int = SESSION_MAX_MESSAGES,
+    ):
+        """Bind a history to a session.
+
+        Args:
+            session_id (str): Session identifier
+            backend (_SQLiteSessionBackend): Shared database
+            max_messages (int): Messages kept per session (0 keeps all)
+        """
+        self.session_id = session_id
+        self.backend = backend
+        self.max_messages = max_messages
+
+    @property
+    def messages(self) -> List[BaseMessage]:
+        """Messages in the window, oldest first."""
+        return self.backend.load(self.session_id, self.max_messages)
+
+    def add_messages(self, messages: Sequence[BaseMessage]):
+        """Append messages and drop the oldest ones beyond the window."""
+        self.backend.append(self.session_id, messages, self.max_messages)
+
+    def clear(self):
+        """Remove all messages of the session."""
+        self.backend.delete(self.session_id)
+
+
+class SessionStore:
+    """Thread-safe, bounded map of session id → chat history."""
+
+    def __init__(
+        self,
+        max_sessions: int = SESSION_MAX_SESSIONS,
+        idle_ttl_seconds: float = SESSION_IDLE_TTL_SECONDS,
+        max_messages: int = SESSION_MAX_MESSAGES,
+        db_path: Optional[str] = SESSION_DB_PATH,
+    ):
+        """Create an empty store.
+
+        Args:
+            max_sessions (int): Maximum number of live sessions
+            idle_ttl_seconds (float): Idle seconds before a session expires
+                (0 disables expiry)
+            max_messages (int): Messages kept per session (0 keeps all)
+            db_path (Optional[str]): SQLite file for persistent histories;
+                None keeps histories in memory only
+        """
+        self.max_sessions = max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.max_messages = max_messages
+        self._backend = _SQLiteSessionBackend(db_path) if db_path else None
+
+        # Ordered by last access, least recent first
+        self._sessions: "OrderedDict[str, BaseChatMessageHistory]" = OrderedDict()
+        self._last_access: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._last_db_sweep = 0.0
+        self.evictions = 0
+        self.expired = 0
+
+    def get(self, session_id: str) -> BaseChatMessageHistory:
+        """Return the history of a session, creating (or reloading) it.
+
+        Args:
+            session_id (str): Unique identifier for the user session
+
+        Returns:
+            BaseChatMessageHistory: History of the session
+        """
+        now = time.time()
+        with self._lock:
+            self._expire_idle(now)
+
+            history = self._sessions.pop(session_id, None)
+            if history is None:
+                history = self._create(session_id)
+            self._sessions[session_id] = history
+            self._last_access[session_id] = now
+
+            while len(self._sessions) > self.max_sessions:
+                evicted_id, _ = self._sessions.popitem(last=False)
+                del self._last_access[evicted_id]
+                self.evictions += 1
+
+        if self._backend is not None:
+            self._backend.touch(session_id, now)
+        return history
+
+    def _create(self, session_id: str) -> BaseChatMessageHistory:
+        """Create the history object for a session (caller holds the lock)."""
+        if self._backend is not None:
+            return SQLiteChatMessageHistory(
+                session_id, self._backend, self.max_messages
+            )
+        return WindowedChatMessageHistory(self.max_messages)
+
+    def _expire_idle(self, now: float):
+        """Drop sessions idle longer than the TTL (caller holds the lock)."""
+        if not self.idle_ttl_seconds:
+            return
+        cutoff = now - self.idle_ttl_seconds
+
+        # Least recently used first, so stop at the first live session
+        while self._sessions:
+            session_id = next(iter(self._sessions))
+            if self._last_access[session_id] >= cutoff:
+                break
+            del self._sessions[session_id]
+            del self._last_access[session_id]
+            self.expired += 1
+
+        if (
+            self._backend is not None
+            and now - self._last_db_sweep >= _DB_SWEEP_INTERVAL_SECONDS
+        ):
+            self._last_db_sweep = now
+            self._backend.expire(cutoff)
+
+    def delete(self, session_id: str):
+        """Forget a session and its stored messages."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._last_access.pop(session_id, None)
+        if self._backend is not None:
+            self._backend.delete(session_id)
+
+    def cache_info(self) -> SessionStoreInfo:
+        """Return eviction statistics (like functools.lru_cache)."""
+        with self._lock:
+            return SessionStoreInfo(
+                backend="sqlite" if self._backend is not None else "memory",
+                evictions=self.evictions,
+                expired=self.expired,
+                maxsize=self.max_sessions,
+                currsize=len(self._sessions),
+            )
+
+
+# ==== Process-wide Store ====
+_session_store = SessionStore()
+
+
+def get_session_store() -> SessionStore:
+    """Return the process-wide session store."""
+    return _session_store
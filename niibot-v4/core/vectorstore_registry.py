@@ -0,0 +1,217 @@
+"""Process-wide Vectorstore Registry with Shared Collection Handles.
+
+This module keeps one Chroma client per collection for the lifetime of the
+process, so that chains, retrievers and cross-domain searches all reuse the
+same SQLite-backed handle instead of re-opening the collection per query.
+
+Key Features:
+    - Lazy, lock-protected opening of each collection under VECTOR_DB_DIR
+    - Shared handles that are safe to use from multiple threads
+    - Startup warm-up that opens every collection and loads its index
+    - Health and size introspection for monitoring commands
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from langchain_chroma import Chroma
+
+from config.settings import (
+    VECTOR_DB_DIR,
+    COLLECTION_NAMES,
+    INDEX_VERSION_FILENAME,
+    embedding_model,
+)
+
+class VectorStoreRegistry:
+    """Thread-safe registry of shared Chroma vectorstores keyed by collection.
+
+    Each collection is opened at most once. Chroma serialises access to its
+    SQLite store internally, so a single handle can serve concurrent readers;
+    the registry lock only guards creation and eviction of handles.
+    """
+
+    def __init__(self, base_dir: str = VECTOR_DB_DIR, embedding_function=None):
+        """Initialize an empty registry.
+
+        Args:
+            base_dir (str): Directory containing one sub-directory per collection
+            embedding_function: Embedding model shared by every collection
+        """
+        self.base_dir = base_dir
+        self.embedding_function = embedding_function or embedding_model
+        self._stores: Dict[str, Chroma] = {}
+        self._open_times: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def collection_path(self, domain: str) -> str:
+        """Return the persist directory for a collection."""
+        return os.path.join(self.base_dir, domain)
+
+    def has_collection(self, domain: str) -> bool:
+        """Check whether a collection exists on disk."""
+        return os.path.isdir(self.collection_path(domain))
+
+    def collection_version(self, domain: str) -> int:
+        """Return a version stamp that changes whenever the indexer writes.
+
+        The stamp is read from the INDEX_VERSION_FILENAME marker, which the
+        indexer rewrites only after a run that changed the collection.
+        File mtimes are not used: Chroma touches its files when a
+        collection is opened or first queried, which is not a change.
+
+        Args:
+            domain (str): Collection name
+
+        Returns:
+            int: Version stamp, or 0 if the collection has no marker yet
+        """
+        marker_path = os.path.join(self.collection_path(domain), INDEX_VERSION_FILENAME)
+        try:
+            with open(marker_path, "r", encoding="utf-8") as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def get(self, domain: str) -> Optional[Chroma]:
+        """Return the shared vectorstore for a collection, opening it on first use.
+
+        Args:
+            domain (str): Collection name (faculty_info, research, ...)
+
+        Returns:
+            Optional[Chroma]: Shared vectorstore, or None if the collection
+            directory does not exist
+
+        Raises:
+            Exception: Propagates Chroma errors raised while opening the store
+        """
+        store = self._stores.get(domain)
+        if store is not None:
+            return store
+
+        with self._lock:
+            # Re-check after acquiring the lock in case another thread opened it
+            store = self._stores.get(domain)
+            if store is not None:
+                return store
+
+            collection_path = self.collection_path(domain)
+            if not os.path.isdir(collection_path):
+                print(f"⚠️ Collection directory not found: {collection_path}")
+                return None
+
+            start_time = time.perf_counter()
+            store = Chroma(
+                collection_name=domain,
+                embedding_function=self.embedding_function,
+                persist_directory=collection_path,
+            )
+            self._open_times[domain] = time.perf_counter() - start_time
+            self._stores[domain] = store
+            print(
+                f"📂 Opened shared vectorstore '{domain}' "
+                f"in {self._open_times[domain] * 1000:.0f}ms"
+            )
+            return store
+
+    def invalidate(self, domain: Optional[str] = None):
+        """Drop cached handles so the next get() re-opens them.
+
+        Args:
+            domain (Optional[str]): Collection to drop, or None to drop all
+        """
+        with self._lock:
+            if domain is None:
+                self._stores.clear()
+                self._open_times.clear()
+            else:
+                self._stores.pop(domain, None)
+                self._open_times.pop(domain, None)
+
+    def warm_up(
+        self, domains: Optional[List[str]] = None, probe_query: bool = True
+    ) -> Dict[str, bool]:
+        """Open collections ahead of the first request.
+
+        Args:
+            domains (Optional[List[str]]): Collections to open. Defaults to all.
+            probe_query (bool): Run a one-result search so the vector index and
+                embedding model are loaded before the first user query
+
+        Returns:
+            Dict[str, bool]: Collection name → whether it is ready
+        """
+        ready = {}
+        for domain in domains or COLLECTION_NAMES:
+            try:
+                store = self.get(domain)
+                if store is not None and probe_query:
+                    store.similarity_search("NII", k=1)
+                ready[domain] = store is not None
+            except Exception as e:
+                print(f"⚠️ Warm-up failed for {domain}: {e}")
+                ready[domain] = False
+
+        print(f"🔥 Vectorstore warm-up: {sum(ready.values())}/{len(ready)} ready")
+        return ready
+
+    def health_check(self) -> Dict[str, dict]:
+        """Report status and document count of every configured collection.
+
+        Returns:
+            Dict[str, dict]: Collection name → {"status", "documents",
+            "open_ms", "path"}
+        """
+        report = {}
+        for domain in COLLECTION_NAMES:
+            entry = {
+                "status": "missing",
+                "documents": 0,
+                "open_ms": None,
+                "path": self.collection_path(domain),
+            }
+            if self.has_collection(domain):
+                try:
+                    store = self.get(domain)
+                    entry["documents"] = store._collection.count()
+                    entry["status"] = "ok"
+                    entry["open_ms"] = round(self._open_times.get(domain, 0) * 1000)
+                except Exception as e:
+                    entry["status"] = f"error: {e}"
+            report[domain] = entry
+        return report
+
+    def stats(self) -> dict:
+        """Return a short summary of the registry state."""
+        with self._lock:
+            return {
+                "open_collections": sorted(self._stores.keys()),
+                "total_open_ms": round(sum(self._open_times.values()) * 1000),
+            }
+
+
+# ==== Process-wide Registry ====
+_registry = VectorStoreRegistry()
+
+
+def get_vectorstore_registry() -> VectorStoreRegistry:
+    """Return the process-wide vectorstore registry."""
+    return _registry
+
+
+def get_vectorstore(domain: str) -> Optional[Chroma]:
+    """Shortcut for get_vectorstore_registry().get(domain)."""
+    return _registry.get(domain)
+
+
+def get_collection_version(domain: str) -> int:
+    """Shortcut for get_vectorstore_registry().collection_version(domain)."""
+    return _registry.collection_version(domain)
+
+
+def warm_up_vectorstores(probe_query: bool = True) -> Dict[str, bool]:
+    """Open every configured collection once at application startup."""
+    return _registry.warm_up(probe_query=probe_query)
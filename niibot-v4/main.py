@@ -1,6 +1,17 @@
-from chains.rag_chain import get_enhanced_chain_for_domain
-from domain_router import classify_domain
+from chains.rag_chain import stream_chain_events
 from utils.document_utils import display_sources
+from config.settings import embedding_model
+from core.chain_factory import get_chain_factory, get_chain_for_domain
+from core.domain_classifier import get_domain_classifier
+from core.pipeline import prepare_query
+from core.request_context import RequestContext
+from core.response_cache import get_response_cache
+from core.session_store import get_session_store
+from utils.pattern_matcher import match_patterns
+from core.vectorstore_registry import (
+    get_vectorstore_registry,
+    warm_up_vectorstores,
+)
 from core.caching import (
     _cached_query_preprocessing,
     _cached_name_lookup,
@@ -34,8 +45,13 @@ def run_chat():
     print("   • 🚀 LRU Caching for improved performance")
     print("\n📝 Type 'exit', 'quit', or 'bye' to end the session")
     print("📊 Type 'cache_stats' to see caching performance")
+    print("🗄️ Type 'vectorstore_stats' to see collection health")
     print("🎯 " + "=" * 70 + "\n")
 
+    # Open every collection once so the first query doesn't pay for it
+    warm_up_vectorstores()
+    get_domain_classifier().warm_up()
+
     session_id = "enhanced-nii-session"
     chat_history = []  # Track conversation for context
 
@@ -53,6 +69,14 @@ def run_chat():
                     f"   🔍 Query preprocessing cache: {_cached_query_preprocessing.cache_info()}"
                 )
                 print(f"   👥 Name lookup cache: {_cached_name_lookup.cache_info()}")
+                print(f"   🔤 Pattern match cache: {match_patterns.cache_info()}")
+                print(f"   🧮 Query embedding cache: {embedding_model.cache_info()}")
+                print(f"   💬 Response cache: {get_response_cache().cache_info()}")
+                print(f"   🗂️ Session store: {get_session_store().cache_info()}")
+                print(f"   🧱 Chain cache: {get_chain_factory().cache_info()}")
+                print(
+                    f"   🧱 Chain build times (ms): {get_chain_factory().build_times()}"
+                )
 
                 # Check if we have an active faculty extractor with cache
                 try:
@@ -79,6 +103,16 @@ def run_chat():
                 print()
                 continue
 
+            if user_query.lower() == "vectorstore_stats":
+                print("\n🗄️ Vectorstore Health:")
+                for name, entry in get_vectorstore_registry().health_check().items():
+                    print(
+                        f"   • {name}: {entry['status']} "
+                        f"({entry['documents']} documents, opened in {entry['open_ms']}ms)"
+                    )
+                print()
+                continue
+
             # Handle exit commands
             if user_query.lower() in {"exit", "quit", "bye", "goodbye"}:
                 print("\n📊 Final Cache Statistics:")
@@ -86,21 +120,28 @@ def run_chat():
                     f"   🔍 Query preprocessing: {_cached_query_preprocessing.cache_info()}"
                 )
                 print(f"   👥 Name lookup: {_cached_name_lookup.cache_info()}")
+                print(f"   🧮 Query embedding: {embedding_model.cache_info()}")
+                print(f"   💬 Response cache: {get_response_cache().cache_info()}")
+                print(f"   🧱 Chain cache: {get_chain_factory().cache_info()}")
                 print("\n👋 Thank you for using NIIBot! Goodbye!")
                 break
 
+            # One context per request, shared by every pipeline stage
+            request_context = RequestContext(user_query)
+
             # ===== DOMAIN CLASSIFICATION =====
             # Route query to appropriate domain/collection
+            # Pronoun rewriting runs concurrently with classification
             try:
-                domain = classify_domain(user_query)
-                print(f"🔀 Routing to: {domain}")
+                domain = prepare_query(request_context, chat_history)
             except Exception as e:
                 print(f"⚠️ Domain classification failed: {e}")
                 domain = "nii_info"  # Default fallback
                 print(f"🔄 Using default domain: {domain}")
+            request_context.domain = domain
 
             # ===== GET DOMAIN-SPECIFIC CHAIN =====
-            result = get_enhanced_chain_for_domain(domain)
+            result = get_chain_for_domain(domain)
             if result[0] is None:
                 print("❌ Error: Could not load the knowledge base.")
                 print("\n💡 This is likely because:")
@@ -124,23 +165,39 @@ def run_chat():
             chain_input = {
                 "question": user_query,
                 "chat_history": chat_history,  # Pass conversation history
+                "request_context": request_context,
             }
 
-            # Get response from the chain
-            response = chain.invoke(
-                chain_input,
-                config={"configurable": {"session_id": session_id}},
-            )
-
-            # ===== DISPLAY RESPONSE =====
-            print(f"\n🤖 NIIBot: {response}")
+            # Stream the response from the chain as tokens arrive
+            response = ""
+            answer_started = False
+            with request_context.timed("chain"):
+                for event in stream_chain_events(
+                    chain,
+                    chain_input,
+                    config={"configurable": {"session_id": session_id}},
+                ):
+                    if event["type"] == "retrieval":
+                        source = "response cache" if event["cached"] else "retrieval"
+                        print(f"📚 {len(event['docs'])} documents from {source}")
+                    elif event["type"] == "token":
+                        if not answer_started:
+                            print("\n🤖 NIIBot: ", end="", flush=True)
+                            answer_started = True
+                        print(event["text"], end="", flush=True)
+                    elif event["type"] == "done":
+                        response = event["response"]
+
+            # ===== FINISH RESPONSE =====
+            print()
+            print(f"⏱️ {request_context.timing_summary()}")
 
             # Update chat history for next iteration
             chat_history.append({"query": user_query, "response": response})
 
             # Show source attribution
-            if "retrieved_docs" in chain_input:
-                display_sources(chain_input["retrieved_docs"])
+            if request_context.retrieved_docs:
+                display_sources(request_context.retrieved_docs)
 
             print("\n" + "-" * 70 + "\n")
 
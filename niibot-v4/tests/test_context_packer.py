@@ -0,0 +1,33 @@
+"""Tests for packing documents larger than the token budget."""
+
+from langchain_core.documents import Document
+from utils.context_packer import count_tokens, pack_context, truncate_to_tokens
+
+NAME_LIST = "Current faculty: " + ", ".join(
+    f"Dr. Person{i} Surname{i}" for i in range(150)
+)
+
+
+def test_oversized_first_unit_is_truncated_not_dropped():
+    context, tokens_used = pack_context([Document(page_content=NAME_LIST)], 300)
+
+    assert context.startswith("Document 1:\nCurrent faculty: Dr. Person0")
+    assert context.endswith("...")
+    assert 0 < tokens_used <= 300
+
+
+def test_truncated_document_leaves_room_for_later_ones():
+    docs = [Document(page_content=NAME_LIST), Document(page_content="**Email**: a@b.c")]
+
+    context, tokens_used = pack_context(docs, 300)
+
+    assert "Document 2:\n**Email**: a@b.c" in context
+    assert tokens_used <= 300
+
+
+def test_truncate_to_tokens_keeps_whole_words():
+    prefix = truncate_to_tokens(NAME_LIST, 20)
+
+    assert NAME_LIST.startswith(prefix)
+    assert count_tokens(prefix) <= 20
+    assert NAME_LIST[len(prefix)] == " "
@@ -0,0 +1,30 @@
+"""Tests for typo-tolerant faculty name matching."""
+
+import pytest
+from core.faculty_extractor import FacultyNameExtractor
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    return FacultyNameExtractor()
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("dr. tanmey", "Dr. Tanmay Majumdar"),
+        ("dr. tanmey publications", "Dr. Tanmay Majumdar"),
+        ("tell me about dr. tanmey", "Dr. Tanmay Majumdar"),
+        ("monika email", "Dr. Monica Sundd"),
+    ],
+)
+def test_misspelt_name_in_academic_query(extractor, query, expected):
+    assert extractor.extract_names(query) == [expected]
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["monika", "structural biology research", "what is the weather today"],
+)
+def test_no_fuzzy_match_without_name_context(extractor, query):
+    assert extractor.extract_names(query) == []
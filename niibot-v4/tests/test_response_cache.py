@@ -0,0 +1,165 @@
+"""Tests for the semantic response cache."""
+
+import pytest
+
+# config.settings loads the sentence-transformers embedding model on import
+pytest.importorskip("sentence_transformers")
+
+from langchain_core.documents import Document  # noqa: E402
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+from langchain_core.runnables import RunnableLambda  # noqa: E402
+
+from core import response_cache  # noqa: E402
+from core.response_cache import SemanticResponseCache  # noqa: E402
+
+DOMAIN = "faculty"
+DOCS = [Document(page_content="Dr. Monica Sundd, monica@nii.ac.in")]
+
+
+class FakeEmbedder:
+    """Embeds every query to the same vector unless told otherwise."""
+
+    def __init__(self, vectors=None):
+        self.vectors = vectors or {}
+        self.calls = []
+
+    def embed_query(self, text):
+        self.calls.append(text)
+        return self.vectors.get(text, [1.0, 0.0, 0.0])
+
+
+@pytest.fixture
+def version(monkeypatch):
+    """Collection version seen by the cache, settable per test."""
+    current = {DOMAIN: 1}
+    monkeypatch.setattr(
+        response_cache, "get_collection_version", lambda domain: current[domain]
+    )
+    return current
+
+
+@pytest.fixture
+def cache(version):
+    return SemanticResponseCache(
+        embedder=FakeEmbedder(), similarity_threshold=0.92, maxsize=8, ttl_seconds=0
+    )
+
+
+def test_near_identical_question_is_a_hit(cache):
+    cache.store(DOMAIN, "monica email", "monica@nii.ac.in", DOCS)
+
+    cached = cache.lookup(DOMAIN, "Monica's email?")
+
+    assert cached is not None
+    assert cached.response == "monica@nii.ac.in"
+    assert cached.docs == DOCS
+    assert cache.cache_info().hits == 1
+
+
+def test_misspelt_name_resolving_to_same_faculty_is_a_hit(cache):
+    cache.store(DOMAIN, "monica email", "monica@nii.ac.in", DOCS)
+
+    assert cache.lookup(DOMAIN, "monika email") is not None
+
+
+def test_different_faculty_is_a_miss(cache):
+    cache.store(DOMAIN, "dr. monica sundd email", "monica@nii.ac.in", DOCS)
+
+    assert cache.lookup(DOMAIN, "dr. tanmay majumdar email") is None
+    assert cache.cache_info().misses == 1
+
+
+def test_different_field_is_a_miss(cache):
+    cache.store(DOMAIN, "monica email", "monica@nii.ac.in", DOCS)
+
+    assert cache.lookup(DOMAIN, "monica phone") is None
+
+
+def test_dissimilar_question_is_a_miss(version):
+    embedder = FakeEmbedder({"Monica's email?": [0.0, 1.0, 0.0]})
+    cache = SemanticResponseCache(embedder=embedder, ttl_seconds=0)
+    cache.store(DOMAIN, "monica email", "monica@nii.ac.in", DOCS)
+
+    assert cache.lookup(DOMAIN, "Monica's email?") is None
+
+
+def test_exact_repeat_skips_embedding(cache):
+    cache.store(DOMAIN, "monica email", "monica@nii.ac.in", DOCS)
+    cache.embedder.calls.clear()
+
+    assert cache.lookup(DOMAIN, "  Monica   EMAIL ") is not None
+    assert cache.embedder.calls == []
+
+
+def test_expired_entry_is_a_miss(version, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    cache = SemanticResponseCache(embedder=FakeEmbedder(), ttl_seconds=60)
+    cache.store(DOMAIN, "monica email", "monica@nii.ac.in", DOCS)
+
+    now[0] += 30
+    assert cache.lookup(DOMAIN, "monica email") is not None
+
+    now[0] += 61
+    assert cache.lookup(DOMAIN, "monica email") is None
+    assert cache.lookup(DOMAIN, "monica's email") is None
+
+
+def test_least_recently_used_entry_is_evicted(version):
+    embedder = FakeEmbedder(
+        {
+            "monica": [1.0, 0.0, 0.0],
+            "tanmay": [0.0, 1.0, 0.0],
+            "arnab": [0.0, 0.0, 1.0],
+        }
+    )
+    cache = SemanticResponseCache(embedder=embedder, maxsize=2, ttl_seconds=0)
+    cache.store(DOMAIN, "monica", "a")
+    cache.store(DOMAIN, "tanmay", "b")
+    cache.lookup(DOMAIN, "monica")  # monica is now the most recently used
+    cache.store(DOMAIN, "arnab", "c")
+
+    assert cache.lookup(DOMAIN, "tanmay") is None
+    assert cache.lookup(DOMAIN, "monica").response == "a"
+    assert cache.lookup(DOMAIN, "arnab").response == "c"
+    info = cache.cache_info()
+    assert (info.evictions, info.currsize) == (1, 2)
+
+
+def test_collection_version_change_invalidates_domain(cache, version):
+    cache.store(DOMAIN, "monica email", "monica@nii.ac.in", DOCS)
+
+    version[DOMAIN] = 2
+
+    assert cache.lookup(DOMAIN, "monica email") is None
+    info = cache.cache_info()
+    assert (info.invalidations, info.currsize) == (1, 0)
+
+
+def test_explicit_invalidate_clears_domain(cache):
+    cache.store(DOMAIN, "monica email", "monica@nii.ac.in", DOCS)
+
+    cache.invalidate(DOMAIN)
+
+    assert cache.lookup(DOMAIN, "monica email") is None
+
+
+def test_follow_up_question_bypasses_cache(cache, monkeypatch):
+    monkeypatch.setattr(response_cache, "_response_cache", cache)
+    calls = []
+
+    def answer(inputs):
+        calls.append(inputs["question"])
+        inputs["retrieved_docs"] = DOCS
+        yield "answer"
+
+    chain = response_cache.with_response_cache(RunnableLambda(answer), DOMAIN)
+    history = [HumanMessage("who is dr. monica sundd"), AIMessage("A professor.")]
+
+    chain.invoke({"question": "monica email", "chat_history": []})
+    chain.invoke({"question": "monica email", "chat_history": []})
+    chain.invoke({"question": "her email", "chat_history": history})
+
+    assert calls == ["monica email", "her email"]
+    info = cache.cache_info()
+    assert (info.hits, info.bypassed, info.currsize) == (1, 1, 1)
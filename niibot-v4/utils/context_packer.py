@@ -0,0 +1,238 @@
+"""Token-budget-aware Context Packer.
+
+Retrieved chunks used to be cut at fixed character offsets (800 characters
+per document, 3,500 in total), which often split a fact in half while
+spending the budget on boilerplate. The packer measures text in tokens and
+fills a budget with whole units instead:
+
+    - Field lines ("**Email**: ...") are kept whole or left out
+    - Prose is split into sentences, packed in order
+    - Documents are packed in rank order; every document first gets a fair
+      share, then any leftover budget goes back to the highest-ranked ones
+
+Token counts use tiktoken when it is installed (cl100k_base approximates the
+Llama 3 tokenizer); otherwise a characters-per-token estimate is used.
+"""
+
+import math
+import re
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+_CHARS_PER_TOKEN = 4  # Fallback estimate for English text
+_FIELD_LINE = re.compile(r"^\s*(?:[-*]\s+)?\*\*[^*\n]+\*\*")
+# Sentence boundary: punctuation, whitespace, then a capital letter or digit,
+# unless the period ends a title or an initial ("Dr. S. Gopalan")
+_SENTENCE_END = re.compile(
+    r"(?<!\bDr\.)(?<!\bMr\.)(?<!\bMs\.)(?<!\bMrs\.)(?<!\bProf\.)(?<!\bSt\.)"
+    r"(?<!\b[A-Z]\.)(?<=[.!?;])\s+(?=[A-Z0-9(])"
+)
+_OMITTED_MARKER = "..."
+
+
+@lru_cache(maxsize=1)
+def get_token_counter() -> Callable[[str], int]:
+    """Return a function counting tokens, built once per process.
+
+    Returns:
+        Callable[[str], int]: tiktoken-based counter, or a character-based
+        estimate if tiktoken (or its encoding file) is unavailable
+    """
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+    except Exception:
+        return lambda text: math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+def count_tokens(text: str) -> int:
+    """Count (or estimate) the tokens of a text."""
+    return get_token_counter()(text)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut a text to its longest prefix within a token limit.
+
+    Whole words are kept where possible; a single word longer than the
+    limit is cut by characters.
+
+    Args:
+        text (str): Text to cut
+        max_tokens (int): Token limit
+
+    Returns:
+        str: Prefix of the text (empty if max_tokens < 1)
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    def longest_prefix(pieces: List[str], separator: str) -> str:
+        low, high = 0, len(pieces)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if count_tokens(separator.join(pieces[:middle])) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        return separator.join(pieces[:low])
+
+    return longest_prefix(text.split(" "), " ") or longest_prefix(list(text), "")
+
+
+def split_units(
+    text: str, max_unit_tokens: Optional[int] = None
+) -> List[Tuple[int, str]]:
+    """Split document text into packable units, in reading order.
+
+    Args:
+        text (str): Document content
+        max_unit_tokens (Optional[int]): Fields longer than this are split
+            into sentences (label kept on the first one) so they can still
+            be packed partially; shorter fields always stay whole
+
+    Returns:
+        List[Tuple[int, str]]: (line number, unit) for field lines and
+        prose sentences
+    """
+    units = []
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    for line_number, line in enumerate(lines):
+        is_field = bool(_FIELD_LINE.match(line))
+        if is_field and (
+            max_unit_tokens is None or count_tokens(line) <= max_unit_tokens
+        ):
+            units.append((line_number, line))
+        else:
+            units.extend(
+                (line_number, sentence)
+                for sentence in _SENTENCE_END.split(line)
+                if sentence
+            )
+    return units
+
+
+class _PackedDocument:
+    """Units of one document and which of them have been packed."""
+
+    def __init__(self, units: List[Tuple[int, str]]):
+        self.lines = [line_number for line_number, _ in units]
+        self.units = [unit for _, unit in units]
+        self.costs = [count_tokens(unit) for unit in self.units]
+        self.packed = [False] * len(units)
+        self.truncated = False
+
+    def fill(self, budget: int) -> int:
+        """Pack unpacked units, in order, that fit the budget; return tokens used.
+
+        Sentences of one line are only packed as a prefix of that line, so a
+        split paragraph never loses its opening (or a field its label).
+        """
+        used = 0
+        for position, cost in enumerate(self.costs):
+            if self.packed[position] or used + cost > budget:
+                continue
+            continues_line = (
+                position > 0 and self.lines[position - 1] == self.lines[position]
+            )
+            if continues_line and not self.packed[position - 1]:
+                continue
+            self.packed[position] = True
+            used += cost
+        return used
+
+    def truncate_first(self, budget: int) -> int:
+        """Pack a prefix of the first unit when even it exceeds the budget.
+
+        Returns:
+            int: Tokens used (0 if nothing fits)
+        """
+        if not self.units or self.packed[0]:
+            return 0
+        prefix = truncate_to_tokens(self.units[0], budget)
+        if not prefix:
+            return 0
+        self.units[0] = prefix
+        self.costs[0] = count_tokens(prefix)
+        self.packed[0] = True
+        self.truncated = True
+        return self.costs[0]
+
+    def render(self) -> str:
+        """Packed units in reading order, marking omitted content."""
+        lines: List[str] = []
+        previous_line = None
+        for line_number, unit, packed in zip(self.lines, self.units, self.packed):
+            if not packed:
+                continue
+            if line_number == previous_line:
+                lines[-1] += " " + unit
+            else:
+                lines.append(unit)
+            previous_line = line_number
+        if self.truncated or not all(self.packed):
+            lines.append(_OMITTED_MARKER)
+        return "\n".join(lines)
+
+
+def pack_context(
+    docs: List[Document],
+    token_budget: int,
+    max_docs: Optional[int] = None,
+    doc_token_budget: Optional[int] = None,
+) -> Tuple[str, int]:
+    """
+    Pack ranked documents into a token budget.
+
+    Args:
+        docs (List[Document]): Documents, best first
+        token_budget (int): Total tokens for the formatted context
+        max_docs (Optional[int]): Maximum number of documents to consider
+        doc_token_budget (Optional[int]): First-pass share per document;
+            defaults to an even split of the budget
+
+    Returns:
+        Tuple[str, int]: Formatted "Document N:" blocks and tokens used
+    """
+    docs = docs[:max_docs] if max_docs else docs
+    if not docs:
+        return "", 0
+
+    share = doc_token_budget or max(1, token_budget // len(docs))
+    packed_docs = [
+        _PackedDocument(split_units(doc.page_content, share)) for doc in docs
+    ]
+    header_cost = count_tokens("Document 10:\n") + count_tokens(_OMITTED_MARKER)
+    remaining = token_budget
+
+    def pack_into(packed_doc: _PackedDocument, budget: int) -> int:
+        """Fill a document; its header is paid when its first unit is packed."""
+        header = 0 if any(packed_doc.packed) else header_cost
+        used = packed_doc.fill(budget - header) if budget > header else 0
+        return used + header if used else 0
+
+    # Pass 1: each document, in rank order, gets up to its share
+    for packed_doc in packed_docs:
+        remaining -= pack_into(packed_doc, min(share, remaining))
+
+    # Pass 2: leftover budget goes to the highest-ranked documents first
+    for packed_doc in packed_docs:
+        remaining -= pack_into(packed_doc, remaining)
+
+    # Pass 3: a document whose first unit alone exceeds the budget (e.g. a
+    # long comma-separated name list) still contributes a truncated prefix
+    for packed_doc in packed_docs:
+        if not any(packed_doc.packed) and remaining > header_cost:
+            used = packed_doc.truncate_first(remaining - header_cost)
+            remaining -= used + header_cost if used else 0
+
+    blocks = [
+        packed_doc.render() for packed_doc in packed_docs if any(packed_doc.packed)
+    ]
+    context = "\n\n".join(
+        f"Document {number}:\n{block}" for number, block in enumerate(blocks, 1)
+    )
+    return context, token_budget - remaining
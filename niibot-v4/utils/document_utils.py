@@ -1,67 +1,110 @@
+import hashlib
 from typing import List, Dict, Any, Optional
 from langchain_core.documents import Document
 
+from config.settings import (
+    CONTEXT_TOKEN_BUDGET,
+    NEAR_DUPLICATE_DEDUP_ENABLED,
+    NEAR_DUPLICATE_MAX_DISTANCE,
+)
+from utils.context_packer import pack_context
+from utils.simhash import SimHashIndex, simhash
+
 # ==== Utility Functions ====
 
 
 # ==== Unified Document Processing ====
-def _deduplicate_documents(docs: List[Document]) -> List[Document]:
+def _document_key(doc: Document) -> str:
+    """
+    Identity of a chunk for exact deduplication.
+
+    Args:
+        doc (Document): Retrieved document
+
+    Returns:
+        str: The indexer's doc_hash (content hash) if stored, else the chunk
+        id, else a hash of the normalized content
+    """
+    doc_hash = doc.metadata.get("doc_hash")
+    if doc_hash:
+        return f"hash:{doc_hash}"
+    if getattr(doc, "id", None):
+        return f"id:{doc.id}"
+    normalized = " ".join(doc.page_content.split())
+    return "content:" + hashlib.md5(normalized.encode("utf-8")).hexdigest()
+
+
+def _deduplicate_documents(
+    docs: List[Document], near_duplicates: bool = NEAR_DUPLICATE_DEDUP_ENABLED
+) -> List[Document]:
     """
     UNIFIED deduplication function for all document types.
 
     Args:
         docs (List[Document]): List of documents that may contain duplicates
+        near_duplicates (bool): Also drop near-identical chunks (SimHash)
 
     Returns:
-        List[Document]: List with duplicates removed
+        List[Document]: List with duplicates removed, first occurrence kept
 
-    Method: Uses first 150 characters as content fingerprint for deduplication.
+    Method: Exact duplicates share a doc_hash / chunk id (see _document_key).
+    The optional near-duplicate pass compares SimHash fingerprints through a
+    banded index, so it stays linear in the number of documents.
     This replaces multiple similar functions throughout the codebase.
     """
     if not docs:
         return []
 
-    seen_content = set()
+    seen_keys = set()
+    near_index = SimHashIndex(NEAR_DUPLICATE_MAX_DISTANCE) if near_duplicates else None
     unique_docs = []
 
     for doc in docs:
-        # Create content identifier from first 150 characters
-        content_id = doc.page_content[:150].replace("\n", " ").strip()
-        if content_id not in seen_content:
-            seen_content.add(content_id)
-            unique_docs.append(doc)
+        key = _document_key(doc)
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
+
+        if near_index is not None:
+            fingerprint = simhash(doc.page_content)
+            if near_index.find(fingerprint) is not None:
+                continue
+            near_index.add(len(unique_docs), fingerprint)
+
+        unique_docs.append(doc)
 
     return unique_docs
 
 
-def format_docs(docs, max_docs=3, max_chars_per_doc=800):
+def format_docs(docs, max_docs=3, token_budget=None, doc_token_budget=None):
     """
-    Format retrieved documents for inclusion in LLM prompts with integrated truncation.
+    Format retrieved documents for inclusion in LLM prompts within a token budget.
 
     Args:
-        docs: List of retrieved documents
+        docs: List of retrieved documents, best first
         max_docs (int): Maximum number of documents to include
-        max_chars_per_doc (int): Maximum characters per document
+        token_budget (int): Total context tokens (default CONTEXT_TOKEN_BUDGET)
+        doc_token_budget (int): First-pass token share per document
 
     Returns:
         str: Formatted string with numbered documents, ready for LLM
 
-    Purpose: Combines document formatting and truncation in one optimized function.
+    Purpose: Packs whole fields and sentences instead of cutting at a fixed
+    character offset (see utils/context_packer.py).
     """
     if not docs:
         return "No relevant documents found."
 
-    formatted_docs = []
-    for i, doc in enumerate(docs[:max_docs]):
-        # Truncate long documents to prevent token limits
-        content = (
-            doc.page_content[:max_chars_per_doc] + "..."
-            if len(doc.page_content) > max_chars_per_doc
-            else doc.page_content
-        )
-        formatted_docs.append(f"Document {i+1}:\n{content}")
-
-    return "\n\n".join(formatted_docs)
+    context, tokens_used = pack_context(
+        docs,
+        token_budget=token_budget or CONTEXT_TOKEN_BUDGET,
+        max_docs=max_docs,
+        doc_token_budget=doc_token_budget,
+    )
+    print(
+        f"🧩 Packed context: ~{tokens_used} tokens from {min(len(docs), max_docs or len(docs))} documents"
+    )
+    return context or "No relevant documents found."
 
 
 def get_metadata_value(doc, keys, default="Unknown"):
@@ -0,0 +1,162 @@
+"""Single-pass Multi-Pattern Matcher (Aho-Corasick).
+
+Routing, security checks and intent detection each test a query against
+their own keyword lists with ``pattern in query_lower``. This module compiles
+every list in config/patterns.py into one Aho-Corasick automaton at import
+time, so one scan of the query reports the matches of every group.
+
+Matching is plain substring matching, exactly like the ``in`` checks it
+replaces, so each consumer keeps its original behaviour.
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config.patterns import PATTERN_GROUPS
+
+
+class PatternMatches:
+    """Immutable result of one scan: group name → matched patterns."""
+
+    __slots__ = ("_groups",)
+
+    def __init__(self, groups: Dict[str, Tuple[str, ...]]):
+        self._groups = groups
+
+    def has(self, group: str) -> bool:
+        """Return True if any pattern of the group occurs in the text."""
+        return group in self._groups
+
+    def any(self, *groups: str) -> bool:
+        """Return True if any of the given groups matched."""
+        return any(group in self._groups for group in groups)
+
+    def get(self, group: str) -> Tuple[str, ...]:
+        """Return the matched patterns of a group, in the group's list order."""
+        return self._groups.get(group, ())
+
+    def first(self, group: str) -> Optional[str]:
+        """Return the first matched pattern in the group's list order."""
+        matched = self._groups.get(group)
+        return matched[0] if matched else None
+
+    @property
+    def groups(self) -> Tuple[str, ...]:
+        """Names of all groups with at least one match."""
+        return tuple(self._groups)
+
+    def __repr__(self) -> str:
+        return f"PatternMatches({self._groups})"
+
+
+class PatternMatcher:
+    """Aho-Corasick automaton over named groups of substring patterns."""
+
+    def __init__(self, groups: Dict[str, Sequence[str]]):
+        """Compile all pattern groups into one automaton.
+
+        Args:
+            groups (Dict[str, Sequence[str]]): Group name → patterns. Patterns
+                are matched case-sensitively; pass lowercase text and patterns.
+        """
+        self.groups = {name: tuple(patterns) for name, patterns in groups.items()}
+
+        # pattern → [(group, position in group list)]
+        self._owners: Dict[str, List[Tuple[str, int]]] = {}
+        for name, patterns in self.groups.items():
+            for position, pattern in enumerate(patterns):
+                if pattern:
+                    self._owners.setdefault(pattern, []).append((name, position))
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+
+        for pattern in self._owners:
+            self._add_pattern(pattern)
+        self._build_failure_links()
+
+    def _add_pattern(self, pattern: str):
+        """Insert a pattern into the trie."""
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            node = next_node
+        self._output[node] = self._output[node] + (pattern,)
+
+    def _build_failure_links(self):
+        """Breadth-first construction of failure links and merged outputs."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+
+                # Patterns ending at the failure state also end here
+                self._output[child] = self._output[child] + self._output[target]
+
+    def find(self, text: str) -> set:
+        """Return every pattern that occurs in the text (single pass)."""
+        found = set()
+        node = 0
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            if self._output[node]:
+                found.update(self._output[node])
+        return found
+
+    def match(self, text: str) -> PatternMatches:
+        """Scan the text once and group the matches.
+
+        Args:
+            text (str): Text to scan (normally the lowercased query)
+
+        Returns:
+            PatternMatches: Matched patterns per group, in each group's order
+        """
+        hits: Dict[str, List[Tuple[int, str]]] = {}
+        for pattern in self.find(text):
+            for group, position in self._owners[pattern]:
+                hits.setdefault(group, []).append((position, pattern))
+
+        return PatternMatches(
+            {
+                group: tuple(pattern for _, pattern in sorted(entries))
+                for group, entries in hits.items()
+            }
+        )
+
+
+# ==== Process-wide Matcher (compiled once at import) ====
+PATTERN_MATCHER = PatternMatcher(PATTERN_GROUPS)
+
+
+@lru_cache(maxsize=256)
+def match_patterns(query_lower: str) -> PatternMatches:
+    """
+    Match a lowercased query against every pattern group in one pass.
+
+    Cached per query so every consumer on a request shares the same result.
+
+    Args:
+        query_lower (str): Lowercase query string
+
+    Returns:
+        PatternMatches: Matched patterns per group
+    """
+    return PATTERN_MATCHER.match(query_lower)
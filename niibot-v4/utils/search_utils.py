@@ -223,15 +223,107 @@
 
 #     return prioritized
 
-import os
-from typing import List
-from langchain_chroma import Chroma
+from functools import partial
+from typing import List, Optional
 from langchain_core.documents import Document
 
-from config.settings import VECTOR_DB_DIR, embedding_model
+from config.settings import embedding_model, FANOUT_DEADLINE_SECONDS
+from core.fanout import run_fanout
+from core.vectorstore_registry import get_vectorstore
+from utils.pattern_matcher import match_patterns
 from utils.document_utils import _deduplicate_documents
 
 
+def vector_search(vectorstore, query: str, k: int, filter: dict = None, context=None):
+    """
+    Similarity search that embeds the query through the shared embedding cache.
+
+    Args:
+        vectorstore: Chroma vectorstore instance
+        query (str): Search text
+        k (int): Number of documents to retrieve
+        filter (dict): Optional metadata filter
+        context (RequestContext): Optional request context; its per-request
+            embedding memo and timings are used when given
+
+    Returns:
+        List[Document]: Matching documents
+
+    Purpose: Every retrieval tier re-embeds the same question (or the same
+    "faculty name + question" string). Looking the vector up in the cache and
+    searching by vector means each distinct text is encoded only once.
+    """
+    if context is not None:
+        query_embedding = context.embed(query)
+    else:
+        query_embedding = embedding_model.embed_query(query)
+    return vectorstore.similarity_search_by_vector(query_embedding, k=k, filter=filter)
+
+
+def batch_vector_search(
+    vectorstore, queries: List[str], k: int, filters: List[dict] = None
+) -> List[List[Document]]:
+    """
+    Batched similarity search: one encoder pass and one collection query per filter.
+
+    Args:
+        vectorstore: Chroma vectorstore instance
+        queries (List[str]): Search texts
+        k (int): Number of documents to retrieve per text
+        filters (List[dict]): Optional metadata filter per text (None entries
+            mean unfiltered). Must be the same length as queries when given.
+
+    Returns:
+        List[List[Document]]: Results for each query, in input order. A
+        filter group whose query fails gets empty results; the other
+        groups are still returned.
+
+    Purpose: The correction handlers and search strategies loop over lists of
+    search terms. Embedding all terms together and sending all vectors to
+    Chroma at once turns N encoder calls and N round trips into one of each
+    (one round trip per distinct filter, since Chroma applies a single
+    `where` clause to every vector of a query).
+    """
+    if not queries:
+        return []
+
+    filters = filters or [None] * len(queries)
+    if len(filters) != len(queries):
+        raise ValueError("filters must have one entry per query")
+
+    query_embeddings = embedding_model.embed_documents(queries)
+
+    # Group query positions by filter so each distinct filter is one request
+    groups = {}
+    for i, filter_criteria in enumerate(filters):
+        key = repr(sorted(filter_criteria.items())) if filter_criteria else None
+        groups.setdefault(key, (filter_criteria, []))[1].append(i)
+
+    results: List[List[Document]] = [[] for _ in queries]
+    for filter_criteria, positions in groups.values():
+        try:
+            response = vectorstore._collection.query(
+                query_embeddings=[query_embeddings[i] for i in positions],
+                n_results=k,
+                where=filter_criteria or None,
+                include=["documents", "metadatas"],
+            )
+        except Exception as e:
+            print(f"   ⚠️ Batched search failed for filter {filter_criteria}: {e}")
+            continue
+        for row, position in enumerate(positions):
+            results[position] = [
+                Document(page_content=text or "", metadata=metadata or {}, id=doc_id)
+                for doc_id, text, metadata in zip(
+                    response["ids"][row],
+                    response["documents"][row],
+                    response["metadatas"][row],
+                )
+            ]
+
+    return results
+
+
 def optimize_vectorstore_search(
     vectorstore, query: str, k: int, strategies: dict
 ) -> List[Document]:
@@ -248,43 +340,61 @@ def optimize_vectorstore_search(
         List[Document]: Combined and deduplicated results from all strategies
 
     Purpose: Eliminates redundant search code patterns used throughout the system.
+    All strategy searches are collected first and executed as one batch.
     """
     all_docs = []
 
+    # Collect (strategy, text, filter) requests in strategy order
+    requests = []
     for strategy_name, params in strategies.items():
-        try:
-            if strategy_name == "metadata_filter":
-                for filter_criteria in params:
-                    docs = vectorstore.similarity_search(
-                        query, k=k, filter=filter_criteria
-                    )
-                    if docs:
-                        print(f"   ✅ {strategy_name} found {len(docs)} docs")
-                        all_docs.extend(docs)
-
-            elif strategy_name == "content_search":
-                for search_term in params:
-                    docs = vectorstore.similarity_search(search_term, k=k)
-                    all_docs.extend(docs)
+        if strategy_name == "metadata_filter":
+            for filter_criteria in params:
+                requests.append((strategy_name, query, filter_criteria))
+        elif strategy_name == "content_search":
+            for search_term in params:
+                requests.append((strategy_name, search_term, None))
+        elif strategy_name == "semantic_search":
+            requests.append((strategy_name, query, None))
 
-            elif strategy_name == "semantic_search":
-                docs = vectorstore.similarity_search(query, k=k)
-                all_docs.extend(docs)
+    try:
+        batch_results = batch_vector_search(
+            vectorstore,
+            [text for _, text, _ in requests],
+            k=k,
+            filters=[filter_criteria for _, _, filter_criteria in requests],
+        )
+    except Exception as e:
+        print(f"   ⚠️ Batched strategy search failed: {e}")
+        return []
 
-        except Exception as e:
-            print(f"   ⚠️ {strategy_name} failed: {e}")
+    for (strategy_name, _, _), docs in zip(requests, batch_results):
+        if strategy_name == "metadata_filter" and docs:
+            print(f"   ✅ {strategy_name} found {len(docs)} docs")
+        all_docs.extend(docs)
 
     return _deduplicate_documents(all_docs)
 
 
-def get_multi_domain_faculty_info(query: str, faculty_name: str) -> List[Document]:
+def get_multi_domain_faculty_info(
+    query: str,
+    faculty_name: str,
+    deadline_seconds: Optional[float] = FANOUT_DEADLINE_SECONDS,
+    enough_results: Optional[int] = None,
+    context=None,
+) -> List[Document]:
     """
     NEW: Search across multiple domains for comprehensive faculty information
-    Similar to get_comprehensive_director_info but for any faculty member
+    Similar to get_comprehensive_director_info but for any faculty member.
+    The per-domain searches run concurrently (see core.fanout).
 
     Args:
         query (str): User's query
         faculty_name (str): Name of faculty member to search for
+        deadline_seconds (Optional[float]): Global time budget for all domains
+        enough_results (Optional[int]): Stop waiting once this many documents
+            have been found
+        context (RequestContext): Optional request context for keyword
+            matches and embeddings
 
     Returns:
         List[Document]: Combined documents from multiple domains
@@ -292,7 +402,10 @@ def get_multi_domain_faculty_info(query: str, faculty_name: str) -> List[Documen
     print(f"🔍 Multi-domain search for: {faculty_name}")
 
     all_docs = []
-    query_lower = query.lower()
+    if context is not None and context.effective_query == query:
+        matches = context.effective_matches
+    else:
+        matches = match_patterns(query.lower())
 
     # Determine which domains to search based on query keywords
     search_domains = {}
@@ -305,16 +418,7 @@ def get_multi_domain_faculty_info(query: str, faculty_name: str) -> List[Documen
     }
 
     # Search publications if query mentions publications/papers
-    if any(
-        word in query_lower
-        for word in [
-            "publications",
-            "papers",
-            "articles",
-            "research papers",
-            "published",
-        ]
-    ):
+    if matches.has("multi_domain:publications"):
         search_domains["publications"] = {
             "priority": 2,
             "max_docs": 3,
@@ -322,10 +426,7 @@ def get_multi_domain_faculty_info(query: str, faculty_name: str) -> List[Documen
         }
 
     # Search research if query mentions research/interests
-    if any(
-        word in query_lower
-        for word in ["research", "interests", "working on", "projects", "focus"]
-    ):
+    if matches.has("multi_domain:research"):
         search_domains["research"] = {
             "priority": 2,
             "max_docs": 2,
@@ -333,7 +434,7 @@ def get_multi_domain_faculty_info(query: str, faculty_name: str) -> List[Documen
         }
 
     # Search labs if query mentions lab/team
-    if any(word in query_lower for word in ["lab", "laboratory", "team", "group"]):
+    if matches.has("multi_domain:labs"):
         search_domains["labs"] = {
             "priority": 2,
             "max_docs": 2,
@@ -341,17 +442,7 @@ def get_multi_domain_faculty_info(query: str, faculty_name: str) -> List[Documen
         }
 
     # Search staff if query mentions contact info
-    if any(
-        word in query_lower
-        for word in [
-            "email",
-            "phone",
-            "contact",
-            "extension",
-            "education",
-            "background",
-        ]
-    ):
+    if matches.has("multi_domain:staff"):
         search_domains["staff"] = {
             "priority": 2,
             "max_docs": 1,
@@ -360,48 +451,45 @@ def get_multi_domain_faculty_info(query: str, faculty_name: str) -> List[Documen
 
     print(f"🎯 Will search domains: {list(search_domains.keys())}")
 
-    # Search each domain
-    for domain_name, config in search_domains.items():
-        try:
-            collection_path = os.path.join(VECTOR_DB_DIR, domain_name)
-            if not os.path.exists(collection_path):
-                print(f"   ⚠️ Domain {domain_name} not found, skipping...")
-                continue
-
-            vectorstore = Chroma(
-                collection_name=domain_name,
-                embedding_function=embedding_model,
-                persist_directory=collection_path,
-            )
-
-            print(f"📂 Searching {domain_name} domain...")
-
-            # Use STRICT metadata filtering for multi-domain search
-            try:
-                domain_docs = vectorstore.similarity_search(
-                    query,
-                    k=config["max_docs"],
-                    filter={"faculty_name": faculty_name},  # EXACT match
-                )
-
-                if domain_docs:
-                    print(f"   ✅ Found {len(domain_docs)} docs in {domain_name}")
-                    # Add domain info to metadata for better tracking
-                    for doc in domain_docs:
-                        doc.metadata["search_domain"] = domain_name
-                        doc.metadata["priority"] = config["priority"]
-
-                    all_docs.extend(domain_docs)
-                else:
-                    print(f"   ⚠️ No docs found in {domain_name} for {faculty_name}")
-
-            except Exception as e:
-                print(f"   ❌ Error searching {domain_name}: {e}")
-                continue
+    def search_domain(domain_name: str, config: dict) -> List[Document]:
+        vectorstore = get_vectorstore(domain_name)
+        if vectorstore is None:
+            print(f"   ⚠️ Domain {domain_name} not found, skipping...")
+            return []
+
+        print(f"📂 Searching {domain_name} domain...")
+
+        # Use STRICT metadata filtering for multi-domain search
+        domain_docs = vector_search(
+            vectorstore,
+            query,
+            k=config["max_docs"],
+            filter={"faculty_name": faculty_name},  # EXACT match
+            context=context,
+        )
 
-        except Exception as e:
-            print(f"   ❌ Error accessing {domain_name}: {e}")
-            continue
+        if domain_docs:
+            print(f"   ✅ Found {len(domain_docs)} docs in {domain_name}")
+            # Add domain info to metadata for better tracking
+            for doc in domain_docs:
+                doc.metadata["search_domain"] = domain_name
+                doc.metadata["priority"] = config["priority"]
+        else:
+            print(f"   ⚠️ No docs found in {domain_name} for {faculty_name}")
+
+        return domain_docs
+
+    # Search all domains concurrently, then merge in the original domain order
+    domain_results = run_fanout(
+        {
+            domain_name: partial(search_domain, domain_name, config)
+            for domain_name, config in search_domains.items()
+        },
+        deadline_seconds=deadline_seconds,
+        enough_results=enough_results,
+    )
+    for domain_name in search_domains:
+        all_docs.extend(domain_results.get(domain_name, []))
 
     # Remove duplicates and prioritize
     unique_docs = _deduplicate_documents(all_docs)
@@ -467,13 +555,21 @@ def _prioritize_faculty_documents(
     return prioritized
 
 
-def get_comprehensive_director_info(query: str) -> List[Document]:
+def get_comprehensive_director_info(
+    query: str,
+    deadline_seconds: Optional[float] = FANOUT_DEADLINE_SECONDS,
+    enough_results: Optional[int] = None,
+) -> List[Document]:
     """
     Gather comprehensive director information from multiple collections/sources.
     NOW USES UNIFIED SEARCH FUNCTION to reduce code duplication.
+    The per-collection searches run concurrently (see core.fanout).
 
     Args:
         query (str): User query about the director
+        deadline_seconds (Optional[float]): Global time budget for all collections
+        enough_results (Optional[int]): Stop waiting once this many documents
+            have been found
 
     Returns:
         List[Document]: Comprehensive set of documents about the director
@@ -490,40 +586,38 @@ def get_comprehensive_director_info(query: str) -> List[Document]:
     # Define collections to search
     collections = ["nii_info", "faculty_info", "research", "publications"]
 
-    for collection_name in collections:
-        try:
-            collection_path = os.path.join(VECTOR_DB_DIR, collection_name)
-            vectorstore = Chroma(
-                collection_name=collection_name,
-                embedding_function=embedding_model,
-                persist_directory=collection_path,
-            )
+    def search_collection(collection_name: str) -> List[Document]:
+        vectorstore = get_vectorstore(collection_name)
+        if vectorstore is None:
+            return []
+
+        print(f"📂 Searching {collection_name} collection...")
+
+        # Define search strategies for this collection
+        if collection_name == "nii_info":
+            strategies = {
+                "metadata_filter": [{"faculty_name": director_name}],
+                "content_search": [
+                    "directors page",
+                    "appointed as director",
+                    "director of the institute",
+                    "Debasisa Mohanty director",
+                ],
+            }
+        else:
+            strategies = {"metadata_filter": [{"faculty_name": director_name}]}
 
-            print(f"📂 Searching {collection_name} collection...")
-
-            # Define search strategies for this collection
-            if collection_name == "nii_info":
-                strategies = {
-                    "metadata_filter": [{"faculty_name": director_name}],
-                    "content_search": [
-                        "directors page",
-                        "appointed as director",
-                        "director of the institute",
-                        "Debasisa Mohanty director",
-                    ],
-                }
-            else:
-                strategies = {"metadata_filter": [{"faculty_name": director_name}]}
-
-            # Use unified search function
-            collection_docs = optimize_vectorstore_search(
-                vectorstore, query, 3, strategies
-            )
-            all_docs.extend(collection_docs)
+        # Use unified search function
+        return optimize_vectorstore_search(vectorstore, query, 3, strategies)
 
-        except Exception as e:
-            print(f"❌ Error accessing {collection_name}: {e}")
-            continue
+    # Search all collections concurrently, then merge in the original order
+    collection_results = run_fanout(
+        {name: partial(search_collection, name) for name in collections},
+        deadline_seconds=deadline_seconds,
+        enough_results=enough_results,
+    )
+    for collection_name in collections:
+        all_docs.extend(collection_results.get(collection_name, []))
 
     # Process and prioritize results
     unique_docs = _deduplicate_documents(all_docs)
@@ -536,7 +630,7 @@ def get_comprehensive_director_info(query: str) -> List[Document]:
 
 
 def handle_multiple_candidates(
-    candidates: List[str], query: str, domain: str
+    candidates: List[str], query: str, domain: str, context=None
 ) -> List[Document]:
     """
     Handle queries that match multiple faculty members by searching for all of them.
@@ -545,6 +639,7 @@ def handle_multiple_candidates(
         candidates (List[str]): List of faculty names to search for
         query (str): Original user query
         domain (str): Domain/collection to search in
+        context (RequestContext): Optional request context for embeddings
 
     Returns:
         List[Document]: Combined documents from all candidates
@@ -558,18 +653,19 @@ def handle_multiple_candidates(
     all_docs = []
 
     try:
-        collection_path = os.path.join(VECTOR_DB_DIR, domain)
-        vectorstore = Chroma(
-            collection_name=domain,
-            embedding_function=embedding_model,
-            persist_directory=collection_path,
-        )
+        vectorstore = get_vectorstore(domain)
+        if vectorstore is None:
+            return all_docs
 
         # Search for each candidate individually
         for candidate in candidates:
             try:
-                docs = vectorstore.similarity_search(
-                    query, k=2, filter={"faculty_name": candidate}
+                docs = vector_search(
+                    vectorstore,
+                    query,
+                    k=2,
+                    filter={"faculty_name": candidate},
+                    context=context,
                 )
                 if docs:
                     print(f"   ✅ Found {len(docs)} docs for {candidate}")
@@ -0,0 +1,108 @@
+"""SimHash Fingerprints for Near-duplicate Document Detection.
+
+Chunks indexed into several collections, or re-scraped with small edits,
+reach the prompt as near-identical copies with different hashes. A 64-bit
+SimHash of each document's word shingles maps similar texts to fingerprints
+that differ in only a few bits.
+
+Lookup is linear in the number of documents: the fingerprint is cut into
+bands, and only documents sharing at least one band value are compared. With
+more bands than the allowed bit distance, any two fingerprints within that
+distance must agree on at least one band (pigeonhole principle).
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+_FINGERPRINT_BITS = 64
+_WORD = re.compile(r"\w+")
+
+
+def _feature_hash(feature: str) -> int:
+    """Stable 64-bit hash of a shingle (Python's hash() is salted per process)."""
+    return int.from_bytes(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+@lru_cache(maxsize=4096)
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    Compute the 64-bit SimHash of a text over lowercase word shingles.
+
+    Cached, since the same chunks are retrieved again and again.
+
+    Args:
+        text (str): Document text
+        shingle_size (int): Words per shingle
+
+    Returns:
+        int: Fingerprint (0 for empty text)
+    """
+    words = _WORD.findall(text.lower())
+    if not words:
+        return 0
+    shingles = [
+        " ".join(words[start : start + shingle_size])
+        for start in range(max(1, len(words) - shingle_size + 1))
+    ]
+
+    # One row of 64 bits per shingle; a bit is set where most shingles agree
+    features = np.array([_feature_hash(shingle) for shingle in shingles], dtype=">u8")
+    bits = np.unpackbits(features.view(np.uint8)).reshape(
+        len(shingles), _FINGERPRINT_BITS
+    )
+    majority = bits.sum(axis=0) * 2 > len(shingles)
+    return int.from_bytes(np.packbits(majority).tobytes(), "big")
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin(first ^ second).count("1")
+
+
+class SimHashIndex:
+    """Banded index answering "is there a fingerprint within k bits?"."""
+
+    def __init__(self, max_distance: int = 3):
+        """Create an empty index.
+
+        Args:
+            max_distance (int): Largest Hamming distance counted as a near
+                duplicate; the fingerprint is split into max_distance + 1 bands
+        """
+        self.max_distance = max_distance
+        self._bands = max_distance + 1
+        self._band_bits = _FINGERPRINT_BITS // self._bands
+        self._buckets: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+
+    def _band_keys(self, fingerprint: int) -> List[Tuple[int, int]]:
+        mask = (1 << self._band_bits) - 1
+        return [
+            (band, fingerprint >> (band * self._band_bits) & mask)
+            for band in range(self._bands)
+        ]
+
+    def find(self, fingerprint: int) -> Optional[int]:
+        """Return the id of an indexed near duplicate, or None.
+
+        Args:
+            fingerprint (int): SimHash to look up
+
+        Returns:
+            Optional[int]: Id passed to add() for the first match found
+        """
+        for key in self._band_keys(fingerprint):
+            for item_id, candidate in self._buckets.get(key, ()):
+                if hamming_distance(fingerprint, candidate) <= self.max_distance:
+                    return item_id
+        return None
+
+    def add(self, item_id: int, fingerprint: int):
+        """Index a fingerprint under an id."""
+        for key in self._band_keys(fingerprint):
+            self._buckets.setdefault(key, []).append((item_id, fingerprint))
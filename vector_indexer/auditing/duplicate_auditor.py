@@ -1,68 +1,410 @@
 """Duplicate detection and auditing functionality."""
 
+import os
+import json
+import time
+import sqlite3
 import logging
-from collections import defaultdict
-from typing import Dict, List
-from core.vectorstore import VectorStoreManager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from config.settings import VECTOR_DB_DIR, AUDIT_NEAR_DUPLICATE_DISTANCE
+from utils.hash_utils import content_hash, simhash, hamming_distance
+
+_CHROMA_DB_FILENAME = "chroma.sqlite3"
+_FINGERPRINT_BITS = 64
+
+# Segments of a collection (METADATA holds the chunks, VECTOR names the HNSW dir)
+_SEGMENTS_SQL = """
+    SELECT s.id, s.scope FROM store.segments s
+    JOIN store.collections c ON c.id = s.collection
+    WHERE c.name = ?
+"""
+
+_CHUNK_COUNT_SQL = "SELECT COUNT(*) FROM store.embeddings WHERE segment_id = ?"
+
+_HASH_COUNTS_SQL = """
+    INSERT INTO temp.hash_counts (collection, doc_hash, chunks)
+    SELECT ?, m.string_value, COUNT(*) FROM store.embeddings e
+    JOIN store.embedding_metadata m ON m.id = e.id AND m.key = 'doc_hash'
+    WHERE e.segment_id = ?
+    GROUP BY m.string_value
+"""
+
+_DOCUMENTS_SQL = """
+    SELECT e.embedding_id, h.string_value, d.string_value FROM store.embeddings e
+    JOIN store.embedding_metadata d ON d.id = e.id AND d.key = 'chroma:document'
+    LEFT JOIN store.embedding_metadata h ON h.id = e.id AND h.key = 'doc_hash'
+    WHERE e.segment_id = ?
+"""
+
+# Embeddings whose segment belongs to no collection (e.g. left by a deleted one)
+_UNOWNED_SQL = """
+    SELECT embedding_id FROM store.embeddings WHERE segment_id NOT IN (
+        SELECT s.id FROM store.segments s
+        JOIN store.collections c ON c.id = s.collection
+    )
+"""
+
+_WITHOUT_DOCUMENT_SQL = """
+    SELECT e.embedding_id FROM store.embeddings e
+    WHERE e.segment_id = ? AND NOT EXISTS (
+        SELECT 1 FROM store.embedding_metadata m
+        WHERE m.id = e.id AND m.key = 'chroma:document'
+    )
+"""
+
+_WITHOUT_DOC_HASH_SQL = """
+    SELECT COUNT(*) FROM store.embeddings e
+    WHERE e.segment_id = ? AND NOT EXISTS (
+        SELECT 1 FROM store.embedding_metadata m
+        WHERE m.id = e.id AND m.key = 'doc_hash'
+    )
+"""
+
+_DANGLING_METADATA_SQL = """
+    SELECT COUNT(DISTINCT id) FROM store.embedding_metadata
+    WHERE id NOT IN (SELECT id FROM store.embeddings)
+"""
+
+_VECTOR_SEGMENTS_SQL = "SELECT id FROM store.segments WHERE scope = 'VECTOR'"
+
+_CROSS_COLLECTION_SQL = """
+    SELECT doc_hash, collection, chunks FROM temp.hash_counts
+    WHERE doc_hash IN (
+        SELECT doc_hash FROM temp.hash_counts
+        GROUP BY doc_hash HAVING COUNT(*) > 1
+    )
+    ORDER BY doc_hash, collection
+"""
+
+# (collection, chunk ID) of every chunk sharing a doc_hash
+ChunkLocations = Dict[str, List[Tuple[str, str]]]
+
+
+def _unreferenced_segment_dirs(
+    store_dir: str, conn: Optional[sqlite3.Connection]
+) -> List[str]:
+    """HNSW segment directories that no segment of the store points to."""
+    referenced = set()
+    if conn is not None:
+        referenced = {row[0] for row in conn.execute(_VECTOR_SEGMENTS_SQL)}
+    return sorted(
+        name
+        for name in os.listdir(store_dir)
+        if os.path.isdir(os.path.join(store_dir, name)) and name not in referenced
+    )
+
+
+def _audit_store(
+    conn: sqlite3.Connection,
+    collection_name: str,
+    texts: Dict[str, str],
+    locations: ChunkLocations,
+) -> Dict:
+    """
+    Audit one collection's store, attached to conn as "store".
+
+    Hash counts are added to temp.hash_counts; document texts and chunk
+    locations are collected for near-duplicate detection.
+
+    Args:
+        conn: Audit connection with the store attached
+        collection_name: Name of the collection
+        texts: doc_hash → text, filled in
+        locations: doc_hash → (collection, chunk ID) pairs, filled in
+
+    Returns:
+        Chunk count and orphans of the collection
+    """
+    segments = {
+        scope: segment_id
+        for segment_id, scope in conn.execute(_SEGMENTS_SQL, (collection_name,))
+    }
+    orphans = {
+        "unowned_embeddings": [row[0] for row in conn.execute(_UNOWNED_SQL)],
+        "dangling_metadata_rows": conn.execute(_DANGLING_METADATA_SQL).fetchone()[0],
+    }
+
+    segment_id = segments.get("METADATA")
+    if segment_id is None:
+        return {"chunks": 0, "missing_collection": True, "orphans": orphans}
+
+    conn.execute(_HASH_COUNTS_SQL, (collection_name, segment_id))
+    for chunk_id, doc_hash, text in conn.execute(_DOCUMENTS_SQL, (segment_id,)):
+        doc_hash = doc_hash or content_hash(text)
+        texts.setdefault(doc_hash, text)
+        locations.setdefault(doc_hash, []).append((collection_name, chunk_id))
+
+    orphans["without_document"] = [
+        row[0] for row in conn.execute(_WITHOUT_DOCUMENT_SQL, (segment_id,))
+    ]
+    orphans["without_doc_hash"] = conn.execute(
+        _WITHOUT_DOC_HASH_SQL, (segment_id,)
+    ).fetchone()[0]
+    return {
+        "chunks": conn.execute(_CHUNK_COUNT_SQL, (segment_id,)).fetchone()[0],
+        "orphans": orphans,
+    }
+
+
+def _near_duplicate_clusters(
+    texts: Dict[str, str], max_distance: int
+) -> List[List[str]]:
+    """
+    Group texts whose SimHash fingerprints are within max_distance bits.
+
+    The fingerprint is cut into max_distance + 1 bands; two fingerprints
+    within the distance agree on at least one band, so only texts sharing
+    a band value are compared.
+
+    Args:
+        texts: doc_hash → text
+        max_distance: Largest Hamming distance counted as a near duplicate
+
+    Returns:
+        Clusters of two or more doc_hashes, sorted
+    """
+    bands = max_distance + 1
+    band_bits = _FINGERPRINT_BITS // bands
+    mask = (1 << band_bits) - 1
+
+    parent = {doc_hash: doc_hash for doc_hash in texts}
+
+    def find(doc_hash: str) -> str:
+        while parent[doc_hash] != doc_hash:
+            parent[doc_hash] = parent[parent[doc_hash]]
+            doc_hash = parent[doc_hash]
+        return doc_hash
+
+    buckets: Dict[Tuple[int, int], List[Tuple[str, int]]] = {}
+    for doc_hash, text in texts.items():
+        fingerprint = simhash(text)
+        if not fingerprint:
+            continue
+        for band in range(bands):
+            key = (band, fingerprint >> (band * band_bits) & mask)
+            for other_hash, other in buckets.get(key, ()):
+                if hamming_distance(fingerprint, other) <= max_distance:
+                    parent[find(doc_hash)] = find(other_hash)
+            buckets.setdefault(key, []).append((doc_hash, fingerprint))
+
+    clusters: Dict[str, List[str]] = {}
+    for doc_hash in texts:
+        clusters.setdefault(find(doc_hash), []).append(doc_hash)
+    return sorted(sorted(members) for members in clusters.values() if len(members) > 1)
 
 
 class DuplicateAuditor:
     """Handles duplicate detection and auditing in vector collections."""
 
     @staticmethod
-    def audit_collection(collection_name: str) -> Dict[str, int]:
+    def build_report(
+        collection_names: List[str],
+        max_distance: int = AUDIT_NEAR_DUPLICATE_DISTANCE,
+    ) -> Dict:
         """
-        Audit a single collection for duplicates.
+        Audit collections with read-only SQL against their chroma.sqlite3.
+
+        Neither Chroma nor the embedding model is loaded. Each store is
+        attached read-only in turn; per-hash counts are aggregated in a
+        temporary table, so duplicates within and across collections come
+        from GROUP BY queries.
 
         Args:
-            collection_name: Name of collection to audit
+            collection_names: Names of collections to audit
+            max_distance: Largest SimHash distance counted as a near duplicate
 
         Returns:
-            Dictionary of duplicate hashes and their counts
+            JSON-serializable report with per-collection chunk counts,
+            duplicates and orphans, cross-collection duplicates and
+            near-duplicate clusters
         """
-        logging.info(f"🔍 Auditing collection: {collection_name}")
-
-        manager = VectorStoreManager(collection_name)
-        hash_count = defaultdict(int)
+        start_time = time.perf_counter()
+        collections = {}
+        texts: Dict[str, str] = {}
+        locations: ChunkLocations = {}
 
+        # Autocommit: a store cannot be detached while a transaction is open
+        conn = sqlite3.connect("file::memory:", uri=True, isolation_level=None)
         try:
-            results = manager.vectorstore.get(include=["metadatas"])
-            for metadata in results["metadatas"]:
-                if isinstance(metadata, dict) and "doc_hash" in metadata:
-                    hash_count[metadata["doc_hash"]] += 1
-        except Exception as e:
-            logging.error(f"Failed to read metadata from {collection_name}: {e}")
-            return {}
+            conn.execute(
+                "CREATE TEMP TABLE hash_counts "
+                "(collection TEXT, doc_hash TEXT, chunks INTEGER)"
+            )
+
+            for collection_name in collection_names:
+                store_dir = os.path.join(VECTOR_DB_DIR, collection_name)
+                db_path = os.path.join(store_dir, _CHROMA_DB_FILENAME)
+                if not os.path.exists(db_path):
+                    collections[collection_name] = {"chunks": 0, "missing_store": True}
+                    if os.path.isdir(store_dir):
+                        collections[collection_name]["orphans"] = {
+                            "unreferenced_segment_dirs": _unreferenced_segment_dirs(
+                                store_dir, None
+                            )
+                        }
+                    continue
+
+                conn.execute(
+                    "ATTACH DATABASE ? AS store",
+                    (Path(db_path).resolve().as_uri() + "?mode=ro",),
+                )
+                try:
+                    result = _audit_store(conn, collection_name, texts, locations)
+                    result["orphans"]["unreferenced_segment_dirs"] = (
+                        _unreferenced_segment_dirs(store_dir, conn)
+                    )
+                    collections[collection_name] = result
+                except sqlite3.Error as e:
+                    logging.error(f"Failed to audit {collection_name}: {e}")
+                    collections[collection_name] = {"error": str(e)}
+                    conn.execute(
+                        "DELETE FROM temp.hash_counts WHERE collection = ?",
+                        (collection_name,),
+                    )
+                finally:
+                    conn.execute("DETACH DATABASE store")
+
+            for collection_name, doc_hash, chunks in conn.execute(
+                "SELECT collection, doc_hash, chunks FROM temp.hash_counts "
+                "WHERE chunks > 1 ORDER BY collection, doc_hash"
+            ):
+                collections[collection_name].setdefault("duplicates", {})[
+                    doc_hash
+                ] = chunks
+            for result in collections.values():
+                if "chunks" in result:
+                    result.setdefault("duplicates", {})
+
+            cross_collection: Dict[str, Dict[str, int]] = {}
+            for doc_hash, collection_name, chunks in conn.execute(
+                _CROSS_COLLECTION_SQL
+            ):
+                cross_collection.setdefault(doc_hash, {})[collection_name] = chunks
+        finally:
+            conn.close()
+
+        clusters = [
+            [
+                {"collection": collection_name, "id": chunk_id, "doc_hash": doc_hash}
+                for doc_hash in members
+                for collection_name, chunk_id in locations[doc_hash]
+            ]
+            for members in _near_duplicate_clusters(texts, max_distance)
+        ]
+
+        return {
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "elapsed_seconds": round(time.perf_counter() - start_time, 3),
+            "collections": collections,
+            "cross_collection_duplicates": [
+                {"doc_hash": doc_hash, "collections": counts}
+                for doc_hash, counts in cross_collection.items()
+            ],
+            "near_duplicate_clusters": clusters,
+        }
+
+    @staticmethod
+    def log_report(report: Dict):
+        """
+        Log an audit report.
 
-        duplicates = {h: c for h, c in hash_count.items() if c > 1}
+        Args:
+            report: Report returned by build_report
+        """
+        for collection_name, result in report["collections"].items():
+            if "error" in result:
+                continue
+            if result.get("missing_store") or result.get("missing_collection"):
+                logging.warning(f"⚠️ No vector store found for {collection_name}")
+
+            duplicates = result.get("duplicates", {})
+            if duplicates:
+                logging.warning(
+                    f"⚠️ Found {len(duplicates)} duplicate hashes in {collection_name}!"
+                )
+                for h, c in duplicates.items():
+                    logging.warning(f"  - {h} → {c} occurrences")
+            elif result["chunks"]:
+                logging.info(f"✅ No duplicates found in {collection_name}.")
 
-        if duplicates:
+            for kind, orphans in result.get("orphans", {}).items():
+                count = orphans if isinstance(orphans, int) else len(orphans)
+                if count:
+                    logging.warning(
+                        f"⚠️ {collection_name}: {count} orphaned "
+                        f"({kind.replace('_', ' ')})"
+                    )
+
+        for entry in report["cross_collection_duplicates"]:
+            logging.warning(
+                f"⚠️ Hash {entry['doc_hash']} stored in several collections: "
+                + ", ".join(f"{c} ×{n}" for c, n in entry["collections"].items())
+            )
+        for cluster in report["near_duplicate_clusters"]:
             logging.warning(
-                f"⚠️ Found {len(duplicates)} duplicate hashes in {collection_name}!"
+                f"⚠️ Near-duplicate cluster of {len(cluster)} chunks: "
+                + ", ".join(sorted({member["collection"] for member in cluster}))
             )
-            for h, c in duplicates.items():
-                logging.warning(f"  - {h} → {c} occurrences")
-        else:
-            logging.info(f"✅ No duplicates found in {collection_name}.")
+        logging.info(
+            f"🔍 Audited {len(report['collections'])} collections in "
+            f"{report['elapsed_seconds']:.3f}s"
+        )
+
+    @staticmethod
+    def write_report(report: Dict, json_path: str):
+        """
+        Write an audit report as JSON.
+
+        Args:
+            report: Report returned by build_report
+            json_path: Output file path
+        """
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logging.info(f"📝 Audit report written to {json_path}")
+
+    @staticmethod
+    def audit_collection(
+        collection_name: str, json_path: Optional[str] = None
+    ) -> Dict[str, int]:
+        """
+        Audit a single collection for duplicates.
 
-        return duplicates
+        Args:
+            collection_name: Name of collection to audit
+            json_path: Also write the full report as JSON to this path
+
+        Returns:
+            Dictionary of duplicate hashes and their counts
+        """
+        logging.info(f"🔍 Auditing collection: {collection_name}")
+        return DuplicateAuditor.audit_all_collections([collection_name], json_path).get(
+            collection_name, {}
+        )
 
     @staticmethod
-    def audit_all_collections(collection_names: List[str]) -> Dict[str, Dict[str, int]]:
+    def audit_all_collections(
+        collection_names: List[str], json_path: Optional[str] = None
+    ) -> Dict[str, Dict[str, int]]:
         """
         Audit all collections for duplicates.
 
         Args:
             collection_names: List of collection names to audit
+            json_path: Also write the full report as JSON to this path
 
         Returns:
             Dictionary mapping collection names to their duplicate reports
         """
-        all_duplicates = {}
-
-        for collection_name in collection_names:
-            duplicates = DuplicateAuditor.audit_collection(collection_name)
-            if duplicates:
-                all_duplicates[collection_name] = duplicates
+        report = DuplicateAuditor.build_report(collection_names)
+        DuplicateAuditor.log_report(report)
+        if json_path:
+            DuplicateAuditor.write_report(report, json_path)
 
-        return all_duplicates
+        return {
+            collection_name: result["duplicates"]
+            for collection_name, result in report["collections"].items()
+            if result.get("duplicates")
+        }
@@ -7,7 +7,11 @@ from langchain_core.documents import Document
 
 class BaseChunker(ABC):
     """Abstract base class for document chunkers."""
-    
+
+    # Bump in a subclass whenever its output changes, so the indexer
+    # re-chunks files it already indexed with the previous version
+    version = 1
+
     @abstractmethod
     def chunk_data(self, data: Dict[str, Any], source_file: str) -> List[Document]:
         """
@@ -21,7 +25,7 @@ class BaseChunker(ABC):
             List of chunked documents
         """
         pass
-    
+
     def create_base_metadata(self, source_file: str, category: str, **kwargs) -> Dict[str, Any]:
         """
         Create base metadata common to all documents.
@@ -39,4 +43,4 @@ class BaseChunker(ABC):
             "category": category,
         }
         metadata.update(kwargs)
-        return metadata
\ No newline at end of file
+        return metadata
@@ -16,6 +16,8 @@ class MarkdownStaffChunker(BaseChunker):
     a separate searchable document with comprehensive metadata and search terms.
     """
 
+    version = 2  # Search terms listed in a stable order
+
     def __init__(self):
         super().__init__()
         # Staff categorization mapping for role-based classification
@@ -270,7 +272,9 @@ class MarkdownStaffChunker(BaseChunker):
 
         # Assemble final document content with search optimization
         main_content = "\n".join(content_parts)
-        search_content = f"\n\n**Search Terms:** {', '.join(set(search_terms))}"
+        search_content = (
+            f"\n\n**Search Terms:** {', '.join(dict.fromkeys(search_terms))}"
+        )
         full_content = (
             f"# Staff Profile: {staff_name}\n\n{main_content}{search_content}"
         )
@@ -286,7 +290,7 @@ class MarkdownStaffChunker(BaseChunker):
                 "email": staff["email"],
                 "extension": staff["extension"],
                 "is_faculty": staff["is_faculty"],
-                "search_terms": ", ".join(set(search_terms)),
+                "search_terms": ", ".join(dict.fromkeys(search_terms)),
             }
         )
 
@@ -25,3 +25,29 @@ EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
 # Logging configuration
 LOG_LEVEL = "INFO"
 LOG_FORMAT = "%(levelname)s: %(message)s"
+
+# Embedding throughput
+EMBEDDING_BATCH_SIZE = int(
+    os.getenv("EMBEDDING_BATCH_SIZE", "64")
+)  # Texts per forward pass
+EMBEDDING_PROCESSES = int(
+    os.getenv("EMBEDDING_PROCESSES", "1")
+)  # >1 encodes on a CPU pool
+INDEX_WRITE_BATCH_SIZE = 1024  # Chunks embedded and written to Chroma per round
+
+# Incremental indexing (both files live next to each collection's chroma.sqlite3)
+MANIFEST_FILENAME = "index_manifest.json"  # Per-file size, mtime, digest, chunker
+HASH_INDEX_FILENAME = "chunk_index.sqlite3"  # Sidecar index of chunk IDs and hashes
+# Rewritten only when a run changes the collection; niibot versions its
+# chains and cached answers by it (keep in sync with niibot's settings)
+INDEX_VERSION_FILENAME = "index_version"
+
+# Embedding cache (content hash + model name → vector), shared by all collections
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "1") == "1"
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "../.embedding_cache")
+
+# Streaming indexing pipeline
+PIPELINE_QUEUE_SIZE = 8  # Chunked files buffered between parsing and embedding
+
+# Duplicate audit (read-only queries against each collection's chroma.sqlite3)
+AUDIT_NEAR_DUPLICATE_DISTANCE = 3  # Max differing SimHash bits for a near duplicate
@@ -3,7 +3,7 @@
 import os
 import json
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from langchain_core.documents import Document
 
 # Import ALL your existing chunkers
@@ -15,8 +15,9 @@ from chunkers.staff_chunker import MarkdownStaffChunker
 from chunkers.generic_chunker import GenericChunker
 
 from utils.content_utils import flatten_content
-from utils.metadata_utils import flatten_metadata
-from utils.hash_utils import content_hash
+from utils.metadata_utils import flatten_metadata, logical_key
+from utils.hash_utils import content_hash, chunk_id
+from core.manifest import IndexManifest, source_path
 
 
 class DocumentLoader:
@@ -38,8 +39,28 @@ class DocumentLoader:
         # FALLBACK CHUNKER for collections without specific chunkers
         self.generic_chunker = GenericChunker()
 
+    def chunker_version(self, collection_name: str) -> str:
+        """
+        Version string of the chunker(s) that may process a collection's files.
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            "Class:version" of the registered chunker, or of every chunker
+            auto-detection may pick for unregistered collections
+        """
+        if collection_name in self.chunkers:
+            chunkers = [self.chunkers[collection_name]]
+        else:
+            chunkers = [*self.chunkers.values(), self.generic_chunker]
+        return "+".join(sorted({f"{type(c).__name__}:{c.version}" for c in chunkers}))
+
     def load_documents_from_folder(
-        self, folder_path: str, collection_name: str
+        self,
+        folder_path: str,
+        collection_name: str,
+        manifest: Optional[IndexManifest] = None,
     ) -> List[Document]:
         """
         Load and process all JSON and MD documents from a folder.
@@ -47,37 +68,127 @@ class DocumentLoader:
         Args:
             folder_path: Path to folder containing JSON/MD files
             collection_name: Name of the collection for chunker selection
+            manifest: If given, files unchanged since the last run are skipped
 
         Returns:
             List of processed documents
         """
         documents = []
+        for _, docs in self.iter_documents_from_folder(
+            folder_path, collection_name, manifest
+        ):
+            documents.extend(docs or [])
+        return documents
+
+    def iter_documents_from_folder(
+        self,
+        folder_path: str,
+        collection_name: str,
+        manifest: Optional[IndexManifest] = None,
+    ) -> Iterator[Tuple[str, List[Document]]]:
+        """
+        Lazily load and process JSON and MD documents, one file at a time.
+
+        Args:
+            folder_path: Path to folder containing JSON/MD files
+            collection_name: Name of the collection for chunker selection
+            manifest: If given, files unchanged since the last run are skipped
+
+        Yields:
+            (source path relative to the collections root, chunks of that
+            file); chunks are None when the file failed to load, so its
+            stored chunks are kept rather than treated as stale
+        """
+        skipped_files = 0
+        chunker_version = self.chunker_version(collection_name)
 
-        for root, _, files in os.walk(folder_path):
+        def on_walk_error(error: OSError):
+            logging.error(f"❌ Cannot read folder {error.filename}: {error}")
+            if manifest is not None:
+                manifest.mark_unavailable(error.filename)
+
+        for root, _, files in os.walk(folder_path, onerror=on_walk_error):
             for file in files:
                 file_path = os.path.join(root, file)
 
+                if not file.endswith((".json", ".md")):
+                    continue
+                if manifest is not None and not manifest.has_changed(
+                    file_path, chunker_version
+                ):
+                    skipped_files += 1
+                    continue
+
                 # ✅ HANDLE BOTH JSON AND MARKDOWN FILES
                 if file.endswith(".json"):
                     docs = self._process_json_file(
                         file_path, file, collection_name, root
                     )
-                    documents.extend(docs)
-                    logging.info(f"📄 Processed {len(docs)} JSON documents from {file}")
+                    file_type = "JSON"
 
-                elif file.endswith(".md"):  # Add markdown support
+                else:  # Add markdown support
                     docs = self._process_markdown_file(
                         file_path, file, collection_name, root
                     )
-                    documents.extend(docs)
-                    logging.info(f"📄 Processed {len(docs)} MD documents from {file}")
+                    file_type = "MD"
 
-        return documents
+                if docs is None:
+                    if manifest is not None:
+                        manifest.discard(file_path)
+                    yield source_path(file_path), None
+                    continue
+
+                logging.info(
+                    f"📄 Processed {len(docs)} {file_type} documents from {file}"
+                )
+                yield source_path(file_path), self._assign_chunk_ids(docs, file_path)
+
+        if skipped_files:
+            logging.info(f"⏩ Skipped {skipped_files} unchanged files in {folder_path}")
+
+    def _assign_chunk_ids(self, docs: List[Document], file_path: str) -> List[Document]:
+        """
+        Give each chunk of a file a stable ID and drop repeated chunks.
+
+        IDs derive from the file's relative path and each chunk's logical
+        key, so re-chunking an edited file maps every chunk onto the same
+        ID as before and the indexer can upsert instead of append.
+
+        Args:
+            docs: Chunks produced from one file, in order
+            file_path: Path of the source file
+
+        Returns:
+            Chunks with ``id`` and ``source_path`` metadata set
+        """
+        path = source_path(file_path)
+        key_counts: Dict[str, int] = {}
+        seen_hashes = set()
+        unique_docs = []
+
+        for doc in docs:
+            doc_hash = doc.metadata.get("doc_hash")
+            if doc_hash in seen_hashes:
+                logging.debug(f"Skipped duplicate chunk in {path}: {doc_hash}")
+                continue
+            seen_hashes.add(doc_hash)
+
+            key = logical_key(doc.metadata)
+            key_counts[key] = key_counts.get(key, 0) + 1
+            if key_counts[key] > 1:
+                # Same key twice in one file: fall back to its occurrence
+                key = f"{key}#{key_counts[key]}"
+
+            doc.id = chunk_id(path, key)
+            doc.metadata["source_path"] = path
+            unique_docs.append(doc)
+
+        return unique_docs
 
     def _process_json_file(
         self, file_path: str, filename: str, collection_name: str, root_dir: str
-    ) -> List[Document]:
-        """Process a single JSON file with proper chunker selection."""
+    ) -> Optional[List[Document]]:
+        """Process a single JSON file with proper chunker selection (None on error)."""
         try:
             with open(file_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
@@ -101,12 +212,12 @@ class DocumentLoader:
 
         except Exception as e:
             logging.error(f"❌ Error processing {file_path}: {e}")
-            return []
+            return None
 
     def _process_markdown_file(
         self, file_path: str, filename: str, collection_name: str, root_dir: str
-    ) -> List[Document]:
-        """Process a single Markdown file."""
+    ) -> Optional[List[Document]]:
+        """Process a single Markdown file (None on error)."""
         try:
             with open(file_path, "r", encoding="utf-8") as f:
                 data = f.read()
@@ -127,7 +238,7 @@ class DocumentLoader:
 
         except Exception as e:
             logging.error(f"❌ Error processing {file_path}: {e}")
-            return []
+            return None
 
     def _detect_chunker_by_path(self, root_dir: str, filename: str):
         """Smart chunker detection based on path and filename."""
@@ -0,0 +1,189 @@
+"""Content-addressed on-disk cache of document embeddings."""
+
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from config.settings import EMBEDDING_CACHE_DIR, EMBEDDING_MODEL_NAME
+
+_KEY_BYTES = 16  # MD5 digest of the text
+
+
+class EmbeddingCache:
+    """
+    Persistent map of (model, text) → embedding vector.
+
+    Each model has its own pair of append-only files: ``<model>.keys`` holds
+    one 16-byte MD5 digest per row and ``<model>.vectors`` the float32 rows,
+    read through a memory map. The key file is loaded into a dict (digest →
+    row) on open, so a lookup never touches the model or scans the vectors.
+    A row only counts once both its vector and its key are on disk; a tail
+    left by an interrupted run is cut off when the cache is opened.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = EMBEDDING_CACHE_DIR,
+        model_name: str = EMBEDDING_MODEL_NAME,
+    ):
+        """
+        Open (or create) the cache of a model.
+
+        Args:
+            cache_dir: Directory holding the cache files
+            model_name: Embedding model the vectors belong to
+        """
+        slug = re.sub(r"[^A-Za-z0-9._-]+", "_", model_name)
+        os.makedirs(cache_dir, exist_ok=True)
+        self.model_name = model_name
+        self.meta_path = os.path.join(cache_dir, f"{slug}.json")
+        self.keys_path = os.path.join(cache_dir, f"{slug}.keys")
+        self.vectors_path = os.path.join(cache_dir, f"{slug}.vectors")
+
+        self.dim: Optional[int] = None
+        self._rows: Dict[bytes, int] = {}
+        self._vectors: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Read the model's dimension and the key index."""
+        if not os.path.exists(self.meta_path):
+            return
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            self.dim = json.load(f)["dim"]
+
+        keys = b""
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, "rb") as f:
+                keys = f.read()
+        vector_rows = 0
+        if os.path.exists(self.vectors_path):
+            vector_rows = os.path.getsize(self.vectors_path) // (self.dim * 4)
+        count = min(len(keys) // _KEY_BYTES, vector_rows)
+
+        # Drop a partially written tail so appended rows stay aligned
+        for path, row_bytes in (
+            (self.keys_path, _KEY_BYTES),
+            (self.vectors_path, self.dim * 4),
+        ):
+            if os.path.exists(path) and os.path.getsize(path) != count * row_bytes:
+                os.truncate(path, count * row_bytes)
+
+        self._rows = {
+            keys[row * _KEY_BYTES : (row + 1) * _KEY_BYTES]: row for row in range(count)
+        }
+        logging.info(f"🗄️ Embedding cache: {count} vectors for {self.model_name}")
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.md5(text.encode("utf-8")).digest()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _vector_view(self) -> np.memmap:
+        """Memory map covering every committed row (caller holds the lock)."""
+        count = len(self._rows)
+        if self._vectors is None or self._vectors.shape[0] < count:
+            self._vectors = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r", shape=(count, self.dim)
+            )
+        return self._vectors
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            One embedding per text, or None where the text is not cached
+        """
+        with self._lock:
+            rows = [self._rows.get(self._key(text)) for text in texts]
+            if all(row is None for row in rows):
+                return [None] * len(texts)
+            vectors = self._vector_view()
+            return [None if row is None else vectors[row].tolist() for row in rows]
+
+    def put_many(self, texts: List[str], embeddings: List[List[float]]):
+        """
+        Append embeddings of texts that are not cached yet.
+
+        Args:
+            texts: Embedded texts
+            embeddings: Their embeddings, in order
+        """
+        with self._lock:
+            new_keys = {}
+            for text, embedding in zip(texts, embeddings):
+                key = self._key(text)
+                if key not in self._rows:
+                    new_keys.setdefault(key, embedding)
+            if not new_keys:
+                return
+
+            matrix = np.asarray(list(new_keys.values()), dtype=np.float32)
+            if self.dim is None:
+                self.dim = matrix.shape[1]
+                with open(self.meta_path, "w", encoding="utf-8") as f:
+                    json.dump({"model": self.model_name, "dim": self.dim}, f)
+
+            # Vectors first: a key without its vector would point past the end
+            with open(self.vectors_path, "ab") as f:
+                f.write(matrix.tobytes())
+            with open(self.keys_path, "ab") as f:
+                f.write(b"".join(new_keys))
+
+            first_row = len(self._rows)
+            for offset, key in enumerate(new_keys):
+                self._rows[key] = first_row + offset
+
+    def embed(
+        self, texts: List[str], embed_fn: Callable[[List[str]], List[List[float]]]
+    ) -> Tuple[List[List[float]], int]:
+        """
+        Embed texts, calling the model only for texts that are not cached.
+
+        Args:
+            texts: Texts to embed
+            embed_fn: Function embedding a list of texts (e.g. BatchEmbedder.embed)
+
+        Returns:
+            Tuple of (one embedding per text, number of cache hits)
+        """
+        embeddings = self.get_many(texts)
+        missing = [
+            index for index, embedding in enumerate(embeddings) if embedding is None
+        ]
+        if missing:
+            missing_texts = [texts[index] for index in missing]
+            computed = embed_fn(missing_texts)
+            self.put_many(missing_texts, computed)
+            for index, embedding in zip(missing, computed):
+                embeddings[index] = embedding
+        return embeddings, len(texts) - len(missing)
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """
+    Return the process-wide embedding cache of the configured model.
+
+    Returns:
+        EmbeddingCache shared by every collection
+    """
+    global _embedding_cache
+    with _embedding_cache_lock:
+        if _embedding_cache is None:
+            _embedding_cache = EmbeddingCache()
+        return _embedding_cache
@@ -0,0 +1,182 @@
+"""SQLite sidecar index of chunk IDs, sources and hashes per collection."""
+
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Set, Tuple
+
+# (chunk id, source_path, source_file, doc_hash)
+ChunkRow = Tuple[str, str, str, str]
+
+_SQL_VARIABLE_LIMIT = 900  # Stay below SQLite's bound-parameter limit
+
+
+def _chunked(values: List[str]) -> Iterable[List[str]]:
+    for start in range(0, len(values), _SQL_VARIABLE_LIMIT):
+        yield values[start : start + _SQL_VARIABLE_LIMIT]
+
+
+class ChunkHashIndex:
+    """
+    Maintained index of what a Chroma collection contains.
+
+    Duplicate and staleness checks used to pull every metadata row out of
+    Chroma. This table holds only the columns those checks need, indexed
+    by source and by hash, so a check costs time proportional to the
+    chunks asked about rather than to the collection size.
+
+    Rows are written right after the matching Chroma write, in one SQLite
+    transaction per batch. If a run dies in between, the row count no
+    longer matches the collection and VectorStoreManager rebuilds the index.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the index database.
+
+        Args:
+            db_path: Path of the SQLite file
+        """
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS chunks ("
+                "id TEXT PRIMARY KEY, source_path TEXT, source_file TEXT, doc_hash TEXT)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_chunks_source ON chunks (source_path)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_chunks_file ON chunks (source_file)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_chunks_hash ON chunks (doc_hash)"
+            )
+
+    def count(self) -> int:
+        """Number of indexed chunks."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def upsert(self, rows: List[ChunkRow]):
+        """Insert or replace chunk rows in one transaction."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO chunks (id, source_path, source_file, doc_hash) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def delete(self, chunk_ids: List[str]):
+        """Remove chunk rows in one transaction."""
+        with self._lock, self._conn:
+            for chunk in _chunked(chunk_ids):
+                self._conn.execute(
+                    f"DELETE FROM chunks WHERE id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+
+    def rebuild(self, rows: Iterable[ChunkRow]):
+        """Replace the whole index in one transaction."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM chunks")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO chunks (id, source_path, source_file, doc_hash) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def chunks_for_sources(
+        self, source_paths: Set[str], file_names: Set[str]
+    ) -> Dict[str, str]:
+        """
+        Chunks of the given sources, plus chunks without a source path
+        (indexed before stable IDs) whose file name matches.
+
+        Args:
+            source_paths: Source file paths relative to the collections root
+            file_names: Base names of those files
+
+        Returns:
+            Dictionary mapping chunk ID to its doc_hash
+        """
+        chunks = {}
+        with self._lock:
+            for chunk in _chunked(sorted(source_paths)):
+                chunks.update(
+                    self._conn.execute(
+                        "SELECT id, doc_hash FROM chunks WHERE source_path IN "
+                        f"({','.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                )
+            for chunk in _chunked(sorted(file_names)):
+                chunks.update(
+                    self._conn.execute(
+                        "SELECT id, doc_hash FROM chunks WHERE source_path IS NULL "
+                        f"AND source_file IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                )
+        return chunks
+
+    def orphan_chunks(
+        self, source_paths: Set[str], file_names: Set[str]
+    ) -> Dict[str, str]:
+        """
+        Chunks whose source is not among the given ones.
+
+        Args:
+            source_paths: Known source file paths relative to the collections root
+            file_names: Base names of those files (for chunks without a source path)
+
+        Returns:
+            Dictionary mapping chunk ID to its doc_hash
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, source_path, source_file, doc_hash FROM chunks"
+            ).fetchall()
+        return {
+            chunk_id: doc_hash
+            for chunk_id, path, file_name, doc_hash in rows
+            if (
+                file_name not in file_names
+                if path is None
+                else path not in source_paths
+            )
+        }
+
+    def existing_hashes(self, doc_hashes: Iterable[str]) -> Set[str]:
+        """
+        Which of the given hashes are already stored.
+
+        Args:
+            doc_hashes: Hashes to look up
+
+        Returns:
+            Subset of doc_hashes present in the collection
+        """
+        found = set()
+        with self._lock:
+            for chunk in _chunked(sorted(set(doc_hashes))):
+                found.update(
+                    row[0]
+                    for row in self._conn.execute(
+                        "SELECT DISTINCT doc_hash FROM chunks WHERE doc_hash IN "
+                        f"({','.join('?' * len(chunk))})",
+                        chunk,
+                    )
+                )
+        return found
+
+    def all_hashes(self) -> Set[str]:
+        """Every stored doc_hash."""
+        with self._lock:
+            return {
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT DISTINCT doc_hash FROM chunks WHERE doc_hash IS NOT NULL"
+                )
+            }
@@ -0,0 +1,248 @@
+"""Streaming indexing pipeline: parse → diff → embed → write."""
+
+import queue
+import logging
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+from langchain_core.documents import Document
+from core.vectorstore import IndexReport, VectorStoreManager
+from config.settings import PIPELINE_QUEUE_SIZE
+
+_DONE = object()  # Sentinel closing a stage's output queue
+
+
+class _PipelineStopped(Exception):
+    """Raised inside a stage when another stage has failed."""
+
+
+class IndexingPipeline:
+    """
+    Indexes a collection file by file with bounded queues between stages.
+
+    Stages run concurrently, each on its own thread:
+
+        parse:  walk and chunk source files       → (source, chunks) queue
+        embed:  diff chunks against the store and → (batch, vectors) queue
+                embed new or changed ones in batches
+        write:  bulk upsert into Chroma (caller's thread)
+
+    Only a few files and two embedded batches are in flight at any time,
+    so memory stays flat however large the collection is, and parsing,
+    embedding and writing overlap. Stale chunks are deleted by finish(),
+    once every write has succeeded.
+    """
+
+    def __init__(
+        self, manager: VectorStoreManager, queue_size: int = PIPELINE_QUEUE_SIZE
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            manager: Vector store manager of the collection
+            queue_size: Chunked files buffered between parsing and embedding
+        """
+        self.manager = manager
+        self.queue_size = queue_size
+        self.batch_size = manager.max_batch_size()
+
+        self._stop = threading.Event()
+        self._errors: List[BaseException] = []
+
+        self.added = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.stale_ids: List[str] = []
+        self.cache_hits = 0
+        self.embed_seconds = 0.0
+        self.write_seconds = 0.0
+
+    def _put(self, stage_queue: queue.Queue, item):
+        """Put an item, giving up if another stage failed."""
+        while not self._stop.is_set():
+            try:
+                stage_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise _PipelineStopped()
+
+    def _get(self, stage_queue: queue.Queue):
+        """Get an item, giving up if another stage failed."""
+        while not self._stop.is_set():
+            try:
+                return stage_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        raise _PipelineStopped()
+
+    def _start_stage(self, name: str, target, *args) -> threading.Thread:
+        """Run a stage on a thread, recording its error and stopping the others."""
+
+        def run():
+            try:
+                target(*args)
+            except _PipelineStopped:
+                pass
+            except BaseException as e:
+                self._errors.append(e)
+                self._stop.set()
+
+        thread = threading.Thread(
+            target=run, name=f"{self.manager.collection_name}-{name}", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def _parse(
+        self,
+        files: Iterable[Tuple[str, Optional[List[Document]]]],
+        output: queue.Queue,
+    ):
+        """Parse stage: pull chunked files from the loader's generator."""
+        for source, docs in files:
+            self._put(output, (source, docs))
+        self._put(output, _DONE)
+
+    def _embed(self, source_queue: queue.Queue, output: queue.Queue):
+        """Embed stage: keep new or changed chunks and embed them in batches."""
+        pending: List[Document] = []
+
+        while True:
+            item = self._get(source_queue)
+            if item is _DONE:
+                break
+            source, docs = item
+            if docs is None:
+                # The file failed to load: its stored chunks are not stale
+                continue
+
+            existing = self.manager.get_source_chunks([source])
+            for doc in docs:
+                if doc.id not in existing:
+                    self.added += 1
+                    pending.append(doc)
+                elif existing[doc.id] != doc.metadata.get("doc_hash"):
+                    self.updated += 1
+                    pending.append(doc)
+                else:
+                    self.unchanged += 1
+
+            new_ids = {doc.id for doc in docs}
+            self.stale_ids.extend(
+                chunk_id for chunk_id in existing if chunk_id not in new_ids
+            )
+
+            while len(pending) >= self.batch_size:
+                self._embed_batch(pending[: self.batch_size], output)
+                pending = pending[self.batch_size :]
+
+        if pending:
+            self._embed_batch(pending, output)
+        self._put(output, _DONE)
+
+    def _embed_batch(self, batch: List[Document], output: queue.Queue):
+        start_time = time.perf_counter()
+        embeddings, hits = self.manager.embed_texts([doc.page_content for doc in batch])
+        self.embed_seconds += time.perf_counter() - start_time
+        self.cache_hits += hits
+        self._put(output, (batch, embeddings))
+
+    def run(self, files: Iterable[Tuple[str, Optional[List[Document]]]]) -> int:
+        """
+        Stream chunked files into the collection.
+
+        Chunks their files no longer produce are collected, not deleted;
+        call finish() once the run succeeded.
+
+        Args:
+            files: (source path, chunks) for every new or changed file; a
+                generator, so files are read only as the pipeline needs them.
+                Chunks are None for a file that failed to load.
+
+        Returns:
+            Number of chunks written
+        """
+        source_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        batch_queue: queue.Queue = queue.Queue(maxsize=2)
+        stages = [
+            self._start_stage("parse", self._parse, files, source_queue),
+            self._start_stage("embed", self._embed, source_queue, batch_queue),
+        ]
+
+        written = 0
+        start_time = time.perf_counter()
+        try:
+            while True:
+                item = self._get(batch_queue)
+                if item is _DONE:
+                    break
+                batch, embeddings = item
+
+                write_start = time.perf_counter()
+                self.manager.write_embedded(batch, embeddings)
+                self.write_seconds += time.perf_counter() - write_start
+
+                written += len(batch)
+                logging.info(
+                    f"   ↳ {written} chunks written to {self.manager.collection_name} "
+                    f"({written / (time.perf_counter() - start_time):.0f} chunks/sec)"
+                )
+        except _PipelineStopped:
+            pass
+        except BaseException:
+            self._stop.set()
+            raise
+        finally:
+            for stage in stages:
+                stage.join()
+
+        if self._errors:
+            raise self._errors[0]
+
+        if written:
+            elapsed = time.perf_counter() - start_time
+            logging.info(
+                f"✅ Indexed {written} documents into {self.manager.collection_name} "
+                f"in {elapsed:.2f}s ({written / elapsed:.0f} chunks/sec; "
+                f"embed {self.embed_seconds:.2f}s with {self.cache_hits} cached, "
+                f"write {self.write_seconds:.2f}s)"
+            )
+        return written
+
+    def finish(
+        self,
+        removed_sources: Iterable[str] = (),
+        known_sources: Optional[Iterable[str]] = None,
+    ) -> IndexReport:
+        """
+        Delete stale chunks after a successful run, so no content is lost on failure.
+
+        Args:
+            removed_sources: Source files that no longer exist
+            known_sources: On a full rebuild, every existing source file;
+                chunks from any other source are deleted too
+
+        Returns:
+            IndexReport with added, updated, deleted and unchanged chunk counts
+        """
+        stale = dict.fromkeys(self.stale_ids)
+        stale.update(dict.fromkeys(self.manager.get_source_chunks(removed_sources)))
+        if known_sources is not None:
+            stale.update(dict.fromkeys(self.manager.get_orphan_chunks(known_sources)))
+        self.manager.delete_chunks(list(stale))
+
+        report = IndexReport(
+            collection=self.manager.collection_name,
+            added=self.added,
+            updated=self.updated,
+            deleted=len(stale),
+            unchanged=self.unchanged,
+        )
+        if any(report[1:]):
+            logging.info(
+                f"🧾 {report.collection}: {report.added} added, {report.updated} "
+                f"updated, {report.deleted} deleted, {report.unchanged} unchanged"
+            )
+        return report
@@ -0,0 +1,219 @@
+"""Per-collection file manifest for incremental indexing."""
+
+import os
+import json
+import time
+import logging
+from typing import Dict, Set
+from config.settings import (
+    BASE_PATH,
+    VECTOR_DB_DIR,
+    MANIFEST_FILENAME,
+    INDEX_VERSION_FILENAME,
+)
+from utils.hash_utils import file_hash
+
+
+def source_path(file_path: str) -> str:
+    """
+    Identify a source file by its path relative to the collections root.
+
+    Args:
+        file_path: Path of the source file
+
+    Returns:
+        POSIX-style relative path, stable across machines
+    """
+    return os.path.relpath(file_path, BASE_PATH).replace(os.sep, "/")
+
+
+def write_index_version(collection_name: str) -> int:
+    """
+    Stamp a collection as changed for readers that cache derived state.
+
+    Chroma touches its own files when a collection is merely opened or
+    queried, so their mtimes cannot tell readers whether the content
+    changed. This marker is only written after a run that added, updated
+    or deleted chunks.
+
+    Args:
+        collection_name: Name of the collection
+
+    Returns:
+        The new version (nanoseconds since the epoch)
+    """
+    version = time.time_ns()
+    path = os.path.join(VECTOR_DB_DIR, collection_name, INDEX_VERSION_FILENAME)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(str(version))
+    os.replace(tmp_path, path)
+    return version
+
+
+class IndexManifest:
+    """
+    Records which source files a collection was built from.
+
+    Each entry holds the file's size, mtime, content digest and the chunker
+    version that produced its documents. A file is re-chunked only when its
+    digest or chunker version changed; files whose size and mtime are
+    unchanged are skipped without being read.
+    """
+
+    def __init__(self, collection_name: str, reset: bool = False):
+        """
+        Load the manifest of a collection (empty if none was saved yet).
+
+        Args:
+            collection_name: Name of the collection
+            reset: Treat every file as changed (removed files are still
+                detected from the saved manifest)
+        """
+        self.collection_name = collection_name
+        self.path = os.path.join(VECTOR_DB_DIR, collection_name, MANIFEST_FILENAME)
+        self.reset = reset
+        self.entries: Dict[str, Dict] = self._load()
+        # A first or forced run re-chunks everything, so the store can be
+        # checked for chunks of sources this manifest never knew about
+        self.is_full_scan = reset or not self.entries
+        self.changed_files: Set[str] = set()
+        self.seen_files: Set[str] = set()
+        # Folders missing or not walkable in this run: their files are unknown
+        self.unavailable_folders: Set[str] = set()
+        self._pending: Dict[str, Dict] = {}
+
+    def _load(self) -> Dict[str, Dict]:
+        """Read the saved manifest, if any."""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("files", {})
+        except (OSError, ValueError) as e:
+            logging.warning(f"⚠️ Ignoring unreadable manifest {self.path}: {e}")
+            return {}
+
+    def has_changed(self, file_path: str, chunker_version: str) -> bool:
+        """
+        Check a file against the manifest and stage its new entry.
+
+        Args:
+            file_path: Path of the source file
+            chunker_version: Version of the chunker(s) that would process it
+
+        Returns:
+            True if the file is new or changed and must be chunked again
+        """
+        key = source_path(file_path)
+        self.seen_files.add(key)
+        stat = os.stat(file_path)
+        previous = None if self.reset else self.entries.get(key)
+
+        if (
+            previous is not None
+            and previous["size"] == stat.st_size
+            and previous["mtime"] == stat.st_mtime
+            and previous["chunker_version"] == chunker_version
+        ):
+            return False
+
+        entry = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "digest": file_hash(file_path),
+            "chunker_version": chunker_version,
+        }
+        self._pending[key] = entry
+
+        # Touched but identical (e.g. a fresh checkout): only the stat changes
+        if (
+            previous is not None
+            and previous["digest"] == entry["digest"]
+            and previous["chunker_version"] == chunker_version
+        ):
+            return False
+
+        self.changed_files.add(key)
+        return True
+
+    def discard(self, file_path: str):
+        """
+        Drop the staged entry of a file that failed to load.
+
+        Its previous entry, if any, is kept, so the file is chunked again
+        on the next run instead of being recorded as indexed.
+
+        Args:
+            file_path: Path of the source file
+        """
+        key = source_path(file_path)
+        self._pending.pop(key, None)
+        self.changed_files.discard(key)
+
+    def mark_unavailable(self, folder_path: str):
+        """
+        Record a source folder that is missing or could not be walked.
+
+        Files under it are neither reported as removed nor dropped from
+        the manifest, and orphan pruning is skipped for the run.
+
+        Args:
+            folder_path: Path of the folder
+        """
+        self.unavailable_folders.add(source_path(folder_path))
+
+    def is_unavailable(self, key: str) -> bool:
+        """Whether a source path lies under a folder marked unavailable."""
+        return any(
+            key == folder or key.startswith(folder + "/")
+            for folder in self.unavailable_folders
+        )
+
+    @property
+    def is_complete_scan(self) -> bool:
+        """A full scan that walked every folder, so unseen sources are gone."""
+        return self.is_full_scan and not self.unavailable_folders
+
+    @property
+    def removed_files(self) -> Set[str]:
+        """Files in the saved manifest that were not seen in this run."""
+        return {
+            key
+            for key in set(self.entries) - self.seen_files
+            if not self.is_unavailable(key)
+        }
+
+    def save(self) -> bool:
+        """
+        Write the staged entries, dropping files that no longer exist.
+
+        Call only after the collection's documents were written, so files
+        whose documents failed to index are retried on the next run. The
+        file is left untouched when no entry changed, so readers watching
+        the collection directory see no write on a no-op run.
+
+        Returns:
+            True if the manifest file was written
+        """
+        entries = {
+            key: entry
+            for key, entry in self.entries.items()
+            if key in self.seen_files or self.is_unavailable(key)
+        }
+        entries.update(self._pending)
+        self.changed_files = set()
+        self._pending = {}
+
+        if entries == self.entries and os.path.exists(self.path):
+            return False
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"files": entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+        self.entries = entries
+        return True
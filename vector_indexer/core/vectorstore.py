@@ -1,12 +1,26 @@
 """Vector store operations using Chroma."""
 
 import os
+import uuid
 import logging
-from typing import List, Set
+import threading
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
-from core.embeddings import get_embedding_model
-from config.settings import VECTOR_DB_DIR
+from core.embeddings import BatchEmbedder, get_batch_embedder
+from core.embedding_cache import get_embedding_cache
+from core.hash_index import ChunkHashIndex
+from config.settings import (
+    VECTOR_DB_DIR,
+    INDEX_WRITE_BATCH_SIZE,
+    EMBEDDING_CACHE_ENABLED,
+    HASH_INDEX_FILENAME,
+)
+
+IndexReport = namedtuple(
+    "IndexReport", ["collection", "added", "updated", "deleted", "unchanged"]
+)
 
 
 class VectorStoreManager:
@@ -16,60 +30,174 @@ class VectorStoreManager:
         """
         Initialize vector store manager.
 
+        Vectors are computed by the shared batch embedder and written with
+        the documents, so Chroma is opened without an embedding function and
+        the model is only loaded once something is actually embedded.
+
         Args:
             collection_name: Name of the collection
         """
         self.collection_name = collection_name
-        self.embedding_model = get_embedding_model()
+        self.persist_directory = os.path.join(VECTOR_DB_DIR, collection_name)
         self.vectorstore = Chroma(
             collection_name=collection_name,
-            embedding_function=self.embedding_model,
-            persist_directory=os.path.join(VECTOR_DB_DIR, collection_name),
+            persist_directory=self.persist_directory,
+        )
+        self._hash_index: Optional[ChunkHashIndex] = None
+        self._hash_index_lock = threading.Lock()
+
+    @property
+    def hash_index(self) -> ChunkHashIndex:
+        """Sidecar hash index, rebuilt from Chroma if it is missing or out of sync."""
+        with self._hash_index_lock:
+            if self._hash_index is None:
+                index = ChunkHashIndex(
+                    os.path.join(self.persist_directory, HASH_INDEX_FILENAME)
+                )
+                if index.count() != self.vectorstore._collection.count():
+                    self._rebuild_hash_index(index)
+                self._hash_index = index
+            return self._hash_index
+
+    def _rebuild_hash_index(self, index: ChunkHashIndex):
+        """Fill the hash index from Chroma's metadata, one page at a time."""
+        logging.info(f"🗂️ Rebuilding hash index for {self.collection_name}")
+        rows = []
+        page_size = self.max_batch_size()
+        offset = 0
+        while True:
+            page = self.vectorstore._collection.get(
+                include=["metadatas"], limit=page_size, offset=offset
+            )
+            for chunk_id, metadata in zip(page["ids"], page["metadatas"]):
+                rows.append(self._index_row(chunk_id, metadata or {}))
+            if len(page["ids"]) < page_size:
+                break
+            offset += page_size
+        index.rebuild(rows)
+
+    @staticmethod
+    def _index_row(chunk_id: str, metadata: dict) -> tuple:
+        return (
+            chunk_id,
+            metadata.get("source_path"),
+            metadata.get("source_file"),
+            metadata.get("doc_hash"),
         )
 
-    def get_existing_hashes(self) -> Set[str]:
+    @property
+    def embedder(self) -> BatchEmbedder:
+        """Process-wide batch embedder (loads the model on first access)."""
+        return get_batch_embedder()
+
+    def embed_texts(self, texts: List[str]) -> Tuple[List[List[float]], int]:
         """
-        Retrieve existing document hashes from the vector store.
+        Embed texts, serving previously embedded ones from the embedding cache.
+
+        The model is only loaded if some text misses the cache.
+
+        Args:
+            texts: Texts to embed
 
         Returns:
-            Set of existing document hashes
+            Tuple of (one embedding per text, number of cache hits)
         """
-        existing_hashes = set()
-        try:
-            existing = self.vectorstore.get(include=["metadatas"])
-            for metadata in existing["metadatas"]:
-                if isinstance(metadata, dict) and "doc_hash" in metadata:
-                    existing_hashes.add(metadata["doc_hash"])
-        except Exception as e:
-            logging.warning(f"Could not load existing metadata from Chroma: {e}")
-        return existing_hashes
-
-    def add_new_documents(self, documents: List[Document]) -> int:
+        if not EMBEDDING_CACHE_ENABLED:
+            return self.embedder.embed(texts), 0
+        return get_embedding_cache().embed(
+            texts, lambda missing: self.embedder.embed(missing)
+        )
+
+    def get_existing_hashes(
+        self, doc_hashes: Optional[Iterable[str]] = None
+    ) -> Set[str]:
         """
-        Add new documents to the vector store, skipping duplicates.
+        Retrieve existing document hashes from the sidecar hash index.
 
         Args:
-            documents: List of documents to add
+            doc_hashes: Hashes to check; None returns every stored hash
 
         Returns:
-            Number of documents actually added
+            Set of existing document hashes (restricted to doc_hashes if given)
+        """
+        if doc_hashes is None:
+            return self.hash_index.all_hashes()
+        return self.hash_index.existing_hashes(doc_hashes)
+
+    def max_batch_size(self) -> int:
+        """Largest write batch, within what the Chroma client accepts."""
+        return min(
+            INDEX_WRITE_BATCH_SIZE, self.vectorstore._client.get_max_batch_size()
+        )
+
+    def get_source_chunks(self, source_paths: Iterable[str]) -> Dict[str, str]:
         """
-        existing_hashes = self.get_existing_hashes()
-        new_docs = []
+        Look up the chunks currently stored for some source files.
+
+        Chunks indexed before stable IDs existed have no ``source_path``;
+        they are matched by file name instead, so the first run replaces them.
 
+        Args:
+            source_paths: Source file paths relative to the collections root
+
+        Returns:
+            Dictionary mapping chunk ID to its doc_hash
+        """
+        source_paths = set(source_paths)
+        if not source_paths:
+            return {}
+        return self.hash_index.chunks_for_sources(
+            source_paths, {os.path.basename(path) for path in source_paths}
+        )
+
+    def get_orphan_chunks(self, known_sources: Iterable[str]) -> Dict[str, str]:
+        """
+        Find chunks whose source file is not among the known ones.
+
+        Scans the whole hash index, so it is only used on full rebuilds,
+        where it catches chunks of files deleted before the manifest existed.
+
+        Args:
+            known_sources: Source file paths relative to the collections root
+
+        Returns:
+            Dictionary mapping chunk ID to its doc_hash
+        """
+        known_sources = set(known_sources)
+        return self.hash_index.orphan_chunks(
+            known_sources, {os.path.basename(path) for path in known_sources}
+        )
+
+    def write_embedded(self, documents: List[Document], embeddings: List[List[float]]):
+        """
+        Upsert documents with precomputed embeddings in one bulk call.
+
+        Args:
+            documents: Documents to write (at most max_batch_size())
+            embeddings: Their embeddings, in order
+        """
         for doc in documents:
-            doc_hash = doc.metadata.get("doc_hash")
-            if doc_hash and doc_hash not in existing_hashes:
-                new_docs.append(doc)
-            else:
-                logging.debug(f"Skipped duplicate: {doc_hash}")
-
-        if new_docs:
-            self.vectorstore.add_documents(new_docs)
-            logging.info(
-                f"✅ Indexed {len(new_docs)} new documents into {self.collection_name}"
-            )
-        else:
-            logging.info("⏩ All documents already exist. Skipping indexing.")
+            doc.id = doc.id or str(uuid.uuid4())
+        self.vectorstore._collection.upsert(
+            ids=[doc.id for doc in documents],
+            embeddings=embeddings,
+            documents=[doc.page_content for doc in documents],
+            metadatas=[doc.metadata for doc in documents],
+        )
+        self.hash_index.upsert(
+            [self._index_row(doc.id, doc.metadata) for doc in documents]
+        )
 
-        return len(new_docs)
+    def delete_chunks(self, chunk_ids: List[str]):
+        """
+        Delete chunks by ID, in batches the Chroma client accepts.
+
+        Args:
+            chunk_ids: IDs of the chunks to delete
+        """
+        batch_size = self.max_batch_size()
+        for start in range(0, len(chunk_ids), batch_size):
+            self.vectorstore._collection.delete(
+                ids=chunk_ids[start : start + batch_size]
+            )
+        self.hash_index.delete(chunk_ids)
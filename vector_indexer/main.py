@@ -4,10 +4,15 @@ import argparse
 import logging
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List
 from config.settings import COLLECTION_CONFIG, LOG_LEVEL, LOG_FORMAT, BASE_PATH
 from core.document_loader import DocumentLoader
-from core.vectorstore import VectorStoreManager
+from core.vectorstore import IndexReport, VectorStoreManager
+from core.embeddings import close_batch_embedder
+from core.manifest import IndexManifest, write_index_version
+from core.indexing_pipeline import IndexingPipeline
 from auditing.duplicate_auditor import DuplicateAuditor
 
 
@@ -72,91 +77,158 @@ def check_paths() -> bool:
     return True
 
 
-def index_collection(collection_name: str, folder_names: List[str]) -> int:
+def _run_collection(
+    collection_name: str, folder_names: List[str], force: bool = False
+) -> IndexReport:
     """
-    Index a single collection with enhanced error handling.
+    Index a single collection, letting errors propagate.
 
     Args:
         collection_name: Name of the collection
         folder_names: List of folder names to process
+        force: Re-chunk every file, ignoring the manifest
 
     Returns:
-        Total number of documents indexed
+        IndexReport of added, updated, deleted and unchanged chunks
     """
     logging.info(f"🚀 Starting indexing for collection: {collection_name}")
 
-    try:
-        loader = DocumentLoader()
-        manager = VectorStoreManager(collection_name)
-
-        all_documents = []
+    loader = DocumentLoader()
+    manager = VectorStoreManager(collection_name)
+    manifest = IndexManifest(collection_name, reset=force)
 
+    def iter_changed_files():
         for folder_name in folder_names:
             folder_path = os.path.join(BASE_PATH, folder_name)
 
             if not os.path.exists(folder_path):
                 logging.warning(f"⚠️ Folder does not exist: {folder_path}")
+                manifest.mark_unavailable(folder_path)
                 continue
 
             logging.info(f"📁 Processing folder: {folder_path}")
+            yield from loader.iter_documents_from_folder(
+                folder_path, collection_name, manifest
+            )
 
-            docs = loader.load_documents_from_folder(folder_path, collection_name)
-            logging.info(f"➕ Loaded {len(docs)} documents from {folder_path}")
-            all_documents.extend(docs)
-
-        if not all_documents:
+    pipeline = IndexingPipeline(manager)
+    pipeline.run(iter_changed_files())
+    # Removed files are only known once every folder has been walked
+    if manifest.unavailable_folders:
+        logging.warning(
+            f"⚠️ Keeping stored chunks under unavailable folders: "
+            f"{', '.join(sorted(manifest.unavailable_folders))}"
+        )
+    report = pipeline.finish(
+        manifest.removed_files,
+        known_sources=manifest.seen_files if manifest.is_complete_scan else None,
+    )
+    # Only now are the changed files safely indexed
+    manifest.save()
+    if report.added or report.updated or report.deleted:
+        write_index_version(collection_name)
+
+    if not (report.added or report.updated or report.deleted):
+        if manifest.entries:
+            logging.info(f"✅ Collection {collection_name} is up to date")
+        else:
             logging.warning(f"⚠️ No documents found for collection: {collection_name}")
-            return 0
-
-        indexed_count = manager.add_new_documents(all_documents)
+    else:
         logging.info(
-            f"✅ Successfully indexed {indexed_count} documents for {collection_name}"
+            f"✅ Successfully indexed {report.added + report.updated} documents "
+            f"for {collection_name}"
         )
 
-        return indexed_count
+    return report
+
+
+def index_collection(
+    collection_name: str, folder_names: List[str], force: bool = False
+) -> int:
+    """
+    Index a single collection with enhanced error handling.
+
+    Args:
+        collection_name: Name of the collection
+        folder_names: List of folder names to process
+        force: Re-chunk every file, ignoring the manifest
+
+    Returns:
+        Total number of documents indexed (added or updated)
+    """
+    try:
+        report = _run_collection(collection_name, folder_names, force)
+        return report.added + report.updated
 
     except Exception as e:
         logging.error(f"❌ Failed to index collection {collection_name}: {e}")
         return 0
 
 
-def index_all_collections() -> int:
+def index_all_collections(jobs: int = 1, force: bool = False) -> int:
     """
     Index all configured collections with progress tracking.
 
-    Returns:
-        Total number of documents indexed across all collections
-    """
-    logging.info("🚀 Starting indexing process for all collections")
-    total_indexed = 0
-    successful_collections = 0
-    failed_collections = []
+    Collections share nothing but the embedding model, so with jobs > 1
+    they are indexed on a thread pool. A failing collection does not stop
+    the others; all outcomes are reported in one summary.
 
-    for collection_name, folder_config in COLLECTION_CONFIG.items():
-        try:
-            folders = (
-                [folder_config] if isinstance(folder_config, str) else folder_config
-            )
-            indexed_count = index_collection(collection_name, folders)
-            total_indexed += indexed_count
+    Args:
+        jobs: Number of collections indexed concurrently
+        force: Re-chunk every file, ignoring the manifests
 
-            if indexed_count > 0:
-                successful_collections += 1
-            else:
-                failed_collections.append(collection_name)
+    Returns:
+        Total number of documents indexed (added or updated) across all collections
+    """
+    logging.info(
+        f"🚀 Starting indexing process for all collections ({jobs} parallel jobs)"
+    )
+    start_time = time.perf_counter()
+    reports = {}
+    failed_collections = {}
 
-        except Exception as e:
-            logging.error(f"❌ Failed to process collection {collection_name}: {e}")
-            failed_collections.append(collection_name)
+    def run(collection_name: str, folder_config) -> IndexReport:
+        folders = [folder_config] if isinstance(folder_config, str) else folder_config
+        return _run_collection(collection_name, folders, force)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = {
+            executor.submit(run, collection_name, folder_config): collection_name
+            for collection_name, folder_config in COLLECTION_CONFIG.items()
+        }
+        for future in as_completed(futures):
+            collection_name = futures[future]
+            try:
+                reports[collection_name] = future.result()
+            except Exception as e:
+                logging.error(f"❌ Failed to process collection {collection_name}: {e}")
+                failed_collections[collection_name] = str(e)
+
+    updated_reports = [
+        report
+        for report in reports.values()
+        if report.added or report.updated or report.deleted
+    ]
+    total_indexed = sum(report.added + report.updated for report in reports.values())
 
     # Summary
-    logging.info(f"📊 Indexing Summary:")
-    logging.info(f"   ✅ Successful collections: {successful_collections}")
+    logging.info(f"📊 Indexing Summary ({time.perf_counter() - start_time:.1f}s):")
+    logging.info(f"   ✅ Updated collections: {len(updated_reports)}")
+    for report in updated_reports:
+        logging.info(
+            f"      • {report.collection}: +{report.added} ~{report.updated} "
+            f"-{report.deleted}"
+        )
+    logging.info(f"   ⏩ Unchanged collections: {len(reports) - len(updated_reports)}")
     logging.info(f"   ❌ Failed collections: {len(failed_collections)}")
     logging.info(f"   📄 Total documents indexed: {total_indexed}")
+    logging.info(
+        f"   🗑️ Total stale documents deleted: "
+        f"{sum(report.deleted for report in reports.values())}"
+    )
 
-    if failed_collections:
-        logging.warning(f"   ⚠️ Failed collections: {', '.join(failed_collections)}")
+    for collection_name, error in failed_collections.items():
+        logging.warning(f"   ⚠️ {collection_name}: {error}")
 
     return total_indexed
 
@@ -172,7 +244,10 @@ Examples:
   %(prog)s --collection faculty_info         # Index specific collection
   %(prog)s --audit                          # Index all and audit duplicates
   %(prog)s --audit-only                     # Only run duplicate audit
+  %(prog)s --audit-only --audit-json audit.json  # Audit and write a JSON report
   %(prog)s --collection labs --audit --verbose  # Index labs with audit and debug logs
+  %(prog)s --jobs 4                           # Index four collections at a time
+  %(prog)s --force                            # Re-chunk every file, ignoring manifests
         """,
     )
 
@@ -184,12 +259,30 @@ Examples:
         action="store_true",
         help="Run only duplicate audit without indexing",
     )
+    parser.add_argument(
+        "--audit-json",
+        type=str,
+        metavar="PATH",
+        help="Write the duplicate audit report as JSON to PATH",
+    )
     parser.add_argument(
         "--collection",
         type=str,
         choices=list(COLLECTION_CONFIG.keys()),
         help="Index only specific collection",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of collections to index in parallel",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-chunk and re-index every file, ignoring the file manifests",
+    )
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable verbose debug logging"
     )
@@ -200,6 +293,8 @@ Examples:
     )
 
     args = parser.parse_args()
+    if args.audit_json and not (args.audit or args.audit_only):
+        parser.error("--audit-json requires --audit or --audit-only")
 
     # Setup logging
     setup_logging(args.verbose)
@@ -219,7 +314,9 @@ Examples:
         if args.audit_only:
             # Run audit only
             logging.info("🔍 Running duplicate audit only")
-            DuplicateAuditor.audit_all_collections(list(COLLECTION_CONFIG.keys()))
+            DuplicateAuditor.audit_all_collections(
+                list(COLLECTION_CONFIG.keys()), args.audit_json
+            )
 
         elif args.collection:
             # Index specific collection
@@ -231,25 +328,27 @@ Examples:
                 [folder_config] if isinstance(folder_config, str) else folder_config
             )
 
-            indexed_count = index_collection(args.collection, folders)
+            indexed_count = index_collection(args.collection, folders, args.force)
 
             if indexed_count == 0:
                 logging.warning("No documents were indexed")
 
             if args.audit:
                 logging.info("🔍 Running duplicate audit for collection")
-                DuplicateAuditor.audit_collection(args.collection)
+                DuplicateAuditor.audit_collection(args.collection, args.audit_json)
 
         else:
             # Index all collections
-            total_indexed = index_all_collections()
+            total_indexed = index_all_collections(args.jobs, args.force)
 
             if total_indexed == 0:
                 logging.warning("No documents were indexed across all collections")
 
             if args.audit:
                 logging.info("🔍 Running duplicate audit for all collections")
-                DuplicateAuditor.audit_all_collections(list(COLLECTION_CONFIG.keys()))
+                DuplicateAuditor.audit_all_collections(
+                    list(COLLECTION_CONFIG.keys()), args.audit_json
+                )
 
         logging.info("🎉 Process completed successfully!")
 
@@ -261,6 +360,8 @@ Examples:
         if args.verbose:
             logging.exception("Full traceback:")
         sys.exit(1)
+    finally:
+        close_batch_embedder()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,90 @@
+"""Tests for the on-disk embedding cache and its crash recovery."""
+
+import os
+from core.embedding_cache import EmbeddingCache
+
+MODEL = "test/model-v1"
+
+
+def _vector(seed, dim=4):
+    return [float(seed + offset) for offset in range(dim)]
+
+
+def test_put_get_round_trip(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), MODEL)
+    cache.put_many(["a", "b"], [_vector(1), _vector(2)])
+
+    assert cache.get_many(["b", "missing", "a"]) == [_vector(2), None, _vector(1)]
+    assert len(cache) == 2
+
+
+def test_reopened_cache_keeps_vectors(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), MODEL)
+    cache.put_many(["a"], [_vector(1)])
+    # A memory map opened before this append must be extended, not reused
+    assert cache.get_many(["a"]) == [_vector(1)]
+    cache.put_many(["b"], [_vector(2)])
+    assert cache.get_many(["a", "b"]) == [_vector(1), _vector(2)]
+
+    reopened = EmbeddingCache(str(tmp_path), MODEL)
+
+    assert reopened.dim == 4
+    assert reopened.get_many(["a", "b"]) == [_vector(1), _vector(2)]
+
+
+def test_interrupted_append_of_vectors_is_truncated(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), MODEL)
+    cache.put_many(["a"], [_vector(1)])
+    # The crash hit after the vector of "b" was written, before its key
+    with open(cache.vectors_path, "ab") as f:
+        f.write(b"\0" * 4 * 4 + b"\1\2")
+
+    reopened = EmbeddingCache(str(tmp_path), MODEL)
+
+    assert len(reopened) == 1
+    assert os.path.getsize(reopened.vectors_path) == 4 * 4
+    reopened.put_many(["b"], [_vector(2)])
+    assert EmbeddingCache(str(tmp_path), MODEL).get_many(["a", "b"]) == [
+        _vector(1),
+        _vector(2),
+    ]
+
+
+def test_half_written_key_is_truncated(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), MODEL)
+    cache.put_many(["a"], [_vector(1)])
+    with open(cache.keys_path, "ab") as f:
+        f.write(b"\xff" * 7)
+
+    reopened = EmbeddingCache(str(tmp_path), MODEL)
+
+    assert len(reopened) == 1
+    assert os.path.getsize(reopened.keys_path) == 16
+    assert reopened.get_many(["a"]) == [_vector(1)]
+
+
+def test_text_repeated_in_one_batch_is_stored_once(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), MODEL)
+    cache.put_many(["a", "a", "b"], [_vector(1), _vector(9), _vector(2)])
+
+    reopened = EmbeddingCache(str(tmp_path), MODEL)
+
+    assert len(reopened) == 2
+    assert os.path.getsize(reopened.vectors_path) == 2 * 4 * 4
+    assert reopened.get_many(["a", "b"]) == [_vector(1), _vector(2)]
+
+
+def test_embed_only_computes_missing_texts(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), MODEL)
+    cache.put_many(["a"], [_vector(1)])
+    calls = []
+
+    def embed_fn(texts):
+        calls.append(list(texts))
+        return [_vector(len(text)) for text in texts]
+
+    embeddings, hits = cache.embed(["a", "bb"], embed_fn)
+
+    assert calls == [["bb"]]
+    assert hits == 1
+    assert embeddings == [_vector(1), _vector(2)]
@@ -0,0 +1,157 @@
+"""Tests for stale-chunk handling in the indexing pipeline."""
+
+from langchain_core.documents import Document
+from core.document_loader import DocumentLoader
+from core.indexing_pipeline import IndexingPipeline
+
+
+class FakeManager:
+    """In-memory stand-in for VectorStoreManager."""
+
+    collection_name = "research"
+
+    def __init__(self, chunks):
+        # chunk ID → (source path, doc_hash)
+        self.chunks = dict(chunks)
+        self.deleted = []
+
+    def max_batch_size(self):
+        return 16
+
+    def get_source_chunks(self, source_paths):
+        source_paths = set(source_paths)
+        return {
+            chunk_id: doc_hash
+            for chunk_id, (path, doc_hash) in self.chunks.items()
+            if path in source_paths
+        }
+
+    def get_orphan_chunks(self, known_sources):
+        known_sources = set(known_sources)
+        return {
+            chunk_id: doc_hash
+            for chunk_id, (path, doc_hash) in self.chunks.items()
+            if path not in known_sources
+        }
+
+    def embed_texts(self, texts):
+        return [[0.0] for _ in texts], 0
+
+    def write_embedded(self, docs, embeddings):
+        for doc in docs:
+            self.chunks[doc.id] = (
+                doc.metadata["source_path"],
+                doc.metadata["doc_hash"],
+            )
+
+    def delete_chunks(self, chunk_ids):
+        self.deleted.extend(chunk_ids)
+        for chunk_id in chunk_ids:
+            self.chunks.pop(chunk_id, None)
+
+
+def _stored_chunks():
+    return {
+        "a1": ("Research/a.json", "h1"),
+        "a2": ("Research/a.json", "h2"),
+        "b1": ("Research/b.json", "h3"),
+    }
+
+
+def test_failed_file_keeps_its_stored_chunks():
+    manager = FakeManager(_stored_chunks())
+    pipeline = IndexingPipeline(manager)
+
+    pipeline.run(iter([("Research/a.json", None)]))
+    report = pipeline.finish(known_sources={"Research/a.json", "Research/b.json"})
+
+    assert report.deleted == 0
+    assert manager.deleted == []
+    assert set(manager.chunks) == {"a1", "a2", "b1"}
+
+
+def test_emptied_file_deletes_its_stored_chunks():
+    manager = FakeManager(_stored_chunks())
+    doc = Document(
+        page_content="kept",
+        metadata={"source_path": "Research/a.json", "doc_hash": "h1"},
+        id="a1",
+    )
+    pipeline = IndexingPipeline(manager)
+
+    pipeline.run(iter([("Research/a.json", [doc])]))
+    report = pipeline.finish()
+
+    assert (report.unchanged, report.deleted) == (1, 1)
+    assert manager.deleted == ["a2"]
+
+
+def test_loader_yields_none_for_unreadable_file(tmp_path):
+    (tmp_path / "broken.json").write_text('{"faculty": [', encoding="utf-8")
+
+    files = list(DocumentLoader().iter_documents_from_folder(str(tmp_path), "research"))
+
+    assert len(files) == 1
+    assert files[0][0].endswith("broken.json")
+    assert files[0][1] is None
+
+
+def _run_magazine(tmp_path, monkeypatch, manager):
+    import main
+    import core.manifest
+
+    monkeypatch.setattr(main, "BASE_PATH", str(tmp_path / "collections"))
+    monkeypatch.setattr(core.manifest, "BASE_PATH", str(tmp_path / "collections"))
+    monkeypatch.setattr(core.manifest, "VECTOR_DB_DIR", str(tmp_path / "stores"))
+    monkeypatch.setattr(main, "VectorStoreManager", lambda name: manager)
+    return main._run_collection("magazine", ["Magazine"])
+
+
+def test_missing_folder_on_first_run_keeps_collection(tmp_path, monkeypatch):
+    manager = FakeManager({"m1": ("Magazine/issue.json", "h1")})
+
+    report = _run_magazine(tmp_path, monkeypatch, manager)
+
+    assert report.deleted == 0
+    assert set(manager.chunks) == {"m1"}
+
+
+def test_missing_folder_after_manifest_keeps_collection(tmp_path, monkeypatch):
+    folder = tmp_path / "collections" / "Magazine"
+    folder.mkdir(parents=True)
+    (folder / "issue.json").write_text("[]", encoding="utf-8")
+    manager = FakeManager({"m1": ("Magazine/issue.json", "h1")})
+    _run_magazine(tmp_path, monkeypatch, manager)
+    manager.chunks["m1"] = ("Magazine/issue.json", "h1")
+
+    folder.rename(tmp_path / "collections" / "Magazine.bak")
+    report = _run_magazine(tmp_path, monkeypatch, manager)
+
+    assert report.deleted == 0
+    assert set(manager.chunks) == {"m1"}
+
+    # Once the folder is back and the file really is gone, it is removed
+    (tmp_path / "collections" / "Magazine.bak").rename(folder)
+    (folder / "issue.json").unlink()
+    report = _run_magazine(tmp_path, monkeypatch, manager)
+
+    assert report.deleted == 1
+    assert manager.chunks == {}
+
+
+def test_index_version_is_written_only_when_the_collection_changes(
+    tmp_path, monkeypatch
+):
+    folder = tmp_path / "collections" / "Magazine"
+    folder.mkdir(parents=True)
+    (folder / "issue.json").write_text("[]", encoding="utf-8")
+    marker = tmp_path / "stores" / "magazine" / "index_version"
+    manager = FakeManager({"m1": ("Magazine/issue.json", "h1")})
+
+    _run_magazine(tmp_path, monkeypatch, manager)
+    version = marker.read_text()
+
+    _run_magazine(tmp_path, monkeypatch, manager)
+
+    assert int(version) > 0
+    assert marker.read_text() == version
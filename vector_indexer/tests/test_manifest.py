@@ -0,0 +1,63 @@
+"""Tests for manifest entries of files that fail to load."""
+
+import os
+from core.document_loader import DocumentLoader
+from core.manifest import IndexManifest
+
+
+def _manifest(tmp_path):
+    manifest = IndexManifest("manifest_test")
+    manifest.path = str(tmp_path / "store" / "index_manifest.json")
+    return manifest
+
+
+def test_failed_file_is_not_recorded(tmp_path):
+    folder = tmp_path / "Research"
+    folder.mkdir()
+    broken = folder / "broken.json"
+    broken.write_text('{"faculty": [', encoding="utf-8")
+
+    manifest = _manifest(tmp_path)
+    list(DocumentLoader().iter_documents_from_folder(str(folder), "research", manifest))
+    manifest.save()
+
+    assert manifest.entries == {}
+    assert manifest.has_changed(
+        str(broken), DocumentLoader().chunker_version("research")
+    )
+
+
+def test_failed_edit_keeps_previous_entry(tmp_path):
+    folder = tmp_path / "Research"
+    folder.mkdir()
+    data = folder / "data.json"
+    data.write_text("[]", encoding="utf-8")
+    loader = DocumentLoader()
+
+    manifest = _manifest(tmp_path)
+    list(loader.iter_documents_from_folder(str(folder), "research", manifest))
+    manifest.save()
+    (previous,) = manifest.entries.values()
+
+    data.write_text('{"faculty": [', encoding="utf-8")
+    os.utime(data, (previous["mtime"] + 10, previous["mtime"] + 10))
+    list(loader.iter_documents_from_folder(str(folder), "research", manifest))
+    manifest.save()
+
+    assert list(manifest.entries.values()) == [previous]
+
+
+def test_unchanged_run_does_not_rewrite_manifest(tmp_path):
+    folder = tmp_path / "Research"
+    folder.mkdir()
+    (folder / "data.json").write_text("[]", encoding="utf-8")
+    loader = DocumentLoader()
+
+    manifest = _manifest(tmp_path)
+    list(loader.iter_documents_from_folder(str(folder), "research", manifest))
+    assert manifest.save()
+    written = os.stat(manifest.path).st_mtime_ns
+
+    list(loader.iter_documents_from_folder(str(folder), "research", manifest))
+    assert not manifest.save()
+    assert os.stat(manifest.path).st_mtime_ns == written
@@ -1,6 +1,11 @@
 """Utilities for content hashing."""
 
+import re
 import hashlib
+import numpy as np
+
+_FINGERPRINT_BITS = 64
+_WORD = re.compile(r"\w+")
 
 
 def content_hash(text: str) -> str:
@@ -14,3 +19,82 @@ def content_hash(text: str) -> str:
         MD5 hash as hexadecimal string
     """
     return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+def file_hash(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    Generate MD5 hash of a file's bytes, reading it in blocks.
+
+    Args:
+        file_path: Path of the file to hash
+        block_size: Bytes read per block
+
+    Returns:
+        MD5 hash as hexadecimal string
+    """
+    digest = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_id(source_path: str, key: str) -> str:
+    """
+    Generate a deterministic chunk ID from its source file and logical key.
+
+    Args:
+        source_path: Source file path relative to the collections root
+        key: Logical key of the chunk within that file
+
+    Returns:
+        MD5 hash of "source_path::key" as hexadecimal string
+    """
+    return content_hash(f"{source_path}::{key}")
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    Generate a 64-bit SimHash of text over lowercase word shingles.
+
+    Similar texts get fingerprints that differ in only a few bits.
+
+    Args:
+        text: Input text to fingerprint
+        shingle_size: Words per shingle
+
+    Returns:
+        Fingerprint as integer (0 for text without words)
+    """
+    words = _WORD.findall(text.lower())
+    if not words:
+        return 0
+    shingles = [
+        " ".join(words[start : start + shingle_size])
+        for start in range(max(1, len(words) - shingle_size + 1))
+    ]
+
+    # One row of 64 bits per shingle; a bit is set where most shingles agree
+    features = np.array(
+        [
+            hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+            for shingle in shingles
+        ]
+    ).view(np.uint8)
+    bits = np.unpackbits(features).reshape(len(shingles), _FINGERPRINT_BITS)
+    majority = bits.sum(axis=0) * 2 > len(shingles)
+    return int.from_bytes(np.packbits(majority).tobytes(), "big")
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """
+    Count the differing bits between two fingerprints.
+
+    Args:
+        first: First fingerprint
+        second: Second fingerprint
+
+    Returns:
+        Number of differing bits
+    """
+    return bin(first ^ second).count("1")
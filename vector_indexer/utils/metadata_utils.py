@@ -2,6 +2,22 @@
 
 from typing import Any, Dict, Union
 
+# Metadata fields identifying a chunk within its source file, most specific
+# first (publication, lab section, person, page)
+LOGICAL_KEY_FIELDS = (
+    "publication_id",
+    "paper_id",
+    "program_id",
+    "member_id",
+    "alumni_id",
+    "faculty_id",
+    "email",
+    "staff_name_normalized",
+    "summary_type",
+    "title",
+    "section",
+)
+
 
 def flatten_metadata(
     metadata: Dict[str, Any],
@@ -24,3 +40,22 @@ def flatten_metadata(
         else:
             safe_metadata[k] = str(v)
     return safe_metadata
+
+
+def logical_key(metadata: Dict[str, Any]) -> str:
+    """
+    Build the logical key of a chunk from its metadata.
+
+    Args:
+        metadata: Chunk metadata
+
+    Returns:
+        "chunk_type/field=value" for the first identifying field present,
+        or just the chunk type for one-per-file chunks (e.g. lab overview)
+    """
+    chunk_type = metadata.get("chunk_type") or metadata.get("category", "chunk")
+    for field in LOGICAL_KEY_FIELDS:
+        value = metadata.get(field)
+        if value not in (None, ""):
+            return f"{chunk_type}/{field}={value}"
+    return str(chunk_type)